@@ -0,0 +1,71 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmarks for request building and end-to-end client calls."""
+
+import googlemaps
+from googlemaps import client as _client
+from googlemaps import convert
+from googlemaps.fakeserver import FakeMapsServer
+
+from .bench_convert import _random_path
+
+
+class RequestBuilding:
+    def setup(self):
+        path = convert.location_list(_random_path(100))
+        self.params = [("path", path), ("interpolate", "true")]
+        self.matrix_params = {
+            "origins": convert.location_list(_random_path(25, seed=1)),
+            "destinations": convert.location_list(_random_path(25, seed=2)),
+            "mode": "driving",
+        }
+        self.key_client = googlemaps.Client(key="AIzaasdf")
+        self.enterprise_client = googlemaps.Client(
+            client_id="foo", client_secret="a2V5")
+
+    def time_urlencode_params(self):
+        _client.urlencode_params(self.params)
+
+    def time_sign_hmac(self):
+        _client.sign_hmac("a2V5", "/maps/api/geocode/json?address=Sesame+St.")
+
+    def time_generate_auth_url_key(self):
+        self.key_client._generate_auth_url(
+            "/maps/api/distancematrix/json", self.matrix_params, True)
+
+    def time_generate_auth_url_signed(self):
+        self.enterprise_client._generate_auth_url(
+            "/maps/api/distancematrix/json", self.matrix_params, True)
+
+
+class EndToEnd:
+    """Full client calls against a local server."""
+
+    params = ([0.0, 0.002], [0.0, 0.1])
+    param_names = ["latency", "error_rate"]
+
+    def setup(self, latency, error_rate):
+        self.server = FakeMapsServer(
+            latency=latency, over_query_limit_rate=error_rate, seed=0).start()
+        self.client = self.server.client(retry_over_query_limit=False)
+
+    def teardown(self, latency, error_rate):
+        self.server.stop()
+
+    def time_geocode(self, latency, error_rate):
+        try:
+            self.client.geocode("Sesame St.")
+        except googlemaps.exceptions.ApiError:
+            pass
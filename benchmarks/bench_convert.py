@@ -0,0 +1,72 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmarks for the convert module."""
+
+import random
+
+from googlemaps import convert
+
+
+def _random_path(n, seed=0):
+    """Returns a random walk of n lat/lng tuples."""
+    rand = random.Random(seed)
+    lat, lng = -33.86, 151.20
+    points = []
+    for _ in range(n):
+        lat += rand.uniform(-0.001, 0.001)
+        lng += rand.uniform(-0.001, 0.001)
+        points.append((lat, lng))
+    return points
+
+
+class Polyline:
+    params = [100, 10000]
+    param_names = ["points"]
+
+    def setup(self, points):
+        self.points = _random_path(points)
+        self.array = convert.LatLngArray.from_points(self.points)
+        self.encoded = convert.encode_polyline(self.points)
+
+    def time_encode_polyline(self, points):
+        convert.encode_polyline(self.points)
+
+    def time_encode_polyline_array(self, points):
+        convert.encode_polyline(self.array)
+
+    def time_decode_polyline(self, points):
+        convert.decode_polyline(self.encoded)
+
+    def time_shortest_path(self, points):
+        convert.shortest_path(self.points)
+
+
+class LocationList:
+    params = [25, 100]
+    param_names = ["points"]
+
+    def setup(self, points):
+        self.tuples = _random_path(points)
+        self.dicts = [{"lat": lat, "lng": lng} for lat, lng in self.tuples]
+        self.array = convert.LatLngArray.from_points(self.tuples)
+
+    def time_location_list_tuples(self, points):
+        convert.location_list(self.tuples)
+
+    def time_location_list_dicts(self, points):
+        convert.location_list(self.dicts)
+
+    def time_location_list_array(self, points):
+        convert.location_list(self.array)
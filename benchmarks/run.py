@@ -0,0 +1,165 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Runs the benchmarks and records the results.
+
+    python -m benchmarks.run [-k FILTER] [--repeat N] [--output PATH]
+
+Benchmarks are the time_* methods of the classes in benchmarks/bench_*.py,
+written in the style of asv (airspeed velocity): optional setup/teardown
+methods, and params/param_names for parameterized benchmarks. The suite can
+therefore be run with asv too.
+
+Each run is appended to PATH (.benchmarks/results.jsonl by default) as one
+JSON line, tagged with the current commit, and compared against the
+previous run in the same file.
+"""
+
+import argparse
+import importlib
+import inspect
+import itertools
+import json
+import os
+import pkgutil
+import platform
+import subprocess
+import sys
+import time
+import timeit
+
+import benchmarks
+
+
+_DEFAULT_OUTPUT = os.path.join(".benchmarks", "results.jsonl")
+
+
+def _param_combinations(cls):
+    params = getattr(cls, "params", None)
+    if not params:
+        return [()]
+    if not isinstance(params[0], (list, tuple)):
+        # A single parameter.
+        return [(p,) for p in params]
+    return list(itertools.product(*params))
+
+
+def _benchmark_classes():
+    for module_info in pkgutil.iter_modules(benchmarks.__path__):
+        if not module_info.name.startswith("bench_"):
+            continue
+        module = importlib.import_module("benchmarks." + module_info.name)
+        for _, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ == module.__name__:
+                yield module_info.name, cls
+
+
+def run(pattern=None, repeat=5):
+    """Runs the benchmarks whose name contains pattern.
+
+    :rtype: dict mapping benchmark names to the best time per call, in
+        seconds
+    """
+    results = {}
+    for module_name, cls in _benchmark_classes():
+        methods = [name for name, _ in inspect.getmembers(cls, callable)
+                   if name.startswith("time_")]
+        for args in _param_combinations(cls):
+            suffix = "(%s)" % ", ".join(repr(a) for a in args) if args else ""
+            names = [(m, "%s.%s.%s%s" % (module_name, cls.__name__, m, suffix))
+                     for m in methods]
+            names = [(m, n) for m, n in names if not pattern or pattern in n]
+            if not names:
+                continue
+
+            instance = cls()
+            if hasattr(instance, "setup"):
+                instance.setup(*args)
+            try:
+                for method, name in names:
+                    func = getattr(instance, method)
+                    timer = timeit.Timer(lambda: func(*args))
+                    number, _ = timer.autorange()
+                    best = min(timer.repeat(repeat, number)) / number
+                    results[name] = best
+                    print("%-70s %12s" % (name, _format_time(best)))
+                    sys.stdout.flush()
+            finally:
+                if hasattr(instance, "teardown"):
+                    instance.teardown(*args)
+    return results
+
+
+def _format_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return "%.3f %s" % (seconds / scale, unit)
+    return "%.1f ns" % (seconds / 1e-9)
+
+
+def _git(*args):
+    try:
+        return subprocess.check_output(("git",) + args,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _previous_run(path):
+    if not os.path.exists(path):
+        return None
+    last = None
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                last = line
+    return json.loads(last) if last else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("-k", dest="pattern",
+                        help="only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="number of timing repeats per benchmark")
+    parser.add_argument("--output", default=_DEFAULT_OUTPUT,
+                        help="file the results are appended to")
+    args = parser.parse_args(argv)
+
+    previous = _previous_run(args.output)
+    results = run(args.pattern, args.repeat)
+
+    record = {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": int(time.time()),
+        "python": platform.python_version(),
+        "results": results,
+    }
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(args.output, "a") as f:
+        f.write(json.dumps(record, sort_keys=True) + "\n")
+
+    if previous:
+        print("\nCompared with %s:" % (previous.get("commit") or "previous run")[:12])
+        for name, seconds in sorted(results.items()):
+            before = previous["results"].get(name)
+            if before:
+                print("%-70s %11.2fx" % (name, seconds / before))
+
+
+if __name__ == "__main__":
+    main()
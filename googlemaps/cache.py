@@ -0,0 +1,88 @@
+#
+# Copyright 2026 Google Inc. All rights reserved.
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+
+"""An in-process cache of API results.
+
+Results are kept for a bounded time, so that a cached result is never
+staler than the cache's ttl. Results are copied in and out of the cache, so
+that callers modifying a result don't change the one cached. Traffic-aware
+requests with departure_time="now" are only cacheable once departure times
+are grouped in buckets, see the time_bucket argument of googlemaps.Client.
+"""
+
+import collections
+import copy
+import threading
+import time
+
+
+class ResponseCache:
+    """A thread-safe LRU cache of results, expiring them after a time."""
+
+    def __init__(self, ttl, max_size=1000):
+        """
+        :param ttl: The number of seconds results are kept.
+        :type ttl: float
+
+        :param max_size: The number of results kept, the least recently used
+            ones being dropped first.
+        :type max_size: int
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key):
+        """Returns a copy of the result cached under key, or None if there is
+        no unexpired one."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                else:
+                    del self._entries[key]
+                    value = None
+            else:
+                value = None
+            if value is None:
+                self.misses += 1
+                return None
+        return copy.deepcopy(value)
+
+    def set(self, key, value):
+        """Caches a copy of a result under key."""
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drops all results."""
+        with self._lock:
+            self._entries.clear()
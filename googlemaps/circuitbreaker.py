@@ -0,0 +1,144 @@
+#
+# Copyright 2026 Google Inc. All rights reserved.
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+
+"""Circuit breakers, failing requests fast while an endpoint is down.
+
+A breaker starts closed, letting requests through. After a number of
+consecutive failures (transport errors, timeouts and 5xx responses) it
+opens, and requests fail right away with CircuitOpenError. Once the reset
+timeout has passed it half-opens: a limited number of probe requests go
+through, closing the breaker if they succeed, and opening it again if not.
+"""
+
+import threading
+import time
+
+import googlemaps
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Tracks the failures of one endpoint. Safe to share between threads."""
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30,
+                 half_open_probes=1, on_state_change=None):
+        """
+        :param name: The endpoint, used in errors and notifications.
+        :type name: string
+
+        :param failure_threshold: The number of consecutive failures after
+            which the breaker opens.
+        :type failure_threshold: int
+
+        :param reset_timeout: The number of seconds the breaker stays open
+            before letting probe requests through.
+        :type reset_timeout: float
+
+        :param half_open_probes: The number of probe requests allowed in
+            flight while half-open.
+        :type half_open_probes: int
+
+        :param on_state_change: Called with (name, old state, new state) on
+            every transition.
+        :type on_state_change: function
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+        self.on_state_change = on_state_change
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = None
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    def _transition(self, state):
+        # Called with the lock held; returns the notification to send once
+        # it is released.
+        old, self.state = self.state, state
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        self._probes = 0
+        return old, state
+
+    def _notify(self, transition):
+        if transition is not None and self.on_state_change is not None:
+            self.on_state_change(self.name, transition[0], transition[1])
+
+    def check(self):
+        """Checks that a request may be sent, without reserving a probe, so
+        that requests can fail fast before waiting for anything else, e.g.
+        the rate limit. before_request must still be called to send it.
+
+        :raises googlemaps.exceptions.CircuitOpenError: if the breaker is
+            open, or half-open with all probes in flight.
+        """
+        with self._lock:
+            if self.state == OPEN:
+                remaining = self._opened_at + self.reset_timeout - time.monotonic()
+                if remaining > 0:
+                    raise googlemaps.exceptions.CircuitOpenError(
+                        self.name, remaining)
+            elif (self.state == HALF_OPEN and
+                    self._probes >= self.half_open_probes):
+                raise googlemaps.exceptions.CircuitOpenError(self.name, 0)
+
+    def before_request(self):
+        """Checks that a request may be sent.
+
+        :raises googlemaps.exceptions.CircuitOpenError: if the breaker is
+            open, or half-open with all probes in flight.
+        """
+        transition = None
+        with self._lock:
+            if self.state == OPEN:
+                remaining = self._opened_at + self.reset_timeout - time.monotonic()
+                if remaining > 0:
+                    raise googlemaps.exceptions.CircuitOpenError(
+                        self.name, remaining)
+                transition = self._transition(HALF_OPEN)
+            if self.state == HALF_OPEN:
+                if self._probes >= self.half_open_probes:
+                    raise googlemaps.exceptions.CircuitOpenError(
+                        self.name, 0)
+                self._probes += 1
+        self._notify(transition)
+
+    def record_success(self):
+        """Records that the endpoint responded."""
+        transition = None
+        with self._lock:
+            self.failures = 0
+            if self.state != CLOSED:
+                transition = self._transition(CLOSED)
+        self._notify(transition)
+
+    def record_failure(self):
+        """Records that the endpoint failed to respond properly."""
+        transition = None
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or (
+                    self.state == CLOSED and
+                    self.failures >= self.failure_threshold):
+                transition = self._transition(OPEN)
+        self._notify(transition)
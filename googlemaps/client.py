@@ -22,25 +22,36 @@ HTTP requests).
 
 import base64
 import collections
+from concurrent import futures
 import logging
 from datetime import datetime
 from datetime import timedelta
 import functools
 import hashlib
 import hmac
+import json
 import re
 import requests
 import random
 import time
 import math
 import sys
+import threading
 
 import googlemaps
+from googlemaps import cache as _cache
+from googlemaps import circuitbreaker
+from googlemaps import convert
+from googlemaps import decoder
+from googlemaps import hedging
+from googlemaps import ratelimit
+from googlemaps import recording
+from googlemaps import transport as _transport
 
 try: # Python 3
-    from urllib.parse import urlencode
+    from urllib.parse import quote_plus
 except ImportError: # Python 2
-    from urllib import urlencode
+    from urllib import quote_plus
 
 logger = logging.getLogger(__name__)
 
@@ -60,7 +71,15 @@ class Client:
                  queries_per_second=60, queries_per_minute=6000,channel=None,
                  retry_over_query_limit=True, experience_id=None, 
                  requests_session=None,
-                 base_url=_DEFAULT_BASE_URL):
+                 base_url=_DEFAULT_BASE_URL,
+                 pool_connections=None, pool_maxsize=None, pool_block=None,
+                 tcp_nodelay=None, tcp_keepalive=None, dns_cache_ttl=None,
+                 base_url_overrides=None, cassette=None, cassette_mode=None,
+                 replay_speed=None, transport=None, batch_quota_share=None,
+                 adaptive_rate_limit=False, circuit_breaker_threshold=None,
+                 circuit_breaker_timeout=30, hooks=None, hedge_requests=False,
+                 hedge_max_ratio=0.05, time_bucket=None, cache_ttl=None,
+                 cache_size=1000):
         """
         :param key: Maps API key. Required, unless "client_id" and
             "client_secret" are set. Most users should use an API key.
@@ -108,6 +127,62 @@ class Client:
             appropriate amount of time before it runs the current query.
         :type queries_per_minute: int
 
+        :param batch_quota_share: The fraction of the query rate that calls
+            made with priority=googlemaps.ratelimit.BATCH may use, keeping
+            the rest for more urgent calls. Whatever the share, queued calls
+            are always sent most urgent first. Defaults to None (no limit).
+        :type batch_quota_share: float
+
+        :param adaptive_rate_limit: If True, the query rate is halved when
+            the API responds with OVER_QUERY_LIMIT (or an equivalent) or a
+            retriable 5xx error, and recovers gradually up to the configured
+            rate afterwards. The current rate is given by
+            client.rate_limiter.effective_rate. Defaults to False.
+        :type adaptive_rate_limit: bool
+
+        :param circuit_breaker_threshold: When set, requests to an endpoint
+            (base URL and path) fail fast with CircuitOpenError after this
+            many consecutive transport errors, timeouts or 5xx responses,
+            instead of being retried. See googlemaps.circuitbreaker.
+            Defaults to None (disabled).
+        :type circuit_breaker_threshold: int
+
+        :param circuit_breaker_timeout: The number of seconds an open
+            circuit waits before letting a probe request through.
+        :type circuit_breaker_timeout: float
+
+        :param hedge_requests: If True, GET requests still outstanding after
+            the 95th percentile latency of their endpoint are sent again, and
+            the first response is used. Hedges count against the query rate
+            limit. See googlemaps.hedging and client.hedge_stats(). Defaults
+            to False.
+        :type hedge_requests: bool
+
+        :param hedge_max_ratio: The maximum number of hedges, as a fraction
+            of all requests. Defaults to 0.05.
+        :type hedge_max_ratio: float
+
+        :param time_bucket: When set, departure times (including "now")
+            are rounded up to the end of buckets of this many seconds, e.g.
+            300 for 5 minutes, so that requests within a bucket are
+            identical and can be served from the cache.
+        :type time_bucket: int
+
+        :param cache_ttl: When set, results of GET requests are cached for
+            this many seconds, which bounds their staleness. Each call gets
+            its own copy of a cached result. See client.cache.
+        :type cache_ttl: float
+
+        :param cache_size: The maximum number of cached results. Defaults to
+            1000.
+        :type cache_size: int
+
+        :param hooks: Callbacks for client events, keyed by event name, e.g.
+            {"circuit_breaker": [log_transition]}. Events:
+            "circuit_breaker": called with (endpoint, old state, new state)
+            when a circuit breaker changes state.
+        :type hooks: dict of functions or lists of functions
+
         :param retry_over_query_limit: If True, requests that result in a
             response indicating the query rate limit was exceeded will be
             retried. Defaults to True.
@@ -135,6 +210,66 @@ class Client:
             server. Should not have a trailing slash.
         :type base_url: string
 
+        :param base_url_overrides: Replacement base URLs for the other API
+            hosts, keyed by their default base URL, e.g.
+            {"https://roads.googleapis.com": "http://localhost:8080"}. See
+            googlemaps.fakeserver.
+        :type base_url_overrides: dict
+
+        :param pool_connections: The number of connection pools to cache for
+            each API base URL. Defaults to 10.
+        :type pool_connections: int
+
+        :param pool_maxsize: The maximum number of persistent connections
+            kept open to each API host. Set this to at least the number of
+            threads sharing the client, otherwise surplus connections are
+            discarded after use. Defaults to 10.
+        :type pool_maxsize: int
+
+        :param pool_block: If True, requests wait for a pooled connection to
+            become free instead of opening a new one once pool_maxsize is
+            reached. Defaults to False.
+        :type pool_block: bool
+
+        :param tcp_nodelay: Whether to set TCP_NODELAY on new connections.
+            Defaults to True.
+        :type tcp_nodelay: bool
+
+        :param tcp_keepalive: Idle time in seconds after which TCP keep-alive
+            probes are sent on pooled connections. Defaults to None
+            (disabled).
+        :type tcp_keepalive: int
+
+        :param dns_cache_ttl: When set, host names are resolved once and the
+            address is reused for new connections for this many seconds.
+            Defaults to None (resolve on every new connection).
+        :type dns_cache_ttl: int
+
+        The connection pool options are applied to the client's own session,
+        and to requests_session only when at least one of them is given.
+
+        :param cassette: Records responses to, or replays them from, this
+            cassette file (or googlemaps.recording.Cassette). See
+            googlemaps.recording.
+        :type cassette: string or googlemaps.recording.Cassette
+
+        :param cassette_mode: "record" to send requests and record their
+            responses (call client.cassette.save() when done), or "replay" to
+            answer requests from the cassette without network access.
+            Defaults to "replay".
+        :type cassette_mode: string
+
+        :param replay_speed: When replaying, delays responses by the time
+            they took when recorded, divided by this factor. Defaults to None
+            (no delay).
+        :type replay_speed: float
+
+        :param transport: Sends the HTTP requests, e.g. a
+            googlemaps.transport.HTTP2Transport. Defaults to a
+            googlemaps.transport.RequestsTransport using requests_session,
+            to which the connection pool and cassette options apply.
+        :type transport: googlemaps.transport.Transport
+
         """
         if not key and not (client_secret and client_id):
             raise ValueError("Must provide API key or enterprise credentials "
@@ -151,6 +286,10 @@ class Client:
                     "client_id, it must be 0-999.")
 
         self.session = requests_session or requests.Session()
+        self.transport = transport or _transport.RequestsTransport(self.session)
+        # Whether close should release the transport, which the caller
+        # otherwise owns.
+        self._owns_transport = transport is None and requests_session is None
         self.key = key
 
         if timeout and (connect_timeout or read_timeout):
@@ -169,6 +308,10 @@ class Client:
 
         self.client_id = client_id
         self.client_secret = client_secret
+        # The HMAC keyed with the client secret, copied for each signature.
+        self._hmac = None
+        if client_secret:
+            self._hmac = (client_secret, _hmac_template(client_secret))
         self.channel = channel
         self.retry_timeout = timedelta(seconds=retry_timeout)
         self.requests_kwargs = requests_kwargs or {}
@@ -197,9 +340,322 @@ class Client:
             sys.exit("MISSING VALUE for queries_per_second or queries_per_minute")
 
         self.retry_over_query_limit = retry_over_query_limit
-        self.sent_times = collections.deque("", self.queries_quota)
+        self.rate_limiter = ratelimit.RateLimiter(
+            self.queries_quota, batch_share=batch_quota_share,
+            adaptive=adaptive_rate_limit)
+        self._local = threading.local()
+        self.hooks = dict((event, hook if isinstance(hook, list) else [hook])
+                          for event, hook in (hooks or {}).items())
+        self.circuit_breaker_threshold = circuit_breaker_threshold
+        self.circuit_breaker_timeout = circuit_breaker_timeout
+        self.circuit_breakers = {}
+        self._circuit_breakers_lock = threading.Lock()
+        self.hedger = None
+        if hedge_requests:
+            self.hedger = hedging.Hedger(max_ratio=hedge_max_ratio)
+        self.time_bucket = time_bucket
+        self.cache = None
+        if cache_ttl:
+            self.cache = _cache.ResponseCache(cache_ttl, max_size=cache_size)
         self.set_experience_id(experience_id)
         self.base_url = base_url
+        self.base_url_overrides = dict(base_url_overrides or {})
+
+        self.adapters = {}
+        pool_options = {
+            "pool_connections": pool_connections,
+            "pool_maxsize": pool_maxsize,
+            "pool_block": pool_block,
+            "tcp_nodelay": tcp_nodelay,
+            "tcp_keepalive": tcp_keepalive,
+        }
+        self.dns_cache = None
+        if dns_cache_ttl is not None:
+            self.dns_cache = _transport.DNSCache(ttl=dns_cache_ttl)
+        if requests_session is None or self.dns_cache or any(
+                v is not None for v in pool_options.values()):
+            # One adapter per API host, so that each host gets its own
+            # pool of persistent connections.
+            for url in _service_base_urls(self.base_url,
+                                          self.base_url_overrides):
+                adapter = _transport.PooledHTTPAdapter(
+                    dns_cache=self.dns_cache, **pool_options)
+                self.session.mount(url, adapter)
+                self.adapters[url] = adapter
+
+        self.cassette = None
+        if cassette is not None:
+            self._mount_cassette(cassette, cassette_mode or recording.REPLAY,
+                                 replay_speed)
+
+    def _mount_cassette(self, cassette, mode, speed):
+        """Routes the requests to the API hosts through a cassette."""
+        if mode == recording.RECORD:
+            if not isinstance(cassette, recording.Cassette):
+                cassette = recording.Cassette(cassette)
+            for url in _service_base_urls(self.base_url,
+                                          self.base_url_overrides):
+                self.session.mount(url, recording.RecordingAdapter(
+                    self.session.get_adapter(url), cassette))
+        elif mode == recording.REPLAY:
+            if not isinstance(cassette, recording.Cassette):
+                cassette = recording.Cassette.load(cassette)
+            adapter = recording.ReplayAdapter(cassette, speed=speed)
+            # Catch all URLs, so that nothing reaches the network.
+            for url in ("http://", "https://"):
+                self.session.mount(url, adapter)
+            for url in _service_base_urls(self.base_url,
+                                          self.base_url_overrides):
+                self.session.mount(url, adapter)
+            self.adapters = {}
+        else:
+            raise ValueError("Invalid cassette_mode: %s" % mode)
+        self.cassette = cassette
+
+    def warmup(self, connections=1, base_urls=None):
+        """Resolves and opens pooled connections to the API hosts ahead of
+        time, so that the first requests don't pay for DNS, TCP and TLS
+        handshakes.
+
+        Failures are logged and otherwise ignored, the affected host is then
+        simply connected to on first use.
+
+        :param connections: The number of connections to open per host,
+            typically the number of threads sharing the client. Capped at
+            pool_maxsize.
+        :type connections: int
+
+        :param base_urls: The base URLs to warm up. Defaults to all of the
+            API hosts the client has a connection pool for.
+        :type base_urls: list of strings
+
+        :rtype: dict mapping base URLs to the number of connections ready
+        """
+        if base_urls is None:
+            base_urls = list(self.adapters)
+
+        ready = {}
+        for url in base_urls:
+            adapter = self.adapters.get(url) or self.session.get_adapter(url)
+            # Pools are keyed by TLS settings, so warm up the same pool that
+            # requests will be sent on.
+            settings = self.session.merge_environment_settings(
+                url, {}, None, self.requests_kwargs.get("verify"),
+                self.requests_kwargs.get("cert"))
+            try:
+                ready[url] = adapter.warmup(url, connections,
+                                            verify=settings["verify"],
+                                            cert=settings["cert"])
+            except Exception as e:
+                logger.warning("Unable to warm up connections to %s: %s",
+                               url, e)
+                ready[url] = 0
+        return ready
+
+    def pool_stats(self):
+        """Returns connection pool utilization for each API base URL.
+
+        :rtype: dict mapping base URLs to the counters described in
+            googlemaps.transport.PooledHTTPAdapter.pool_stats
+        """
+        return dict((url, adapter.pool_stats())
+                    for url, adapter in self.adapters.items())
+
+    @property
+    def _extra_params(self):
+        # Per thread, so that concurrent calls don't see each other's.
+        return getattr(self._local, "extra_params", None)
+
+    @_extra_params.setter
+    def _extra_params(self, value):
+        self._local.extra_params = value
+
+    @_extra_params.deleter
+    def _extra_params(self):
+        del self._local.extra_params
+
+    def _call_kwargs(self):
+        """Returns the extra_params, priority and deadline arguments of the
+        API method being called on this thread, so that they can be passed
+        on to calls it makes on other threads."""
+        kwargs = {}
+        if self._extra_params:
+            kwargs["extra_params"] = self._extra_params
+        priority = getattr(self._local, "priority", None)
+        if priority is not None:
+            kwargs["priority"] = priority
+        deadline = getattr(self._local, "deadline", None)
+        if deadline is not None:
+            kwargs["deadline"] = deadline - time.monotonic()
+        return kwargs
+
+    def map(self, method, items, concurrency=10, priority=None):
+        """Calls an API method once per item, concurrently, sharing the
+        client's rate limit.
+
+        For example:
+
+            results = client.map("geocode", ["Sydney", "Melbourne"])
+            matrices = client.map(client.distance_matrix, [
+                {"origins": "Sydney", "destinations": "Perth"},
+                {"origins": "Sydney", "destinations": "Darwin"},
+            ])
+
+        :param method: The API method, either as a name (e.g. "geocode") or a
+            bound method of this client.
+        :type method: string or function
+
+        :param items: The arguments of each call: a dict of keyword
+            arguments, a tuple of positional arguments, or else the single
+            positional argument.
+        :type items: iterable
+
+        :param concurrency: The number of calls in flight at a time. Raise
+            pool_maxsize to match when going above 10.
+        :type concurrency: int
+
+        :param priority: The priority of the calls, e.g.
+            googlemaps.ratelimit.BATCH for bulk work that should not hold up
+            other calls sharing the client.
+        :type priority: int
+
+        :rtype: list of the results, in the order of items. Calls that raised
+            an exception have the exception in place of their result.
+        """
+        results = []
+        for i, result in self.map_as_completed(method, items, concurrency,
+                                               priority):
+            results.extend([None] * (i + 1 - len(results)))
+            results[i] = result
+        return results
+
+    def map_as_completed(self, method, items, concurrency=10, priority=None):
+        """Like map, but yields (index, result) tuples as the calls complete,
+        where index is the position of the call's item in items.
+
+        Items are consumed lazily, so that items can be a long running
+        generator.
+
+        When called from an API method, e.g. one splitting its work into
+        several calls, the calls inherit its extra_params, priority and
+        deadline, unless their items or priority set them.
+
+        :rtype: iterator of (int, result or exception) tuples
+        """
+        if not callable(method):
+            method = getattr(self, method)
+        # The calls run on other threads, so the state of the calling API
+        # method is taken now, rather than when iteration starts.
+        call_kwargs = self._call_kwargs()
+        if priority is not None:
+            call_kwargs["priority"] = priority
+        deadline = call_kwargs.pop("deadline", None)
+        if deadline is not None:
+            deadline += time.monotonic()
+        return self._map_as_completed(method, items, concurrency,
+                                      call_kwargs, deadline)
+
+    def _map_as_completed(self, method, items, concurrency, call_kwargs,
+                          deadline):
+        def call(item):
+            kwargs = {}
+            if isinstance(item, dict):
+                kwargs, args = dict(item), ()
+            elif isinstance(item, tuple):
+                args = item
+            else:
+                args = (item,)
+            for name, value in call_kwargs.items():
+                kwargs.setdefault(name, value)
+            if deadline is not None:
+                kwargs.setdefault("deadline", deadline - time.monotonic())
+            try:
+                return method(*args, **kwargs)
+            except Exception as e:
+                return e
+
+        items = enumerate(items)
+        pending = {}
+        with futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+            while True:
+                # Keep the pool busy, without queuing up all items at once.
+                for i, item in items:
+                    pending[executor.submit(call, item)] = i
+                    if len(pending) >= 2 * concurrency:
+                        break
+                if not pending:
+                    return
+                done, _ = futures.wait(pending,
+                                       return_when=futures.FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+
+    @property
+    def sent_times(self):
+        """The time.time() times at which the requests of the last second
+        were sent, oldest first. Kept for compatibility: it is a copy of the
+        rate limiter's bookkeeping, see client.rate_limiter.
+
+        :rtype: collections.deque
+        """
+        offset = time.time() - time.monotonic()
+        return collections.deque(
+            (t + offset for t in self.rate_limiter.sent_times),
+            self.queries_quota)
+
+    def hedge_stats(self):
+        """Returns the counters of hedged requests.
+
+        :rtype: dict, see googlemaps.hedging.Hedger.stats, or None if
+            hedging is disabled
+        """
+        if self.hedger is None:
+            return None
+        return self.hedger.stats()
+
+    def close(self):
+        """Stops the threads sending hedged requests, and releases the
+        connections of the transport unless it was passed in, as
+        transport or requests_session."""
+        if self.hedger is not None:
+            self.hedger.shutdown()
+        if self._owns_transport:
+            self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _dispatch_hook(self, event, *args):
+        for hook in self.hooks.get(event, ()):
+            try:
+                hook(*args)
+            except Exception:
+                logger.exception("Error in %s hook", event)
+
+    def _on_circuit_state_change(self, endpoint, old_state, new_state):
+        logger.warning("Circuit breaker for %s: %s -> %s", endpoint,
+                       old_state, new_state)
+        self._dispatch_hook("circuit_breaker", endpoint, old_state, new_state)
+
+    def _circuit_breaker(self, base_url, url):
+        """Returns the circuit breaker of an endpoint, or None if circuit
+        breaking is disabled."""
+        if self.circuit_breaker_threshold is None:
+            return None
+        endpoint = base_url + url
+        with self._circuit_breakers_lock:
+            breaker = self.circuit_breakers.get(endpoint)
+            if breaker is None:
+                breaker = circuitbreaker.CircuitBreaker(
+                    endpoint,
+                    failure_threshold=self.circuit_breaker_threshold,
+                    reset_timeout=self.circuit_breaker_timeout,
+                    on_state_change=self._on_circuit_state_change)
+                self.circuit_breakers[endpoint] = breaker
+            return breaker
 
     def set_experience_id(self, *experience_id_args):
         """Sets the value for the HTTP header field name
@@ -238,7 +694,8 @@ class Client:
 
     def _request(self, url, params, first_request_time=None, retry_counter=0,
              base_url=None, accepts_clientid=True,
-             extract_body=None, requests_kwargs=None, post_json=None):
+             extract_body=None, requests_kwargs=None, post_json=None,
+             authed_url=None):
         """Performs HTTP GET/POST with credentials, returning the body as
         JSON.
 
@@ -273,6 +730,10 @@ class Client:
             per-request basis.
         :type requests_kwargs: dict
 
+        :param authed_url: The signed path and query string of a previous
+            attempt of this request, reused when retrying.
+        :type authed_url: string
+
         :raises ApiError: when the API returns an error.
         :raises Timeout: if the request timed out.
         :raises TransportError: when something went wrong while trying to
@@ -281,7 +742,8 @@ class Client:
 
         if base_url is None:
             base_url = self.base_url
-            
+        base_url = self.base_url_overrides.get(base_url, base_url)
+
         if not first_request_time:
             first_request_time = datetime.now()
 
@@ -289,6 +751,11 @@ class Client:
         if elapsed > self.retry_timeout:
             raise googlemaps.exceptions.Timeout()
 
+        # The time left for the call, as set with the deadline argument.
+        deadline = getattr(self._local, "deadline", None)
+        if deadline is not None and deadline <= time.monotonic():
+            raise googlemaps.exceptions.Timeout()
+
         if retry_counter > 0:
             # 0.5 * (1.5 ^ i) is an increased sleep time of 1.5x per iteration,
             # starting at 0.5s when retry_counter=0. The first retry will occur
@@ -296,9 +763,17 @@ class Client:
             delay_seconds = 0.5 * 1.5 ** (retry_counter - 1)
 
             # Jitter this value by 50% and pause.
-            time.sleep(delay_seconds * (random.random() + 0.5))
-
-        authed_url = self._generate_auth_url(url, params, accepts_clientid)
+            delay_seconds *= random.random() + 0.5
+            if (deadline is not None and
+                    time.monotonic() + delay_seconds >= deadline):
+                # No time left for another attempt.
+                raise googlemaps.exceptions.Timeout()
+            time.sleep(delay_seconds)
+
+        if authed_url is None:
+            if self.time_bucket:
+                params = _bucket_times(params, self.time_bucket)
+            authed_url = self._generate_auth_url(url, params, accepts_clientid)
 
         # Default to the client-level self.requests_kwargs, with method-level
         # requests_kwargs arg overriding.
@@ -306,48 +781,108 @@ class Client:
         final_requests_kwargs = dict(self.requests_kwargs, **requests_kwargs)
 
         # Determine GET/POST.
-        requests_method = self.session.get
+        method = "GET"
+        body = None
         if post_json is not None:
-            requests_method = self.session.post
-            final_requests_kwargs["json"] = post_json
+            method = "POST"
+            body = json.dumps(post_json).encode("utf-8")
+            final_requests_kwargs["headers"] = dict(
+                final_requests_kwargs.get("headers") or {},
+                **{"Content-Type": "application/json"})
+
+        cache_key = None
+        if (self.cache is not None and method == "GET" and
+                not final_requests_kwargs.get("stream")):
+            cache_key = recording.request_key(method, base_url + authed_url)
+            if retry_counter == 0:
+                result = self.cache.get(cache_key)
+                if result is not None:
+                    return result
+
+        # Fail fast while the endpoint's circuit is open, without waiting
+        # for, and using up, a slot of the rate limit.
+        breaker = self._circuit_breaker(base_url, url)
+        if breaker is not None:
+            breaker.check()
+
+        priority = getattr(self._local, "priority", None)
+        if priority is None:
+            priority = ratelimit.NORMAL
+        if deadline is None:
+            self.rate_limiter.acquire(priority)
+        else:
+            if not self.rate_limiter.acquire(priority,
+                                             deadline - time.monotonic()):
+                raise googlemaps.exceptions.Timeout()
+            final_requests_kwargs["timeout"] = _bound_timeout(
+                final_requests_kwargs.get("timeout"),
+                deadline - time.monotonic())
+
+        # Probes are only reserved once the request is about to be sent, so
+        # that a half-open breaker's probe always ends with a success or a
+        # failure.
+        if breaker is not None:
+            breaker.before_request()
+
+        def send():
+            return self.transport.send(method, base_url + authed_url,
+                                       body=body, **final_requests_kwargs)
 
         try:
-            response = requests_method(base_url + authed_url,
-                                       **final_requests_kwargs)
-        except requests.exceptions.Timeout:
-            raise googlemaps.exceptions.Timeout()
+            if (self.hedger is not None and method == "GET" and
+                    not final_requests_kwargs.get("stream")):
+                # Hedges are only sent if the rate limit allows it right
+                # away, rather than keeping the caller waiting.
+                response = self.hedger.send(
+                    base_url + url, send,
+                    lambda: self.rate_limiter.acquire(priority, 0))
+            else:
+                response = send()
+        except googlemaps.exceptions.Timeout:
+            if breaker is not None:
+                breaker.record_failure()
+            raise
         except Exception as e:
+            if breaker is not None:
+                breaker.record_failure()
             raise googlemaps.exceptions.TransportError(e)
 
+        if breaker is not None:
+            if response.status_code in _RETRIABLE_STATUSES:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
         if response.status_code in _RETRIABLE_STATUSES:
+            self.rate_limiter.throttled()
+            if final_requests_kwargs.get("stream"):
+                # Release the connection, the body is never read.
+                response.close()
             # Retry request.
             return self._request(url, params, first_request_time,
                                  retry_counter + 1, base_url, accepts_clientid,
-                                 extract_body, requests_kwargs, post_json)
-
-        # Check if the time of the nth previous query (where n is
-        # queries_per_second) is under a second ago - if so, sleep for
-        # the difference.
-        if self.sent_times and len(self.sent_times) == self.queries_quota:
-            elapsed_since_earliest = time.time() - self.sent_times[0]
-            if elapsed_since_earliest < 1:
-                time.sleep(1 - elapsed_since_earliest)
+                                 extract_body, requests_kwargs, post_json,
+                                 authed_url)
 
         try:
             if extract_body:
                 result = extract_body(response)
             else:
                 result = self._get_body(response)
-            self.sent_times.append(time.time())
+            if cache_key is not None and isinstance(result, (dict, list)):
+                self.cache.set(cache_key, result)
             return result
         except googlemaps.exceptions._RetriableRequest as e:
-            if isinstance(e, googlemaps.exceptions._OverQueryLimit) and not self.retry_over_query_limit:
-                raise
+            if isinstance(e, googlemaps.exceptions._OverQueryLimit):
+                self.rate_limiter.throttled()
+                if not self.retry_over_query_limit:
+                    raise
 
             # Retry request.
             return self._request(url, params, first_request_time,
                                  retry_counter + 1, base_url, accepts_clientid,
-                                 extract_body, requests_kwargs, post_json)
+                                 extract_body, requests_kwargs, post_json,
+                                 authed_url)
 
     def _get(self, *args, **kwargs):  # Backwards compatibility.
         return self._request(*args, **kwargs)
@@ -356,7 +891,7 @@ class Client:
         if response.status_code != 200:
             raise googlemaps.exceptions.HTTPError(response.status_code)
 
-        body = response.json()
+        body = decoder.json_body(response)
 
         api_status = body["status"]
         if api_status == "OK" or api_status == "ZERO_RESULTS":
@@ -396,7 +931,11 @@ class Client:
             params.append(("client", self.client_id))
 
             path = "?".join([path, urlencode_params(params)])
-            sig = sign_hmac(self.client_secret, path)
+            if self._hmac is None or self._hmac[0] != self.client_secret:
+                # The secret was changed after the client was created.
+                self._hmac = (self.client_secret,
+                              _hmac_template(self.client_secret))
+            sig = _sign(self._hmac[1], path)
             return path + "&signature=" + sig
 
         if self.key:
@@ -406,9 +945,30 @@ class Client:
         raise ValueError("Must provide API key for this API. It does not accept "
                          "enterprise credentials.")
 
+    def _url_length(self, url, params, base_url=None, accepts_clientid=True):
+        """Returns the length of the full URL _request would send.
+
+        :param url: The path portion of the URL.
+        :type url: string
+
+        :param params: URL parameters.
+        :type params: dict or list of key/value tuples
+
+        :rtype: int
+        """
+        if base_url is None:
+            base_url = self.base_url
+        base_url = self.base_url_overrides.get(base_url, base_url)
+        return len(base_url) + len(
+            self._generate_auth_url(url, params, accepts_clientid))
+
 
 from googlemaps.directions import directions
+from googlemaps.directions import directions_stream
+from googlemaps.directions import directions_long
 from googlemaps.distance_matrix import distance_matrix
+from googlemaps.distance_matrix import distance_matrix_stream
+from googlemaps.distance_matrix import distance_matrix_bulk
 from googlemaps.elevation import elevation
 from googlemaps.elevation import elevation_along_path
 from googlemaps.geocoding import geocode
@@ -427,22 +987,80 @@ from googlemaps.places import places_photo
 from googlemaps.places import places_autocomplete
 from googlemaps.places import places_autocomplete_query
 from googlemaps.maps import static_map
+from googlemaps.optimization import optimize_waypoints
 from googlemaps.addressvalidation import addressvalidation
 
+from googlemaps.roads import _ROADS_BASE_URL
+from googlemaps.geolocation import _GEOLOCATION_BASE_URL
+from googlemaps.addressvalidation import _ADDRESSVALIDATION_BASE_URL
+
+
+def _service_base_urls(base_url, overrides):
+    """Returns the distinct base URLs the client sends requests to."""
+    urls = [base_url, _ROADS_BASE_URL, _GEOLOCATION_BASE_URL,
+            _ADDRESSVALIDATION_BASE_URL]
+    urls = [overrides.get(url, url) for url in urls]
+    return sorted(set(urls), key=urls.index)
+
+def _bucket_times(params, seconds):
+    """Returns the request parameters with the departure time rounded up to
+    the end of its time bucket."""
+    if isinstance(params, dict):
+        if "departure_time" not in params:
+            return params
+        return dict(params, departure_time=convert.bucket_time(
+            params["departure_time"], seconds))
+    return [(k, convert.bucket_time(v, seconds) if k == "departure_time"
+             else v) for k, v in params]
+
+
+def _bound_timeout(timeout, remaining):
+    """Caps a requests timeout (None, a number or a (connect, read) tuple) to
+    the remaining seconds."""
+    remaining = max(remaining, 0.001)
+    if isinstance(timeout, tuple):
+        return tuple(remaining if t is None else min(t, remaining)
+                     for t in timeout)
+    if timeout is None:
+        return remaining
+    return min(timeout, remaining)
+
 def make_api_method(func):
     """
     Provides a single entry point for modifying all API methods.
     For now this is limited to allowing the client object to be modified
     with an `extra_params` keyword arg to each method, that is then used
-    as the params for each web service request.
+    as the params for each web service request, a `priority` keyword arg
+    (see googlemaps.ratelimit) for the rate limiter, and a `deadline`
+    keyword arg: the number of seconds the call may take, across rate limit
+    waits, HTTP timeouts and retries, after which it fails with
+    googlemaps.exceptions.Timeout.
 
     Please note that this is an unsupported feature for advanced use only.
-    It's also currently incompatibile with multiple threads, see GH #160.
     """
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
+        local = args[0]._local
+        outer_priority = getattr(local, "priority", None)
+        outer_deadline = getattr(local, "deadline", None)
+
         args[0]._extra_params = kwargs.pop("extra_params", None)
-        result = func(*args, **kwargs)
+        priority = kwargs.pop("priority", None)
+        if priority is not None:
+            local.priority = priority
+        deadline = kwargs.pop("deadline", None)
+        if deadline is not None:
+            deadline = time.monotonic() + deadline
+            # Calls made by other calls don't get more time than them.
+            if outer_deadline is not None:
+                deadline = min(deadline, outer_deadline)
+            local.deadline = deadline
+
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            local.priority = outer_priority
+            local.deadline = outer_deadline
         try:
             del args[0]._extra_params
         except AttributeError:
@@ -452,7 +1070,11 @@ def make_api_method(func):
 
 
 Client.directions = make_api_method(directions)
+Client.directions_stream = make_api_method(directions_stream)
+Client.directions_long = make_api_method(directions_long)
 Client.distance_matrix = make_api_method(distance_matrix)
+Client.distance_matrix_stream = make_api_method(distance_matrix_stream)
+Client.distance_matrix_bulk = make_api_method(distance_matrix_bulk)
 Client.elevation = make_api_method(elevation)
 Client.elevation_along_path = make_api_method(elevation_along_path)
 Client.geocode = make_api_method(geocode)
@@ -471,6 +1093,7 @@ Client.places_photo = make_api_method(places_photo)
 Client.places_autocomplete = make_api_method(places_autocomplete)
 Client.places_autocomplete_query = make_api_method(places_autocomplete_query)
 Client.static_map = make_api_method(static_map)
+Client.optimize_waypoints = make_api_method(optimize_waypoints)
 Client.addressvalidation = make_api_method(addressvalidation)
 
 
@@ -485,13 +1108,26 @@ def sign_hmac(secret, payload):
 
     :rtype: string
     """
-    payload = payload.encode('ascii', 'strict')
-    secret = secret.encode('ascii', 'strict')
-    sig = hmac.new(base64.urlsafe_b64decode(secret), payload, hashlib.sha1)
+    return _sign(_hmac_template(secret), payload)
+
+
+def _sign(template, payload):
+    """Signs payload with a copy of an HMAC object from _hmac_template."""
+    sig = template.copy()
+    sig.update(payload.encode('ascii', 'strict'))
     out = base64.urlsafe_b64encode(sig.digest())
     return out.decode('utf-8')
 
 
+def _hmac_template(secret):
+    """Returns an HMAC-SHA1 object keyed with the given base64 encoded
+    secret, to be copied for each signature. Keeping it saves decoding the
+    secret and hashing the key for every request.
+    """
+    secret = secret.encode('ascii', 'strict')
+    return hmac.new(base64.urlsafe_b64decode(secret), digestmod=hashlib.sha1)
+
+
 def urlencode_params(params):
     """URL encodes the parameters.
 
@@ -500,19 +1136,33 @@ def urlencode_params(params):
 
     :rtype: string
     """
-    # urlencode does not handle unicode strings in Python 2.
-    # Firstly, normalize the values so they get encoded correctly.
-    extended = []
+    # NOTE: this is equivalent to urllib's urlencode, followed by
+    # requests.utils.unquote_unreserved (unreserved chars must not be quoted,
+    # or auth signatures become invalid, see GH #72), in a single pass.
+    parts = []
     for key, val in params:
+        key = _quote(key if type(key) is str else str(key))
         if isinstance(val, (list, tuple)):
             for v in val:
-                extended.append((key, normalize_for_urlencode(v)))
+                parts.append(key + "=" + _quote(normalize_for_urlencode(v)))
         else:
-            extended.append((key, normalize_for_urlencode(val)))
-    # Secondly, unquote unreserved chars which are incorrectly quoted
-    # by urllib.urlencode, causing invalid auth signatures. See GH #72
-    # for more info.
-    return requests.utils.unquote_unreserved(urlencode(extended))
+            parts.append(key + "=" + _quote(normalize_for_urlencode(val)))
+    return "&".join(parts)
+
+
+# Strings of unreserved chars need no quoting at all. Most of the remaining
+# values are lat/lng lists, where only "," "|" and ":" need quoting.
+_UNRESERVED = re.compile(r"[A-Za-z0-9_.~-]*")
+_UNRESERVED_AND_LIST_SEPARATORS = re.compile(r"[A-Za-z0-9_.~,|:-]*")
+
+
+def _quote(value):
+    """Quotes a string for use as a query string key or value."""
+    if _UNRESERVED.fullmatch(value):
+        return value
+    if _UNRESERVED_AND_LIST_SEPARATORS.fullmatch(value):
+        return value.replace(",", "%2C").replace("|", "%7C").replace(":", "%3A")
+    return quote_plus(value, safe="~")
 
 
 try:
@@ -0,0 +1,336 @@
+#
+# Copyright 2026 Google Inc. All rights reserved.
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+
+"""Collects bulk results into columnar batches.
+
+A ResultSink flattens geocode, reverse_geocode, elevation, snap_to_roads
+and distance_matrix results into rows as they arrive, and packs every
+batch_size rows into columns: a pyarrow RecordBatch when pyarrow is
+installed, or else a dict of array.array (numbers) and lists (strings).
+Batches can be written to a Parquet file as they fill up, so that a job of
+millions of results never holds them all as dicts.
+
+    with ResultSink("geocode", path="geocoded.parquet") as sink:
+        errors = sink.collect(client, addresses)
+
+Each row has the index of the request it answers, e.g. of the address in
+addresses, to join results back to their inputs.
+"""
+
+import array
+import threading
+
+from googlemaps import convert
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+_STRING = "string"
+_FLOAT = "float64"
+_INT = "int64"
+_BOOL = "bool"
+
+_GEOCODE_COLUMNS = [
+    ("index", _INT),
+    ("place_id", _STRING),
+    ("formatted_address", _STRING),
+    ("lat", _FLOAT),
+    ("lng", _FLOAT),
+    ("location_type", _STRING),
+    ("types", _STRING),
+    ("partial_match", _BOOL),
+]
+
+# The columns of the rows of each kind of result.
+SCHEMAS = {
+    "geocode": _GEOCODE_COLUMNS,
+    "reverse_geocode": _GEOCODE_COLUMNS,
+    "elevation": [
+        ("index", _INT),
+        ("lat", _FLOAT),
+        ("lng", _FLOAT),
+        ("elevation", _FLOAT),
+        ("resolution", _FLOAT),
+    ],
+    "snap_to_roads": [
+        ("index", _INT),
+        ("original_index", _INT),
+        ("lat", _FLOAT),
+        ("lng", _FLOAT),
+        ("place_id", _STRING),
+    ],
+    "distance_matrix": [
+        ("index", _INT),
+        ("origin_index", _INT),
+        ("destination_index", _INT),
+        ("origin", _STRING),
+        ("destination", _STRING),
+        ("status", _STRING),
+        ("distance", _INT),
+        ("duration", _INT),
+        ("duration_in_traffic", _INT),
+    ],
+}
+
+# How missing values are stored without pyarrow, which has nulls.
+_MISSING = {_STRING: None, _FLOAT: float("nan"), _INT: -1, _BOOL: False}
+_TYPECODES = {_FLOAT: "d", _INT: "q", _BOOL: "b"}
+
+
+class ResultSink:
+    """Flattens results into columnar batches. Safe to share between
+    threads."""
+
+    def __init__(self, kind, batch_size=65536, path=None, on_batch=None,
+                 keep_batches=None):
+        """
+        :param kind: The method the results come from: "geocode",
+            "reverse_geocode", "elevation", "snap_to_roads" or
+            "distance_matrix". See SCHEMAS for the columns of each.
+        :type kind: string
+
+        :param batch_size: The number of rows per batch.
+        :type batch_size: int
+
+        :param path: A Parquet file the batches are written to as they fill
+            up. Requires pyarrow.
+        :type path: string
+
+        :param on_batch: Called with each batch as it fills up, e.g. to
+            write it elsewhere. It may be called from several threads at
+            once when the sink is shared.
+        :type on_batch: function
+
+        :param keep_batches: Whether to keep the batches, for table.
+            Defaults to True unless path or on_batch is given.
+        :type keep_batches: bool
+        """
+        if kind not in SCHEMAS:
+            raise ValueError("Unsupported result kind: %s" % kind)
+        if path is not None and pyarrow is None:
+            raise ImportError("pyarrow is required to write Parquet files.")
+        if keep_batches is None:
+            keep_batches = path is None and on_batch is None
+        self.kind = kind
+        self.columns = SCHEMAS[kind]
+        self.batch_size = batch_size
+        self.path = path
+        self.on_batch = on_batch
+        self.keep_batches = keep_batches
+        self.rows = 0
+        self.batches = []
+        self._flatten = _FLATTEN[kind]
+        self._buffer = []
+        self._writer = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def add(self, result, index=-1):
+        """Adds the rows of a result.
+
+        :param result: The result, as returned by the sink's method.
+        :type result: dict or list
+
+        :param index: The index of the request, stored in each row.
+        :type index: int
+        """
+        rows = list(self._flatten(result, index))
+        batches = []
+        with self._lock:
+            self._buffer.extend(rows)
+            self.rows += len(rows)
+            while len(self._buffer) >= self.batch_size:
+                rows = self._buffer[:self.batch_size]
+                del self._buffer[:self.batch_size]
+                batches.append(self._emit(rows))
+        self._notify(batches)
+
+    def collect(self, client, items, concurrency=10):
+        """Calls the sink's method on each item with client.map_as_completed,
+        adding results as they complete.
+
+        :param client: The client to call.
+        :type client: googlemaps.Client
+
+        :param items: The arguments of each call, as for client.map.
+        :type items: iterable
+
+        :rtype: list of (index, exception) tuples, for the calls that failed
+        """
+        errors = []
+        for i, result in client.map_as_completed(self.kind, items,
+                                                 concurrency=concurrency):
+            if isinstance(result, Exception):
+                errors.append((i, result))
+            else:
+                self.add(result, index=i)
+        return sorted(errors, key=lambda error: error[0])
+
+    def flush(self):
+        """Emits the buffered rows as a batch, even if it isn't full."""
+        batches = []
+        with self._lock:
+            if self._buffer:
+                rows, self._buffer = self._buffer, []
+                batches.append(self._emit(rows))
+        self._notify(batches)
+
+    def close(self):
+        """Flushes, and closes the Parquet file."""
+        self.flush()
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    def table(self):
+        """Returns the kept batches, flushing the buffered rows.
+
+        :rtype: pyarrow.Table, or without pyarrow, dict of column names to
+            array.array or list
+        """
+        if not self.keep_batches:
+            raise ValueError("Batches are not kept when written elsewhere.")
+        self.flush()
+        with self._lock:
+            if pyarrow is not None:
+                return pyarrow.Table.from_batches(self.batches,
+                                                  schema=self._schema())
+            table = {}
+            for name, kind in self.columns:
+                if kind in _TYPECODES:
+                    table[name] = array.array(_TYPECODES[kind])
+                else:
+                    table[name] = []
+                for batch in self.batches:
+                    table[name].extend(batch[name])
+            return table
+
+    def _emit(self, rows):
+        # Called with the lock held. on_batch is called by _notify, once
+        # the lock is released, so that it may add rows itself.
+        batch = self._batch(rows)
+        if self.path is not None:
+            if self._writer is None:
+                self._writer = pyarrow.parquet.ParquetWriter(self.path,
+                                                             self._schema())
+            self._writer.write_batch(batch)
+        if self.keep_batches:
+            self.batches.append(batch)
+        return batch
+
+    def _notify(self, batches):
+        if self.on_batch is not None:
+            for batch in batches:
+                self.on_batch(batch)
+
+    def _schema(self):
+        return pyarrow.schema([(name, _arrow_type(kind))
+                               for name, kind in self.columns])
+
+    def _batch(self, rows):
+        """Transposes rows into columns."""
+        columns = []
+        for values, (name, kind) in zip(zip(*rows), self.columns):
+            if pyarrow is not None:
+                columns.append(pyarrow.array(values, type=_arrow_type(kind)))
+            elif kind in _TYPECODES:
+                missing = _MISSING[kind]
+                columns.append(array.array(
+                    _TYPECODES[kind],
+                    [missing if value is None else value
+                     for value in values]))
+            else:
+                columns.append(list(values))
+        if pyarrow is not None:
+            return pyarrow.RecordBatch.from_arrays(columns,
+                                                   schema=self._schema())
+        return dict((name, column)
+                    for (name, _), column in zip(self.columns, columns))
+
+
+def _geocode_rows(result, index):
+    if isinstance(result, dict):
+        result = result.get("results", [])
+    for r in result:
+        geometry = r.get("geometry", {})
+        lat, lng = _location(geometry.get("location"))
+        yield (index, r.get("place_id"), r.get("formatted_address"),
+               lat, lng, geometry.get("location_type"),
+               "|".join(r.get("types", [])),
+               bool(r.get("partial_match")))
+
+
+def _elevation_rows(result, index):
+    for r in result:
+        lat, lng = _location(r.get("location"))
+        yield (index, lat, lng, r.get("elevation"), r.get("resolution"))
+
+
+def _snap_to_roads_rows(result, index):
+    if isinstance(result, dict):
+        result = result.get("snappedPoints", [])
+    for r in result:
+        lat, lng = _location(r.get("location"))
+        yield (index, r.get("originalIndex"), lat, lng, r.get("placeId"))
+
+
+def _distance_matrix_rows(result, index):
+    origins = result.get("origin_addresses", [])
+    destinations = result.get("destination_addresses", [])
+    for i, row in enumerate(result.get("rows", [])):
+        for j, element in enumerate(row["elements"]):
+            yield (index, i, j,
+                   origins[i] if i < len(origins) else None,
+                   destinations[j] if j < len(destinations) else None,
+                   element.get("status"),
+                   _value(element, "distance"),
+                   _value(element, "duration"),
+                   _value(element, "duration_in_traffic"))
+
+
+_FLATTEN = {
+    "geocode": _geocode_rows,
+    "reverse_geocode": _geocode_rows,
+    "elevation": _elevation_rows,
+    "snap_to_roads": _snap_to_roads_rows,
+    "distance_matrix": _distance_matrix_rows,
+}
+
+
+def _arrow_type(kind):
+    return pyarrow.bool_() if kind == _BOOL else getattr(pyarrow, kind)()
+
+
+def _location(location):
+    if location is None:
+        return None, None
+    return convert.normalize_lat_lng(location)
+
+
+def _value(element, name):
+    value = element.get(name)
+    return value["value"] if value else None
@@ -28,6 +28,28 @@
     # '-33.8674869,151.2069902'
 """
 
+import array
+import math
+import re
+import time as _time
+
+try: # Python 3
+    from urllib.parse import quote as _quote
+except ImportError: # Python 2
+    from urllib import quote as _quote
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# The mean radius of the earth, in meters.
+_EARTH_RADIUS = 6371000.0
+
+# The zeros "%.8f" leaves at the end of each value of a location list,
+# with the decimal point when all decimals are zeros.
+_TRAILING_ZEROS = re.compile(r"[.0]0*(?=[,|])")
+
 
 def format_float(arg):
     """Formats a float value to be as short as possible.
@@ -52,7 +74,9 @@ def format_float(arg):
 
     :rtype: string
     """
-    return ("%.8f" % float(arg)).rstrip("0").rstrip(".")
+    if type(arg) is not float:
+        arg = float(arg)
+    return ("%.8f" % arg).rstrip("0").rstrip(".")
 
 
 def latlng(arg):
@@ -77,8 +101,8 @@ def latlng(arg):
     if is_string(arg):
         return arg
 
-    normalized = normalize_lat_lng(arg)
-    return "%s,%s" % (format_float(normalized[0]), format_float(normalized[1]))
+    lat, lng = normalize_lat_lng(arg)
+    return format_float(lat) + "," + format_float(lng)
 
 
 def normalize_lat_lng(arg):
@@ -93,6 +117,10 @@ def normalize_lat_lng(arg):
 
     :rtype: tuple (lat, lng)
     """
+    # Fast path for the most common representations.
+    if type(arg) is tuple or type(arg) is list:
+        return arg[0], arg[1]
+
     if isinstance(arg, dict):
         if "lat" in arg and "lng" in arg:
             return arg["lat"], arg["lng"]
@@ -125,8 +153,24 @@ def location_list(arg):
     if isinstance(arg, tuple):
         # Handle the single-tuple lat/lng case.
         return latlng(arg)
-    else:
-        return "|".join([latlng(location) for location in as_list(arg)])
+    if isinstance(arg, LatLngArray):
+        return arg._location_list()
+
+    # NOTE: this inlines latlng and format_float, as it is called with
+    # hundreds of points at a time.
+    parts = []
+    for location in as_list(arg):
+        if is_string(location):
+            parts.append(location)
+            continue
+        lat, lng = normalize_lat_lng(location)
+        if type(lat) is not float:
+            lat = float(lat)
+        if type(lng) is not float:
+            lng = float(lng)
+        parts.append(("%.8f" % lat).rstrip("0").rstrip(".") + "," +
+                     ("%.8f" % lng).rstrip("0").rstrip("."))
+    return "|".join(parts)
 
 
 def join_list(sep, arg):
@@ -163,13 +207,15 @@ def _is_list(arg):
     return _has_method(arg, "__getitem__") if not _has_method(arg, "strip") else _has_method(arg, "__iter__")
 
 
+try:
+    _string_types = basestring
+except NameError:
+    _string_types = str
+
+
 def is_string(val):
     """Determines whether the passed value is a string, safe for 2/3."""
-    try:
-        basestring
-    except NameError:
-        return isinstance(val, str)
-    return isinstance(val, basestring)
+    return isinstance(val, _string_types)
 
 
 def time(arg):
@@ -192,6 +238,34 @@ def time(arg):
     return str(arg)
 
 
+def bucket_time(arg, seconds, now=None):
+    """Converts the value into the unix time at the end of the bucket it
+    falls in, buckets being the given number of seconds long.
+
+    All the times in a bucket convert to the same value, which is not
+    earlier than the time itself, so that a departure time in the future
+    stays in the future.
+
+    For example:
+        convert.bucket_time(1409810596, 300)
+        # '1409810700'
+
+    :param arg: The time, or "now".
+    :type arg: datetime.datetime, int or string
+
+    :param seconds: The length of the buckets.
+    :type seconds: int
+
+    :param now: The current unix time, used for "now". Defaults to the time
+        of the call.
+    :type now: float
+    """
+    if arg == "now":
+        arg = _time.time() if now is None else now
+    value = float(time(arg))
+    return str(int(math.ceil(value / seconds) * seconds))
+
+
 def _has_method(arg, method):
     """Returns true if the given object has a method with the given name.
 
@@ -298,7 +372,14 @@ def decode_polyline(polyline):
 
     :rtype: list of dicts with lat/lng keys
     """
-    points = []
+    lats, lngs = _decode_polyline(polyline)
+    return [{"lat": lat, "lng": lng} for lat, lng in zip(lats, lngs)]
+
+
+def _decode_polyline(polyline):
+    """Decodes a Polyline string into arrays of latitudes and longitudes."""
+    lats = array.array("d")
+    lngs = array.array("d")
     index = lat = lng = 0
 
     while index < len(polyline):
@@ -324,9 +405,10 @@ def decode_polyline(polyline):
                 break
         lng += ~(result >> 1) if (result & 1) != 0 else (result >> 1)
 
-        points.append({"lat": lat * 1e-5, "lng": lng * 1e-5})
+        lats.append(lat * 1e-5)
+        lngs.append(lng * 1e-5)
 
-    return points
+    return lats, lngs
 
 
 def encode_polyline(points):
@@ -340,6 +422,9 @@ def encode_polyline(points):
 
     :rtype: string
     """
+    if isinstance(points, LatLngArray):
+        return points._encode()
+
     last_lat = last_lng = 0
     result = ""
 
@@ -363,6 +448,151 @@ def encode_polyline(points):
     return result
 
 
+class LatLngArray(object):
+    """A compact sequence of lat/lng pairs, stored as two arrays of doubles
+    rather than as an object per point.
+
+    Accepted wherever a list of locations is (elevation, roads, distance
+    matrix origins and destinations, directions waypoints, static map
+    paths...), and formatted and encoded for requests in bulk. Items are
+    (lat, lng) tuples.
+
+    For example:
+        path = convert.LatLngArray.from_points(track)
+        client.elevation_along_path(path, 100)
+    """
+
+    __slots__ = ("lats", "lngs")
+
+    def __init__(self, lats=(), lngs=()):
+        """
+        :param lats: The latitudes.
+        :type lats: iterable of floats, e.g. an array.array or numpy array
+
+        :param lngs: The longitudes, as many as latitudes.
+        :type lngs: iterable of floats
+        """
+        self.lats = _double_array(lats)
+        self.lngs = _double_array(lngs)
+        if len(self.lats) != len(self.lngs):
+            raise ValueError("Should specify as many latitudes as "
+                             "longitudes.")
+
+    @classmethod
+    def from_points(cls, points):
+        """Creates an array from lat/lng values.
+
+        :param points: The locations, an encoded polyline, or a numpy array
+            of shape (n, 2).
+        :type points: list of lat/lng dicts, lists or tuples, or string
+
+        :rtype: googlemaps.convert.LatLngArray
+        """
+        if isinstance(points, cls):
+            return cls(array.array("d", points.lats),
+                       array.array("d", points.lngs))
+        if is_string(points):
+            return cls(*_decode_polyline(points))
+        if numpy is not None and isinstance(points, numpy.ndarray):
+            return cls(points[:, 0], points[:, 1])
+        result = cls()
+        lats, lngs = result.lats, result.lngs
+        for point in points:
+            lat, lng = normalize_lat_lng(point)
+            lats.append(lat)
+            lngs.append(lng)
+        return result
+
+    def to_numpy(self):
+        """Returns the latitudes and longitudes as numpy arrays, sharing
+        memory with this array.
+
+        :rtype: tuple of two numpy arrays
+        """
+        if numpy is None:
+            raise ImportError("numpy is required for to_numpy.")
+        return (numpy.frombuffer(self.lats, dtype=numpy.float64),
+                numpy.frombuffer(self.lngs, dtype=numpy.float64))
+
+    def append(self, lat, lng):
+        self.lats.append(lat)
+        self.lngs.append(lng)
+
+    def __len__(self):
+        return len(self.lats)
+
+    def __iter__(self):
+        return zip(self.lats, self.lngs)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return LatLngArray(self.lats[index], self.lngs[index])
+        return self.lats[index], self.lngs[index]
+
+    def __eq__(self, other):
+        if not isinstance(other, LatLngArray):
+            return NotImplemented
+        return self.lats == other.lats and self.lngs == other.lngs
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "<LatLngArray of %d points>" % len(self)
+
+    def _location_list(self):
+        """Formats all the points with a single format operation, and trims
+        the trailing zeros of all values with a single substitution."""
+        n = len(self.lats)
+        if not n:
+            return ""
+        values = [0.0] * (2 * n)
+        values[::2] = self.lats
+        values[1::2] = self.lngs
+        text = "%.8f,%.8f|" * n % tuple(values)
+        return _TRAILING_ZEROS.sub("", text)[:-1]
+
+    def _encode(self):
+        if numpy is not None:
+            values = numpy.empty(2 * len(self.lats), dtype=numpy.int64)
+            for offset, column in enumerate(self.to_numpy()):
+                e5 = numpy.rint(column * 1e5).astype(numpy.int64)
+                values[offset::2] = numpy.diff(e5, prepend=0)
+            values = values.tolist()
+        else:
+            values = [0] * (2 * len(self.lats))
+            for offset, column in enumerate((self.lats, self.lngs)):
+                last = 0
+                for i, value in enumerate(column):
+                    e5 = int(round(value * 1e5))
+                    values[offset + 2 * i] = e5 - last
+                    last = e5
+
+        chars = []
+        append = chars.append
+        for v in values:
+            v = ~(v << 1) if v < 0 else v << 1
+            while v >= 0x20:
+                append(chr((0x20 | (v & 0x1f)) + 63))
+                v >>= 5
+            append(chr(v + 63))
+        return "".join(chars)
+
+
+def _double_array(values):
+    if isinstance(values, array.array) and values.typecode == "d":
+        return values
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        result = array.array("d")
+        result.frombytes(numpy.ascontiguousarray(
+            values, dtype=numpy.float64).tobytes())
+        return result
+    return array.array("d", values)
+
+
 def shortest_path(locations):
     """Returns the shortest representation of the given locations.
 
@@ -384,3 +614,165 @@ def shortest_path(locations):
         return encoded
     else:
         return unencoded
+
+
+def simplify_polyline(points, tolerance=None, max_points=None,
+                      max_length=None, encoded=True):
+    """Simplifies a path with the Douglas-Peucker algorithm, dropping the
+    points that least change its shape.
+
+    Points are ranked once, so the number of points to keep is then found
+    with a binary search on their ranks. Uses numpy when installed.
+
+    For example:
+        points, deviation = convert.simplify_polyline(track, max_length=8000)
+        path = convert.shortest_path(points)
+
+    :param points: The path, as a list of lat/lng values or an encoded
+        polyline.
+    :type points: list or string
+
+    :param tolerance: The maximum distance, in meters, of the dropped points
+        from the simplified path.
+    :type tolerance: float
+
+    :param max_points: The maximum number of points kept.
+    :type max_points: int
+
+    :param max_length: The maximum length of the simplified path in a URL,
+        once quoted.
+    :type max_length: int
+
+    :param encoded: Whether max_length applies to the path as an encoded
+        polyline ("enc:..."), or else as a pipe-delimited list of lat/lng
+        values.
+    :type encoded: bool
+
+    :rtype: tuple of the simplified path, as a list of the points kept (or
+        a LatLngArray, for an encoded polyline or a LatLngArray), and the
+        maximum distance, in meters, of the dropped points from it
+    """
+    if tolerance is None and max_points is None and max_length is None:
+        raise ValueError("Should specify a tolerance, max_points or "
+                         "max_length.")
+    if is_string(points):
+        points = LatLngArray(*_decode_polyline(points))
+    compact = isinstance(points, LatLngArray)
+    if not compact:
+        points = list(points)
+
+    def length(path):
+        if encoded:
+            return len(_quote("enc:" + encode_polyline(path), safe=""))
+        return len(_quote(location_list(path), safe=""))
+
+    if len(points) <= 2 or (
+            tolerance is None and
+            (max_points is None or len(points) <= max_points) and
+            (max_length is None or length(points) <= max_length)):
+        return points, 0.0
+
+    xs, ys = _project([normalize_lat_lng(p) for p in points])
+    ranks = _simplify_ranks(xs, ys)
+    by_rank = sorted(range(len(points)), key=lambda i: -ranks[i])
+
+    def kept(count):
+        path = [points[i] for i in sorted(by_rank[:count])]
+        return LatLngArray.from_points(path) if compact else path
+
+    count = len(points)
+    if tolerance is not None:
+        count = sum(1 for rank in ranks if rank > tolerance)
+    if max_points is not None:
+        count = min(count, max_points)
+    count = max(2, count)
+
+    if max_length is not None:
+        def fits(count):
+            return length(kept(count)) <= max_length
+
+        if not fits(count):
+            # The longest path that fits, or the end points.
+            low, high = 2, count - 1
+            while low < high:
+                middle = (low + high + 1) // 2
+                if fits(middle):
+                    low = middle
+                else:
+                    high = middle - 1
+            count = low
+
+    indices = sorted(by_rank[:count])
+    deviation = 0.0
+    for first, last in zip(indices, indices[1:]):
+        if last - first > 1:
+            deviation = max(deviation,
+                            _farthest_point(xs, ys, first, last)[1])
+    return kept(count), deviation
+
+
+def _project(latlngs):
+    """Projects lat/lng values to meters on a plane tangent to the earth at
+    their mean latitude, which is accurate enough for the distances within
+    a path."""
+    mean_lat = math.radians(sum(lat for lat, _ in latlngs) / len(latlngs))
+    scale = math.radians(_EARTH_RADIUS)
+    x_scale = scale * math.cos(mean_lat)
+    xs = [lng * x_scale for _, lng in latlngs]
+    ys = [lat * scale for lat, _ in latlngs]
+    if numpy is not None:
+        return numpy.array(xs), numpy.array(ys)
+    return xs, ys
+
+
+def _simplify_ranks(xs, ys):
+    """Returns, for each point of a path, the tolerance below which
+    Douglas-Peucker simplification keeps it. The ranks of points never
+    exceed those of the points that split the path before them, so that
+    the points kept for a tolerance are those ranked above it."""
+    n = len(xs)
+    ranks = [0.0] * n
+    ranks[0] = ranks[-1] = float("inf")
+    stack = [(0, n - 1, float("inf"))]
+    while stack:
+        first, last, limit = stack.pop()
+        if last - first < 2:
+            continue
+        index, distance = _farthest_point(xs, ys, first, last)
+        rank = min(distance, limit)
+        ranks[index] = rank
+        stack.append((first, index, rank))
+        stack.append((index, last, rank))
+    return ranks
+
+
+def _farthest_point(xs, ys, first, last):
+    """Returns the index and distance of the point strictly between first
+    and last that is farthest from the segment joining them."""
+    ax, ay = xs[first], ys[first]
+    dx, dy = xs[last] - ax, ys[last] - ay
+    squared = dx * dx + dy * dy
+
+    if numpy is not None:
+        px = xs[first + 1:last] - ax
+        py = ys[first + 1:last] - ay
+        if squared:
+            t = numpy.clip((px * dx + py * dy) / squared, 0.0, 1.0)
+            px = px - t * dx
+            py = py - t * dy
+        distances = numpy.hypot(px, py)
+        i = int(distances.argmax())
+        return first + 1 + i, float(distances[i])
+
+    best, index = -1.0, first + 1
+    for i in range(first + 1, last):
+        px, py = xs[i] - ax, ys[i] - ay
+        if squared:
+            t = (px * dx + py * dy) / squared
+            t = 0.0 if t < 0 else 1.0 if t > 1 else t
+            px -= t * dx
+            py -= t * dy
+        distance = math.hypot(px, py)
+        if distance > best:
+            best, index = distance, i
+    return index, best
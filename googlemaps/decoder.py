@@ -0,0 +1,105 @@
+#
+# Copyright 2026 Google Inc. All rights reserved.
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+
+"""Decodes JSON response bodies.
+
+The fastest JSON library available is used: orjson, then pysimdjson, then
+ujson, falling back to the standard library. Bodies are decoded straight
+from the raw response bytes, skipping the intermediate text decode done by
+``requests.Response.json``.
+
+A different decoder can be plugged in with ``set_decoder``:
+
+    import rapidjson
+    googlemaps.decoder.set_decoder(rapidjson.loads, "rapidjson")
+"""
+
+import json
+
+
+def _find_decoder():
+    """Returns the (loads, name) pair of the fastest available library."""
+    try:
+        import orjson
+        return orjson.loads, "orjson"
+    except ImportError:
+        pass
+
+    try:
+        import simdjson
+        return simdjson.loads, "simdjson"
+    except ImportError:
+        pass
+
+    try:
+        import ujson
+        return ujson.loads, "ujson"
+    except ImportError:
+        pass
+
+    return json.loads, "json"
+
+
+_loads, _name = _find_decoder()
+
+
+def set_decoder(loads=None, name=None):
+    """Sets the function used to decode all JSON response bodies.
+
+    :param loads: A function taking the raw body as bytes, and returning the
+        decoded object. It should raise a ValueError on malformed input.
+        None restores the default decoder.
+    :type loads: function
+
+    :param name: A name for the decoder, as returned by decoder_name.
+    :type name: string
+    """
+    global _loads, _name
+    if loads is None:
+        _loads, _name = _find_decoder()
+    else:
+        _loads, _name = loads, name or getattr(loads, "__module__", None)
+
+
+def decoder_name():
+    """Returns the name of the decoder in use, e.g. "orjson".
+
+    :rtype: string
+    """
+    return _name
+
+
+def loads(data):
+    """Decodes a JSON document.
+
+    :param data: The document.
+    :type data: bytes or string
+
+    :raises ValueError: if the document is not valid JSON.
+    """
+    return _loads(data)
+
+
+def json_body(response):
+    """Decodes the body of an HTTP response as JSON.
+
+    :param response: The HTTP response.
+    :type response: requests.Response
+
+    :raises ValueError: if the body is not valid JSON.
+    """
+    return _loads(response.content)
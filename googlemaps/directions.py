@@ -18,6 +18,19 @@
 """Performs requests to the Google Maps Directions API."""
 
 from googlemaps import convert
+from googlemaps import streaming
+
+try: # Python 3
+    from urllib.parse import quote_plus
+except ImportError: # Python 2
+    from urllib import quote_plus
+
+
+# Limits of a single directions request.
+_MAX_WAYPOINTS = 25
+_MAX_URL_LENGTH = 16384
+
+_DIRECTIONS_URL = "/maps/api/directions/json"
 
 
 def directions(client, origin, destination,
@@ -45,7 +58,7 @@ def directions(client, origin, destination,
         route without adding stop prefix the waypoint with `via`, similar to
         `waypoints = ["via:San Francisco", "via:Mountain View"]`.
     :type waypoints: a single location, or a list of locations, where a
-        location is a string, dict, list, or tuple
+        location is a string, dict, list, or tuple, or a LatLngArray
 
     :param alternatives: If True, more than one route may be returned in the
         response.
@@ -98,6 +111,176 @@ def directions(client, origin, destination,
     :rtype: list of routes
     """
 
+    params = _params(origin, destination, mode=mode, waypoints=waypoints,
+                     alternatives=alternatives, avoid=avoid, language=language,
+                     units=units, region=region, departure_time=departure_time,
+                     arrival_time=arrival_time,
+                     optimize_waypoints=optimize_waypoints,
+                     transit_mode=transit_mode,
+                     transit_routing_preference=transit_routing_preference,
+                     traffic_model=traffic_model)
+
+    return client._request(_DIRECTIONS_URL, params).get("routes", [])
+
+
+def directions_stream(client, origin, destination, **kwargs):
+    """Get directions between an origin point and a destination point,
+    yielding each route as soon as it has been downloaded and decoded, rather
+    than buffering the whole response. Mostly useful with alternatives=True.
+
+    Accepts the same arguments as directions.
+
+    :rtype: iterator of routes
+    """
+    params = _params(origin, destination, **kwargs)
+    return streaming.stream(client, _DIRECTIONS_URL, params,
+                            "routes")
+
+
+def directions_long(client, stops, max_waypoints=_MAX_WAYPOINTS,
+                    max_url_length=_MAX_URL_LENGTH, concurrency=4, **kwargs):
+    """Get directions through a sequence of stops, in order, which may be
+    longer than the waypoint limit of a single request.
+
+    The stops are split into segments that each fit in a request, sharing
+    their end stops, with the waypoints of a segment sent as an "enc:"
+    polyline when that is shorter. The segments are requested concurrently,
+    and their routes stitched into one.
+
+    :param stops: The origin, the stops in between, and the destination.
+    :type stops: list of locations, where a location is a string, dict,
+        list, or tuple
+
+    :param max_waypoints: The maximum number of waypoints per request.
+    :type max_waypoints: int
+
+    :param max_url_length: The maximum length of a request URL, including
+        the base URL and credentials.
+    :type max_url_length: int
+
+    :param concurrency: The number of segments requested at a time.
+    :type concurrency: int
+
+    Also accepts the arguments of directions, except waypoints,
+    alternatives and optimize_waypoints.
+
+    :rtype: list with the stitched route, or an empty list if a segment has
+        no route. The route has a leg per pair of consecutive stops.
+    """
+    for name in ("waypoints", "alternatives", "optimize_waypoints"):
+        if kwargs.get(name):
+            raise ValueError("directions_long does not support %s." % name)
+    stops = list(stops)
+    if len(stops) < 2:
+        raise ValueError("At least an origin and a destination are required.")
+
+    segments = _split_stops(client, stops, max_waypoints, max_url_length,
+                            kwargs)
+
+    items = [dict(kwargs, origin=s[0], destination=s[-1],
+                  waypoints=_waypoints_param(s[1:-1]))
+             for s in segments]
+    results = client.map("directions", items, concurrency=concurrency)
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+    if not all(results):
+        return []
+    return [_stitch_routes([result[0] for result in results])]
+
+
+def _as_latlng(location):
+    """Returns location as a (lat, lng) tuple, or None if it is not given
+    as coordinates."""
+    try:
+        return convert.normalize_lat_lng(location)
+    except TypeError:
+        return None
+
+
+def _waypoints_param(waypoints):
+    """Formats waypoints as a location list, or as an "enc:" polyline when
+    they are all coordinates and that is shorter once URL encoded."""
+    if not waypoints:
+        return None
+    text = convert.location_list(waypoints)
+    points = [_as_latlng(w) for w in waypoints]
+    if all(p is not None for p in points):
+        encoded = "enc:%s:" % convert.encode_polyline(points)
+        if len(quote_plus(encoded)) < len(quote_plus(text)):
+            return encoded
+    return text
+
+
+def _url_length(client, origin, destination, waypoints, kwargs):
+    params = _params(origin, destination,
+                     waypoints=_waypoints_param(waypoints), **kwargs)
+    return client._url_length(_DIRECTIONS_URL, params)
+
+
+def _split_stops(client, stops, max_waypoints, max_url_length, kwargs):
+    """Splits stops into consecutive segments sharing their end stops, each
+    of them fitting in a single request."""
+    segments = []
+    start = 0
+    while start < len(stops) - 1:
+        end = start + 1
+        # Extend the segment while the next stop fits.
+        while (end + 1 < len(stops) and end - start <= max_waypoints and
+               _url_length(client, stops[start], stops[end + 1],
+                           stops[start + 1:end + 1], kwargs) <= max_url_length):
+            end += 1
+        segments.append(stops[start:end + 1])
+        start = end
+    return segments
+
+
+def _stitch_routes(routes):
+    """Joins the routes of consecutive segments into one route."""
+    route = dict(routes[0])
+    route["legs"] = [leg for r in routes for leg in r.get("legs", [])]
+
+    points = []
+    for r in routes:
+        segment = convert.decode_polyline(
+            r.get("overview_polyline", {}).get("points", ""))
+        if points and segment and points[-1] == segment[0]:
+            segment = segment[1:]
+        points.extend(segment)
+    route["overview_polyline"] = {"points": convert.encode_polyline(points)}
+
+    bounds = [r["bounds"] for r in routes if r.get("bounds")]
+    if bounds:
+        route["bounds"] = {
+            "northeast": {
+                "lat": max(b["northeast"]["lat"] for b in bounds),
+                "lng": max(b["northeast"]["lng"] for b in bounds),
+            },
+            "southwest": {
+                "lat": min(b["southwest"]["lat"] for b in bounds),
+                "lng": min(b["southwest"]["lng"] for b in bounds),
+            },
+        }
+
+    summaries = []
+    warnings = []
+    for r in routes:
+        if r.get("summary") and r["summary"] not in summaries:
+            summaries.append(r["summary"])
+        warnings.extend(w for w in r.get("warnings", []) if w not in warnings)
+    route["summary"] = ", ".join(summaries)
+    route["warnings"] = warnings
+    route["waypoint_order"] = []
+    return route
+
+
+def _params(origin, destination,
+            mode=None, waypoints=None, alternatives=False, avoid=None,
+            language=None, units=None, region=None, departure_time=None,
+            arrival_time=None, optimize_waypoints=False, transit_mode=None,
+            transit_routing_preference=None, traffic_model=None):
+    """Builds the request parameters for directions."""
+
     params = {
         "origin": convert.latlng(origin),
         "destination": convert.latlng(destination)
@@ -150,4 +333,4 @@ def directions(client, origin, destination,
     if traffic_model:
         params["traffic_model"] = traffic_model
 
-    return client._request("/maps/api/directions/json", params).get("routes", [])
+    return params
@@ -17,7 +17,19 @@
 
 """Performs requests to the Google Maps Distance Matrix API."""
 
+import copy
+import math
+
 from googlemaps import convert
+from googlemaps import streaming
+
+
+# Limits of a single distance matrix request.
+_MAX_ELEMENTS = 100
+_MAX_DIMENSION = 25
+
+# Modes in which travel from A to B costs about the same as from B to A.
+_SYMMETRIC_MODES = ("walking", "bicycling")
 
 
 def distance_matrix(client, origins, destinations,
@@ -32,7 +44,7 @@ def distance_matrix(client, origins, destinations,
         the service will geocode the string and convert it to a
         latitude/longitude coordinate to calculate directions.
     :type origins: a single location, or a list of locations, where a
-        location is a string, dict, list, or tuple
+        location is a string, dict, list, or tuple, or a LatLngArray
 
     :param destinations: One or more addresses, Place IDs, and/or lat/lng values
         , to which to calculate distance and time. Each Place ID string must be
@@ -40,7 +52,7 @@ def distance_matrix(client, origins, destinations,
         service will geocode the string and convert it to a latitude/longitude
         coordinate to calculate directions.
     :type destinations: a single location, or a list of locations, where a
-        location is a string, dict, list, or tuple
+        location is a string, dict, list, or tuple, or a LatLngArray
 
     :param mode: Specifies the mode of transport to use when calculating
         directions. Valid values are "driving", "walking", "transit" or
@@ -91,6 +103,350 @@ def distance_matrix(client, origins, destinations,
         containing one origin paired with each destination.
     """
 
+    params = _params(origins, destinations, mode=mode, language=language,
+                     avoid=avoid, units=units, departure_time=departure_time,
+                     arrival_time=arrival_time, transit_mode=transit_mode,
+                     transit_routing_preference=transit_routing_preference,
+                     traffic_model=traffic_model, region=region)
+
+    return client._request("/maps/api/distancematrix/json", params)
+
+
+def distance_matrix_stream(client, origins, destinations, **kwargs):
+    """Gets travel distance and time for a matrix of origins and
+    destinations, yielding each row of the matrix as soon as it has been
+    downloaded and decoded, rather than buffering the whole response.
+
+    Accepts the same arguments as distance_matrix.
+
+    :rtype: iterator of rows, each row containing one origin paired with each
+        destination.
+    """
+    params = _params(origins, destinations, **kwargs)
+    return streaming.stream(client, "/maps/api/distancematrix/json", params,
+                            "rows")
+
+
+def distance_matrix_bulk(client, origins, destinations,
+                         max_elements=_MAX_ELEMENTS,
+                         max_dimension=_MAX_DIMENSION, concurrency=4,
+                         skip_diagonal=False, symmetric=False, **kwargs):
+    """Gets travel distance and time for a matrix of origins and
+    destinations of any size.
+
+    The matrix is split into as few tiles as the per request limits allow,
+    which are requested concurrently and assembled into one response.
+
+    :param origins: The origins.
+    :type origins: list of locations, where a location is a string, dict,
+        list, or tuple, or a LatLngArray
+
+    :param destinations: The destinations.
+    :type destinations: list of locations
+
+    :param max_elements: The maximum number of elements per request.
+    :type max_elements: int
+
+    :param max_dimension: The maximum number of origins, and of
+        destinations, per request.
+    :type max_dimension: int
+
+    :param concurrency: The number of tiles requested at a time.
+    :type concurrency: int
+
+    :param skip_diagonal: Whether to leave out the elements from a location
+        to itself, e.g. when the origins are also the destinations. They
+        are returned with a zero distance and duration. The elements left
+        are requested exactly, which may take more requests.
+    :type skip_diagonal: bool
+
+    :param symmetric: Whether to request only one of the elements from A to
+        B and from B to A, using it for both, which halves the elements of
+        a matrix from a list of locations to itself. Only allowed in the
+        walking and bicycling modes.
+    :type symmetric: bool
+
+    Also accepts the arguments of distance_matrix.
+
+    :rtype: matrix of distances, as returned by distance_matrix. When
+        skip_diagonal or symmetric is set, it also has the number of
+        elements that were not requested as "saved_elements".
+    """
+    if not isinstance(origins, (list, convert.LatLngArray)):
+        origins = [origins]
+    if not isinstance(destinations, (list, convert.LatLngArray)):
+        destinations = [destinations]
+    origin_keys = _location_keys(origins)
+    destination_keys = _location_keys(destinations)
+    sources = _Sources(origin_keys, destination_keys, skip_diagonal,
+                       symmetric, kwargs.get("mode"), kwargs.get("units"))
+
+    rows, cols = range(len(origins)), range(len(destinations))
+    if sources.skipping:
+        missing = [[j for j in cols
+                    if sources.source(origin_keys[i], destination_keys[j])
+                    == _FETCH] for i in rows]
+        tiles = _cover(rows, missing, max_elements, max_dimension)
+    else:
+        tiles = _tiles(rows, cols, max_elements, max_dimension)
+    items = [dict(kwargs, origins=[origins[i] for i in rows],
+                  destinations=[destinations[j] for j in cols])
+             for rows, cols in tiles]
+    results = client.map("distance_matrix", items, concurrency=concurrency)
+
+    origin_addresses = [None] * len(origins)
+    destination_addresses = [None] * len(destinations)
+    elements = [[None] * len(destinations) for _ in origins]
+    for (rows, cols), result in zip(tiles, results):
+        if isinstance(result, Exception):
+            raise result
+        for i, address in zip(rows, result["origin_addresses"]):
+            origin_addresses[i] = address
+        for j, address in zip(cols, result["destination_addresses"]):
+            destination_addresses[j] = address
+        for i, row in zip(rows, result["rows"]):
+            for j, element in zip(cols, row["elements"]):
+                elements[i][j] = element
+
+    matrix = {
+        "destination_addresses": destination_addresses,
+        "origin_addresses": origin_addresses,
+        "rows": [{"elements": row} for row in elements],
+        "status": "OK",
+    }
+    if sources.skipping:
+        fetched = dict(((origin_keys[i], destination_keys[j]), element)
+                       for i, row in enumerate(elements)
+                       for j, element in enumerate(row)
+                       if element is not None)
+        for i, row in enumerate(elements):
+            for j, element in enumerate(row):
+                if element is None:
+                    row[j] = sources.element(origin_keys[i],
+                                             destination_keys[j],
+                                             fetched.__getitem__)
+        _fill_addresses(origin_keys, origin_addresses, destination_keys,
+                        destination_addresses)
+        matrix["saved_elements"] = (len(origins) * len(destinations) -
+                                    sum(len(r) * len(c) for r, c in tiles))
+    return matrix
+
+
+def _location_keys(locations):
+    """Returns the locations formatted as in requests."""
+    if isinstance(locations, convert.LatLngArray):
+        if not locations:
+            return []
+        # Formatted in bulk.
+        return convert.location_list(locations).split("|")
+    return [convert.latlng(location) for location in locations]
+
+
+# Where the element of an origin and destination comes from.
+_FETCH = "fetch"
+_ZERO = "zero"
+_MIRROR = "mirror"
+
+
+class _Sources:
+    """Decides which elements of a matrix are requested, and which are
+    derived from others, for skip_diagonal and symmetric."""
+
+    def __init__(self, origin_keys, destination_keys, skip_diagonal=False,
+                 symmetric=False, mode=None, units=None):
+        if symmetric and mode not in _SYMMETRIC_MODES:
+            raise ValueError("symmetric is only allowed in the %s modes." %
+                             " and ".join(_SYMMETRIC_MODES))
+        self.skip_diagonal = skip_diagonal
+        self.symmetric = symmetric
+        self.skipping = skip_diagonal or symmetric
+        self.units = units
+        self._origin_index = {}
+        for i, key in enumerate(origin_keys):
+            self._origin_index.setdefault(key, i)
+        self._destinations = set(destination_keys)
+
+    def source(self, origin, destination):
+        """Returns whether the element from origin to destination is
+        requested (_FETCH), zero (_ZERO) or the element from destination to
+        origin (_MIRROR)."""
+        if origin == destination:
+            return _ZERO if self.skip_diagonal else _FETCH
+        if (self.symmetric and destination in self._origin_index and
+                origin in self._destinations and
+                self._origin_index[destination] < self._origin_index[origin]):
+            return _MIRROR
+        return _FETCH
+
+    def element(self, origin, destination, lookup):
+        """Returns the element from origin to destination, given a function
+        returning requested elements by (origin, destination)."""
+        source = self.source(origin, destination)
+        if source == _ZERO:
+            return _zero_element(self.units)
+        if source == _MIRROR:
+            # A copy, so that the two elements can be changed separately.
+            return copy.deepcopy(lookup((destination, origin)))
+        return lookup((origin, destination))
+
+
+def _zero_element(units=None):
+    return {
+        "distance": {"text": "0 ft" if units == "imperial" else "0 m",
+                     "value": 0},
+        "duration": {"text": "0 mins", "value": 0},
+        "status": "OK",
+    }
+
+
+def _fill_addresses(origin_keys, origin_addresses, destination_keys,
+                    destination_addresses):
+    """Fills in the addresses of locations that were not requested, from
+    requests with the same location on the other side."""
+    known = {}
+    for keys, addresses in ((origin_keys, origin_addresses),
+                            (destination_keys, destination_addresses)):
+        for key, address in zip(keys, addresses):
+            if address is not None:
+                known.setdefault(key, address)
+    for keys, addresses in ((origin_keys, origin_addresses),
+                            (destination_keys, destination_addresses)):
+        for k, key in enumerate(keys):
+            if addresses[k] is None:
+                addresses[k] = known.get(key, key)
+
+
+def _cover(rows, missing, max_elements, max_dimension):
+    """Returns tiles covering exactly the missing elements of a matrix, in
+    few requests.
+
+    :param rows: The row indices.
+    :type rows: list of int
+
+    :param missing: For each row, the column indices of its missing
+        elements.
+    :type missing: list of lists of int
+
+    :rtype: list of (row indices, column indices) tuples
+    """
+    best = None
+    for rectangles in (_group_rectangles(rows, missing),
+                       _grid_rectangles(rows, missing, max_elements,
+                                        max_dimension),
+                       _bisect_rectangles(rows, missing)):
+        tiles = [tile for tile_rows, tile_cols in rectangles
+                 for tile in _tiles(tile_rows, tile_cols, max_elements,
+                                    max_dimension)]
+        if best is None or len(tiles) < len(best):
+            best = tiles
+    return best
+
+
+def _group_rectangles(rows, missing):
+    """Covers exactly the missing elements of a matrix with rectangles, e.g.
+    a new row and a new column."""
+    # Rows missing the same columns form a rectangle, as do columns missing
+    # the same rows; take whichever grouping needs fewer rectangles.
+    by_cols = {}
+    by_rows = {}
+    for i, cols in zip(rows, missing):
+        if cols:
+            by_cols.setdefault(tuple(cols), []).append(i)
+        for j in cols:
+            by_rows.setdefault(j, []).append(i)
+    by_rows_grouped = {}
+    for j, group in by_rows.items():
+        by_rows_grouped.setdefault(tuple(group), []).append(j)
+
+    if len(by_rows_grouped) < len(by_cols):
+        return [(list(group), sorted(cols))
+                for group, cols in by_rows_grouped.items()]
+    return [(group, list(cols)) for cols, group in by_cols.items()]
+
+
+def _grid_rectangles(rows, missing, max_elements, max_dimension):
+    """Covers exactly the missing elements of a matrix with rectangles, by
+    grouping rows within the blocks of a grid of request sized blocks, e.g.
+    a triangle."""
+    side = max(1, min(max_dimension, int(math.sqrt(max_elements))))
+    blocks = {}
+    for i, cols in zip(rows, missing):
+        for j in cols:
+            block = blocks.setdefault((i // side, j // side), {})
+            block.setdefault(i, []).append(j)
+    rectangles = []
+    for _, block in sorted(blocks.items()):
+        block_rows = sorted(block)
+        rectangles.extend(_group_rectangles(
+            block_rows, [block[i] for i in block_rows]))
+    return rectangles
+
+
+def _bisect_rectangles(rows, missing):
+    """Covers exactly the missing elements of a matrix with rectangles by
+    halving it until each part is fully missing, e.g. a triangle."""
+    cells = dict((i, set(cols)) for i, cols in zip(rows, missing) if cols)
+    rectangles = []
+    stack = [(sorted(cells), sorted(set().union(*cells.values())))]
+    while stack:
+        block_rows, block_cols = stack.pop()
+        col_set = set(block_cols)
+        block = dict((i, cells[i] & col_set) for i in block_rows)
+        block_rows = [i for i in block_rows if block[i]]
+        if not block_rows:
+            continue
+        used = set().union(*block.values())
+        block_cols = [j for j in block_cols if j in used]
+
+        if all(len(block[i]) == len(block_cols) for i in block_rows):
+            rectangles.append((block_rows, block_cols))
+        elif len(block_rows) >= len(block_cols):
+            half = len(block_rows) // 2
+            stack.append((block_rows[:half], block_cols))
+            stack.append((block_rows[half:], block_cols))
+        else:
+            half = len(block_cols) // 2
+            stack.append((block_rows, block_cols[:half]))
+            stack.append((block_rows, block_cols[half:]))
+    return rectangles
+
+
+def _tiles(rows, cols, max_elements, max_dimension):
+    """Splits the matrix of the given origin and destination indices into
+    as few tiles as the per request limits allow.
+
+    :rtype: list of (origin indices, destination indices) tuples
+    """
+    rows, cols = list(rows), list(cols)
+    if not rows or not cols:
+        return []
+    height, width = _tile_shape(len(rows), len(cols), max_elements,
+                                max_dimension)
+    return [(rows[i:i + height], cols[j:j + width])
+            for i in range(0, len(rows), height)
+            for j in range(0, len(cols), width)]
+
+
+def _tile_shape(n_origins, n_destinations, max_elements, max_dimension):
+    """Returns the (origins, destinations) dimensions of the tiles covering
+    a matrix in the fewest requests."""
+    best = None
+    for rows in range(1, min(n_origins, max_dimension) + 1):
+        cols = min(n_destinations, max_dimension, max_elements // rows)
+        if cols < 1:
+            break
+        count = -(-n_origins // rows) * -(-n_destinations // cols)
+        if best is None or count < best[0]:
+            best = (count, rows, cols)
+    return best[1], best[2]
+
+
+def _params(origins, destinations,
+            mode=None, language=None, avoid=None, units=None,
+            departure_time=None, arrival_time=None, transit_mode=None,
+            transit_routing_preference=None, traffic_model=None, region=None):
+    """Builds the request parameters for distance_matrix."""
+
     params = {
         "origins": convert.location_list(origins),
         "destinations": convert.location_list(destinations)
@@ -136,4 +492,4 @@ def distance_matrix(client, origins, destinations,
     if region:
         params["region"] = region
 
-    return client._request("/maps/api/distancematrix/json", params)
+    return params
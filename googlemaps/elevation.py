@@ -17,8 +17,14 @@
 
 """Performs requests to the Google Maps Elevation API."""
 
+import logging
+
 from googlemaps import convert
 
+logger = logging.getLogger(__name__)
+
+_ELEVATION_URL = "/maps/api/elevation/json"
+
 
 def elevation(client, locations):
     """
@@ -29,29 +35,49 @@ def elevation(client, locations):
     :param locations: List of latitude/longitude values from which you wish
         to calculate elevation data.
     :type locations: a single location, or a list of locations, where a
-        location is a string, dict, list, or tuple
+        location is a string, dict, list, or tuple, or a LatLngArray
 
     :rtype: list of elevation data responses
     """
     params = {"locations": convert.shortest_path(locations)}
-    return client._request("/maps/api/elevation/json", params).get("results", [])
+    return client._request(_ELEVATION_URL, params).get("results", [])
 
 
-def elevation_along_path(client, path, samples):
+def elevation_along_path(client, path, samples, max_length=None,
+                         return_deviation=False):
     """
     Provides elevation data sampled along a path on the surface of the earth.
 
     :param path: An encoded polyline string, or a list of latitude/longitude
         values from which you wish to calculate elevation data.
-    :type path: string, dict, list, or tuple
+    :type path: string, dict, list, or tuple, or a LatLngArray
 
     :param samples: The number of sample points along a path for which to
         return elevation data.
     :type samples: int
 
-    :rtype: list of elevation data responses
+    :param max_length: When set, the path is simplified until the full
+        request URL fits in this many characters, see
+        convert.simplify_polyline.
+    :type max_length: int
+
+    :param return_deviation: Whether to also return how far, in meters, the
+        simplified path deviates from the path given.
+    :type return_deviation: bool
+
+    :rtype: list of elevation data responses, or a tuple of the list and the
+        deviation if return_deviation is set
     """
 
+    deviation = 0.0
+    if max_length:
+        overhead = client._url_length(_ELEVATION_URL,
+                                      {"path": "", "samples": samples})
+        path, deviation = convert.simplify_polyline(
+            path, max_length=max_length - overhead)
+        logger.debug("Simplified path to %d points, deviating by up to "
+                     "%.1f meters", len(path), deviation)
+
     if type(path) is str:
         path = "enc:%s" % path
     else:
@@ -62,4 +88,7 @@ def elevation_along_path(client, path, samples):
         "samples": samples
     }
 
-    return client._request("/maps/api/elevation/json", params).get("results", [])
+    results = client._request(_ELEVATION_URL, params).get("results", [])
+    if return_deviation:
+        return results, deviation
+    return results
@@ -66,3 +66,19 @@ class _OverQueryLimit(ApiError, _RetriableRequest):
     not be retried.
     """
     pass
+
+class CircuitOpenError(TransportError):
+    """The request was not sent, as its endpoint has been failing. See
+    googlemaps.circuitbreaker."""
+
+    def __init__(self, endpoint, retry_after):
+        # Exception's args, rather than TransportError's, so that the error
+        # can be pickled, e.g. to be sent back from a worker process.
+        Exception.__init__(self, endpoint, retry_after)
+        self.base_exception = None
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+    def __str__(self):
+        return "Circuit open for %s, retry after %.1fs" % (self.endpoint,
+                                                           self.retry_after)
@@ -0,0 +1,760 @@
+#
+# Copyright 2026 Google Inc. All rights reserved.
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+
+"""A local fake of the Google Maps Platform web services, for load testing and
+offline development.
+
+The server implements the endpoints used by this library with deterministic,
+synthetic responses: the same request always gets the same response. Server
+errors, query limit errors and latency can be injected.
+
+In-process:
+
+    with FakeMapsServer(latency=0.05, over_query_limit_rate=0.01) as server:
+        client = server.client()
+        client.directions("Sydney", "Melbourne")
+
+As a subprocess:
+
+    python -m googlemaps.fakeserver --port 8080 --latency 0.05
+
+and point clients at it with:
+
+    googlemaps.Client(key="AIza...", base_url="http://127.0.0.1:8080",
+                      base_url_overrides=googlemaps.fakeserver.overrides(
+                          "http://127.0.0.1:8080"))
+"""
+
+import argparse
+import collections
+import hashlib
+import http.server
+import json
+import math
+import random
+import threading
+import time
+from urllib.parse import parse_qs
+from urllib.parse import urlparse
+
+import googlemaps
+from googlemaps import convert
+from googlemaps.addressvalidation import _ADDRESSVALIDATION_BASE_URL
+from googlemaps.client import _DEFAULT_BASE_URL
+from googlemaps.geolocation import _GEOLOCATION_BASE_URL
+from googlemaps.roads import _ROADS_BASE_URL
+
+
+# Travel speeds, in meters per second.
+_SPEEDS = {
+    "driving": 13.9,
+    "walking": 1.4,
+    "bicycling": 4.5,
+    "transit": 8.0,
+}
+
+# Smallest valid PNG: a 1x1 transparent pixel.
+_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000001e221bc330000"
+    "000049454e44ae426082")
+
+_SERVER_ERROR = "server_error"
+_OVER_QUERY_LIMIT = "over_query_limit"
+
+
+def overrides(url):
+    """Returns base_url_overrides for a Client, sending the requests for all
+    Maps Platform hosts to url.
+
+    :param url: The base URL of a fake server, e.g. "http://127.0.0.1:8080".
+    :type url: string
+
+    :rtype: dict
+    """
+    return dict((base_url, url) for base_url in (
+        _DEFAULT_BASE_URL, _ROADS_BASE_URL, _GEOLOCATION_BASE_URL,
+        _ADDRESSVALIDATION_BASE_URL))
+
+
+def _digest(value):
+    return int(hashlib.md5(value.encode("utf-8")).hexdigest()[:12], 16)
+
+
+def _location(value):
+    """Parses a lat/lng string, or derives a stable location from an address
+    or place ID.
+
+    :rtype: tuple (lat, lng)
+    """
+    value = value.strip()
+    if value.startswith("via:"):
+        value = value[4:]
+    try:
+        lat, lng = value.split(",")
+        return float(lat), float(lng)
+    except ValueError:
+        h = _digest(value)
+        return (round((h % 1200000) / 10000.0 - 60, 6),
+                round((h // 1200000 % 3400000) / 10000.0 - 170, 6))
+
+
+def _locations(value):
+    """Parses a pipe separated location list, or an "enc:" polyline."""
+    if value.startswith("optimize:true|"):
+        value = value[len("optimize:true|"):]
+    if value.startswith("enc:"):
+        polyline = value[4:]
+        if polyline.endswith(":"):
+            polyline = polyline[:-1]
+        return [(p["lat"], p["lng"]) for p in convert.decode_polyline(polyline)]
+    return [_location(v) for v in value.split("|") if v]
+
+
+def _latlng(location):
+    return {"lat": location[0], "lng": location[1]}
+
+
+def _distance(a, b):
+    """Returns the great circle distance between a and b, in meters."""
+    lat1, lng1, lat2, lng2 = map(math.radians, (a[0], a[1], b[0], b[1]))
+    h = (math.sin((lat2 - lat1) / 2) ** 2 +
+         math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2)
+    return int(round(2 * 6371000 * math.asin(math.sqrt(min(1.0, h)))))
+
+
+def _distance_value(meters):
+    return {"text": "%.1f km" % (meters / 1000.0), "value": meters}
+
+
+def _duration_value(seconds):
+    return {"text": "%d mins" % max(1, round(seconds / 60.0)),
+            "value": seconds}
+
+
+def _duration(meters, mode):
+    return int(round(meters / _SPEEDS.get(mode or "driving", 13.9)))
+
+
+def _bounds(locations):
+    lats = [l[0] for l in locations]
+    lngs = [l[1] for l in locations]
+    return {"northeast": {"lat": max(lats), "lng": max(lngs)},
+            "southwest": {"lat": min(lats), "lng": min(lngs)}}
+
+
+def _place_id(value):
+    return "ChIJfake%012x" % _digest(value)
+
+
+def _address(value):
+    """Returns the formatted address of a location parameter."""
+    try:
+        lat, lng = [float(v) for v in value.split(",")]
+    except ValueError:
+        return value
+    return "%s, %s" % (convert.format_float(lat), convert.format_float(lng))
+
+
+def _geocode_result(query, location):
+    return {
+        "address_components": [{"long_name": _address(query),
+                                 "short_name": _address(query),
+                                 "types": ["locality", "political"]}],
+        "formatted_address": _address(query),
+        "geometry": {
+            "location": _latlng(location),
+            "location_type": "APPROXIMATE",
+            "viewport": _bounds([(location[0] - 0.01, location[1] - 0.01),
+                                 (location[0] + 0.01, location[1] + 0.01)]),
+        },
+        "place_id": _place_id(query),
+        "types": ["locality", "political"],
+    }
+
+
+def _place(query, location):
+    return {
+        "business_status": "OPERATIONAL",
+        "formatted_address": _address(query),
+        "geometry": {"location": _latlng(location)},
+        "name": query,
+        "place_id": _place_id(query),
+        "rating": round(1 + (_digest(query) % 40) / 10.0, 1),
+        "types": ["point_of_interest", "establishment"],
+    }
+
+
+class FakeMapsServer:
+    """A local HTTP server faking the Maps Platform web services."""
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0,
+                 latency_jitter=0.0, error_rate=0.0,
+                 over_query_limit_rate=0.0, seed=0, max_requests=1000):
+        """
+        :param host: The interface to listen on.
+        :type host: string
+
+        :param port: The port to listen on. Defaults to any free port.
+        :type port: int
+
+        :param latency: Seconds to wait before responding.
+        :type latency: float
+
+        :param latency_jitter: Additional random delay of up to this many
+            seconds.
+        :type latency_jitter: float
+
+        :param error_rate: Fraction of requests answered with an HTTP 503
+            error.
+        :type error_rate: float
+
+        :param over_query_limit_rate: Fraction of requests rejected for
+            exceeding the query limit, in the format of the API called.
+        :type over_query_limit_rate: float
+
+        :param seed: Seed of the random number generator deciding on latency
+            and errors.
+        :type seed: int
+
+        :param max_requests: The number of most recent requests kept in
+            requests, so that a server under sustained load doesn't grow
+            without bound. None keeps them all, and 0 none.
+        :type max_requests: int
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.over_query_limit_rate = over_query_limit_rate
+        self.requests = collections.deque(maxlen=max_requests)
+        self._random = random.Random(seed)
+        self._faults = collections.deque()
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        """The base URL of the running server.
+
+        :rtype: string
+        """
+        return "http://%s:%d" % (self.host, self._server.server_port)
+
+    @property
+    def base_url_overrides(self):
+        """base_url_overrides for a Client, sending the requests for all Maps
+        Platform hosts to this server.
+
+        :rtype: dict
+        """
+        return overrides(self.base_url)
+
+    def client(self, key="AIzaFakeServerKey", **kwargs):
+        """Returns a Client sending all its requests to this server.
+
+        :param kwargs: Extra keyword arguments for googlemaps.Client.
+        """
+        kwargs.setdefault("queries_per_second", 1000000)
+        kwargs.setdefault("queries_per_minute", None)
+        return googlemaps.Client(key=key, base_url=self.base_url,
+                                 base_url_overrides=self.base_url_overrides,
+                                 **kwargs)
+
+    def inject(self, fault, count=1):
+        """Makes the next count requests fail, regardless of the configured
+        error rates.
+
+        :param fault: "server_error" or "over_query_limit".
+        :type fault: string
+
+        :param count: The number of requests to fail.
+        :type count: int
+        """
+        if fault not in (_SERVER_ERROR, _OVER_QUERY_LIMIT):
+            raise ValueError("Unknown fault: %s" % fault)
+        with self._lock:
+            self._faults.extend([fault] * count)
+
+    def start(self):
+        """Starts serving in a background thread.
+
+        :rtype: FakeMapsServer
+        """
+        self._server = http.server.ThreadingHTTPServer(
+            (self.host, self.port), _Handler)
+        self._server.daemon_threads = True
+        self._server.fake = self
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops the server."""
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _next_fault(self):
+        """Returns the fault to apply to the next request, if any, and the
+        delay before responding."""
+        with self._lock:
+            delay = self.latency
+            if self.latency_jitter:
+                delay += self._random.random() * self.latency_jitter
+            if self._faults:
+                return self._faults.popleft(), delay
+            if self.error_rate and self._random.random() < self.error_rate:
+                return _SERVER_ERROR, delay
+            if (self.over_query_limit_rate and
+                    self._random.random() < self.over_query_limit_rate):
+                return _OVER_QUERY_LIMIT, delay
+            return None, delay
+
+    def handle(self, method, path, params, body):
+        """Computes the response to a request.
+
+        :param method: "GET" or "POST".
+        :param path: The URL path.
+        :param params: The query string parameters, as a dict of strings.
+        :param body: The decoded JSON body of POST requests.
+
+        :rtype: tuple (status code, content type, body bytes)
+        """
+        if self.requests.maxlen != 0:
+            with self._lock:
+                self.requests.append({"method": method, "path": path,
+                                      "params": params})
+
+        fault, delay = self._next_fault()
+        if delay:
+            time.sleep(delay)
+
+        handler = _ENDPOINTS.get(path)
+        if handler is None:
+            return 404, "text/plain", b"Not Found"
+
+        if fault == _SERVER_ERROR:
+            return 503, "text/plain", b"Service Unavailable"
+
+        style = _ERROR_STYLES.get(path, "maps")
+        if not (params.get("key") or params.get("signature")):
+            return _error(style, "REQUEST_DENIED",
+                          "The provided API key is invalid.")
+        if fault == _OVER_QUERY_LIMIT:
+            return _error(style, "OVER_QUERY_LIMIT",
+                          "You have exceeded your rate-limit for this API.")
+
+        try:
+            result = handler(params, body)
+        except (KeyError, ValueError) as e:
+            return _error(style, "INVALID_REQUEST", "Invalid request: %s" % e)
+
+        if isinstance(result, bytes):
+            return 200, "image/png", result
+        return 200, "application/json", json.dumps(result).encode("utf-8")
+
+
+def _error(style, status, message):
+    """Returns an error response in the format of the API style."""
+    if style == "maps":
+        body = {"status": status, "error_message": message}
+        code = 200
+    elif style == "geolocation":
+        # NOTE: the client treats any 403 as a query limit error.
+        code = 403 if status == "OVER_QUERY_LIMIT" else 400
+        reason = {"OVER_QUERY_LIMIT": "userRateLimitExceeded",
+                  "REQUEST_DENIED": "keyInvalid"}.get(status, "parseError")
+        body = {"error": {"code": code, "message": message,
+                          "errors": [{"reason": reason, "message": message}]}}
+    else:
+        status, code = {
+            "OVER_QUERY_LIMIT": ("RESOURCE_EXHAUSTED", 429),
+            "REQUEST_DENIED": ("PERMISSION_DENIED", 403),
+        }.get(status, ("INVALID_ARGUMENT", 400))
+        body = {"error": {"code": code, "message": message, "status": status}}
+    return code, "application/json", json.dumps(body).encode("utf-8")
+
+
+def _directions(params, body):
+    mode = params.get("mode", "driving")
+    points = [params["origin"]]
+    if params.get("waypoints"):
+        waypoints = params["waypoints"]
+        if waypoints.startswith("optimize:true|"):
+            waypoints = waypoints[len("optimize:true|"):]
+        if waypoints.startswith("enc:"):
+            points.extend(convert.latlng(l) for l in _locations(waypoints))
+        else:
+            points.extend(w for w in waypoints.split("|")
+                          if not w.startswith("via:"))
+    points.append(params["destination"])
+    locations = [_location(p) for p in points]
+
+    legs = []
+    for i in range(len(points) - 1):
+        meters = _distance(locations[i], locations[i + 1])
+        seconds = _duration(meters, mode)
+        step = {
+            "distance": _distance_value(meters),
+            "duration": _duration_value(seconds),
+            "end_location": _latlng(locations[i + 1]),
+            "html_instructions": "Head to <b>%s</b>" % _address(points[i + 1]),
+            "polyline": {"points": convert.encode_polyline(
+                [locations[i], locations[i + 1]])},
+            "start_location": _latlng(locations[i]),
+            "travel_mode": mode.upper(),
+        }
+        leg = {
+            "distance": _distance_value(meters),
+            "duration": _duration_value(seconds),
+            "end_address": _address(points[i + 1]),
+            "end_location": _latlng(locations[i + 1]),
+            "start_address": _address(points[i]),
+            "start_location": _latlng(locations[i]),
+            "steps": [step],
+            "traffic_speed_entry": [],
+            "via_waypoint": [],
+        }
+        if "departure_time" in params and mode == "driving":
+            leg["duration_in_traffic"] = _duration_value(int(seconds * 1.2))
+        legs.append(leg)
+
+    routes = []
+    count = 3 if params.get("alternatives") == "true" else 1
+    for i in range(count):
+        routes.append({
+            "bounds": _bounds(locations),
+            "copyrights": "Synthetic data",
+            "legs": legs,
+            "overview_polyline": {
+                "points": convert.encode_polyline(locations)},
+            "summary": "Route %d" % (i + 1),
+            "warnings": [],
+            "waypoint_order": list(range(len(points) - 2)),
+        })
+
+    return {
+        "geocoded_waypoints": [{"geocoder_status": "OK",
+                                "place_id": _place_id(p),
+                                "types": ["locality"]} for p in points],
+        "routes": routes,
+        "status": "OK",
+    }
+
+
+def _distance_matrix(params, body):
+    mode = params.get("mode", "driving")
+    origins = params["origins"].split("|")
+    destinations = params["destinations"].split("|")
+    if params["origins"].startswith("enc:"):
+        origins = [convert.latlng(l) for l in _locations(params["origins"])]
+    if params["destinations"].startswith("enc:"):
+        destinations = [convert.latlng(l)
+                        for l in _locations(params["destinations"])]
+
+    rows = []
+    for origin in origins:
+        elements = []
+        for destination in destinations:
+            meters = _distance(_location(origin), _location(destination))
+            seconds = _duration(meters, mode)
+            element = {
+                "distance": _distance_value(meters),
+                "duration": _duration_value(seconds),
+                "status": "OK",
+            }
+            if "departure_time" in params and mode == "driving":
+                element["duration_in_traffic"] = _duration_value(
+                    int(seconds * 1.2))
+            elements.append(element)
+        rows.append({"elements": elements})
+
+    return {
+        "destination_addresses": [_address(d) for d in destinations],
+        "origin_addresses": [_address(o) for o in origins],
+        "rows": rows,
+        "status": "OK",
+    }
+
+
+def _geocode(params, body):
+    query = (params.get("address") or params.get("latlng") or
+             params.get("place_id") or params.get("components"))
+    if not query:
+        return {"results": [], "status": "ZERO_RESULTS"}
+    return {"results": [_geocode_result(query, _location(query))],
+            "status": "OK"}
+
+
+def _elevation_at(location):
+    return round(500 * math.sin(math.radians(location[0]) * 7) *
+                 math.cos(math.radians(location[1]) * 5) + 200, 6)
+
+
+def _elevation(params, body):
+    if "path" in params:
+        path = _locations(params["path"])
+        samples = int(params["samples"])
+        locations = []
+        for i in range(samples):
+            t = i * (len(path) - 1) / float(max(1, samples - 1))
+            j = min(int(t), len(path) - 2) if len(path) > 1 else 0
+            f = t - j
+            a, b = path[j], path[min(j + 1, len(path) - 1)]
+            locations.append((a[0] + (b[0] - a[0]) * f,
+                              a[1] + (b[1] - a[1]) * f))
+    else:
+        locations = _locations(params["locations"])
+
+    return {
+        "results": [{"elevation": _elevation_at(l), "location": _latlng(l),
+                     "resolution": 9.5} for l in locations],
+        "status": "OK",
+    }
+
+
+def _timezone(params, body):
+    lat, lng = _location(params["location"])
+    hours = int(round(lng / 15.0))
+    return {
+        "dstOffset": 0,
+        "rawOffset": hours * 3600,
+        "status": "OK",
+        "timeZoneId": "Etc/GMT%+d" % -hours if hours else "Etc/GMT",
+        "timeZoneName": "GMT%+d" % hours,
+    }
+
+
+def _snapped_points(path):
+    return [{
+        "location": {"latitude": round(l[0], 5), "longitude": round(l[1], 5)},
+        "originalIndex": i,
+        "placeId": _place_id(convert.latlng(
+            (round(l[0], 3), round(l[1], 3)))),
+    } for i, l in enumerate(path)]
+
+
+def _snap_to_roads(params, body):
+    return {"snappedPoints": _snapped_points(_locations(params["path"]))}
+
+
+def _nearest_roads(params, body):
+    return {"snappedPoints": _snapped_points(_locations(params["points"]))}
+
+
+def _speed_limit(place_id):
+    return {"placeId": place_id, "speedLimit": 30 + 10 * (_digest(place_id) % 9),
+            "units": "KPH"}
+
+
+def _speed_limits(params, body):
+    if "path" in params:
+        points = _snapped_points(_locations(params["path"]))
+        return {"snappedPoints": points,
+                "speedLimits": [_speed_limit(p["placeId"]) for p in points]}
+    place_ids = params["placeId"]
+    if not isinstance(place_ids, list):
+        place_ids = [place_ids]
+    return {"speedLimits": [_speed_limit(p) for p in place_ids]}
+
+
+def _find_place(params, body):
+    query = params["input"]
+    return {"candidates": [_place(query, _location(query))], "status": "OK"}
+
+
+def _places_search(params, body):
+    query = params.get("query") or params.get("keyword") or params.get(
+        "name") or params.get("type") or params.get("location", "")
+    center = _location(params.get("location") or query)
+    results = []
+    for i in range(5):
+        name = "%s %d" % (query, i + 1)
+        results.append(_place(name, (center[0] + 0.001 * i,
+                                     center[1] - 0.001 * i)))
+    return {"html_attributions": [], "results": results, "status": "OK"}
+
+
+def _place_details(params, body):
+    place_id = params["placeid"]
+    result = _place(place_id, _location(place_id))
+    result["place_id"] = place_id
+    return {"html_attributions": [], "result": result, "status": "OK"}
+
+
+def _place_photo(params, body):
+    if "photoreference" not in params:
+        raise KeyError("photoreference")
+    return _PNG
+
+
+def _autocomplete(params, body):
+    query = params["input"]
+    return {
+        "predictions": [{
+            "description": "%s %d" % (query, i + 1),
+            "place_id": _place_id("%s %d" % (query, i + 1)),
+            "types": ["geocode"],
+        } for i in range(5)],
+        "status": "OK",
+    }
+
+
+def _static_map(params, body):
+    if "size" not in params:
+        raise KeyError("size")
+    return _PNG
+
+
+def _geolocate(params, body):
+    seeds = []
+    for tower in (body or {}).get("cellTowers", []):
+        seeds.append(json.dumps(tower, sort_keys=True))
+    for access_point in (body or {}).get("wifiAccessPoints", []):
+        seeds.append(json.dumps(access_point, sort_keys=True))
+    if not seeds:
+        seeds = ["ip"]
+    location = _location("|".join(seeds))
+    return {"accuracy": 50.0 if len(seeds) > 1 else 1500.0,
+            "location": _latlng(location)}
+
+
+def _validate_address(params, body):
+    address = body["address"]
+    lines = address["addressLines"]
+    text = ", ".join(lines)
+    location = _location(text)
+    return {
+        "responseId": "fake-%012x" % _digest(text),
+        "result": {
+            "address": {
+                "formattedAddress": text,
+                "postalAddress": dict(address),
+            },
+            "geocode": {
+                "location": {"latitude": location[0],
+                             "longitude": location[1]},
+                "placeId": _place_id(text),
+            },
+            "verdict": {
+                "addressComplete": True,
+                "geocodeGranularity": "PREMISE",
+                "inputGranularity": "PREMISE",
+                "validationGranularity": "PREMISE",
+            },
+        },
+    }
+
+
+_ENDPOINTS = {
+    "/maps/api/directions/json": _directions,
+    "/maps/api/distancematrix/json": _distance_matrix,
+    "/maps/api/geocode/json": _geocode,
+    "/maps/api/elevation/json": _elevation,
+    "/maps/api/timezone/json": _timezone,
+    "/maps/api/place/findplacefromtext/json": _find_place,
+    "/maps/api/place/textsearch/json": _places_search,
+    "/maps/api/place/nearbysearch/json": _places_search,
+    "/maps/api/place/details/json": _place_details,
+    "/maps/api/place/photo": _place_photo,
+    "/maps/api/place/autocomplete/json": _autocomplete,
+    "/maps/api/place/queryautocomplete/json": _autocomplete,
+    "/maps/api/staticmap": _static_map,
+    "/v1/snapToRoads": _snap_to_roads,
+    "/v1/nearestRoads": _nearest_roads,
+    "/v1/speedLimits": _speed_limits,
+    "/geolocation/v1/geolocate": _geolocate,
+    "/v1:validateAddress": _validate_address,
+}
+
+_ERROR_STYLES = {
+    "/v1/snapToRoads": "google",
+    "/v1/nearestRoads": "google",
+    "/v1/speedLimits": "google",
+    "/geolocation/v1/geolocate": "geolocation",
+    "/v1:validateAddress": "google",
+}
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._respond(None)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        data = self.rfile.read(length) if length else b""
+        try:
+            body = json.loads(data.decode("utf-8")) if data else {}
+        except ValueError:
+            body = {}
+        self._respond(body)
+
+    def _respond(self, body):
+        url = urlparse(self.path)
+        params = dict((k, v[0] if len(v) == 1 else v)
+                      for k, v in parse_qs(url.query).items())
+        status, content_type, data = self.server.fake.handle(
+            self.command, url.path, params, body)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Runs a fake Google Maps Platform server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--latency-jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--over-query-limit-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    server = FakeMapsServer(
+        host=args.host, port=args.port, latency=args.latency,
+        latency_jitter=args.latency_jitter, error_rate=args.error_rate,
+        over_query_limit_rate=args.over_query_limit_rate, seed=args.seed)
+    server.start()
+    print("Serving fake Maps Platform APIs on %s" % server.base_url)
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,7 @@
 #
 
 """Performs requests to the Google Maps Geolocation API."""
+from googlemaps import decoder
 from googlemaps import exceptions
 
 
@@ -27,7 +28,7 @@ def _geolocation_extract(response):
     Mimics the exception handling logic in ``client._get_body``, but
     for geolocation which uses a different response format.
     """
-    body = response.json()
+    body = decoder.json_body(response)
     if response.status_code in (200, 404):
         return body
 
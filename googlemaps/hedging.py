@@ -0,0 +1,235 @@
+#
+# Copyright 2026 Google Inc. All rights reserved.
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+
+"""Hedged requests, cutting the tail latency of idempotent requests.
+
+When a request is still outstanding after the usual latency of its endpoint
+(by default the 95th percentile of its recent requests), a duplicate is
+sent, and whichever response arrives first is used. Hedges are capped at a
+fraction of all requests, so that they cost a bounded amount of extra quota.
+"""
+
+import collections
+from concurrent import futures
+import threading
+import time
+
+
+class LatencyTracker:
+    """Keeps the latencies of the most recent requests of an endpoint."""
+
+    def __init__(self, window=200, min_samples=20):
+        """
+        :param window: The number of recent latencies kept.
+        :type window: int
+
+        :param min_samples: The number of latencies needed before
+            percentiles are reported.
+        :type min_samples: int
+        """
+        self.min_samples = min_samples
+        self._latencies = collections.deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def percentile(self, percent):
+        """Returns the given percentile of the recent latencies, or None if
+        there are not enough of them yet.
+
+        :rtype: float
+        """
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            latencies = sorted(self._latencies)
+        i = min(len(latencies) - 1, int(len(latencies) * percent / 100.0))
+        return latencies[i]
+
+
+class Hedger:
+    """Sends requests, hedging the slow ones. Safe to share between
+    threads."""
+
+    def __init__(self, max_ratio=0.05, percentile=95, min_samples=20,
+                 max_workers=64):
+        """
+        :param max_ratio: The maximum number of hedges, as a fraction of the
+            number of requests.
+        :type max_ratio: float
+
+        :param percentile: The percentile of an endpoint's latency after
+            which a request is hedged.
+        :type percentile: float
+
+        :param min_samples: The number of requests to an endpoint needed
+            before its requests are hedged.
+        :type min_samples: int
+
+        :param max_workers: The number of threads sending hedged requests.
+            Requests beyond it are sent on the calling thread, unhedged,
+            rather than queued.
+        :type max_workers: int
+        """
+        self.max_ratio = max_ratio
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.max_workers = max_workers
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._in_flight = 0
+        self._trackers = {}
+        self._lock = threading.Lock()
+        self._executor = futures.ThreadPoolExecutor(max_workers=max_workers)
+
+    def _tracker(self, endpoint):
+        with self._lock:
+            tracker = self._trackers.get(endpoint)
+            if tracker is None:
+                tracker = LatencyTracker(min_samples=self.min_samples)
+                self._trackers[endpoint] = tracker
+            return tracker
+
+    def _take_hedge(self):
+        with self._lock:
+            if self.hedges + 1 > self.max_ratio * self.requests:
+                return False
+            self.hedges += 1
+            return True
+
+    def _may_hedge(self):
+        """Returns whether a request could be hedged, reserving a worker for
+        it if so."""
+        with self._lock:
+            if (self.hedges + 1 > self.max_ratio * self.requests or
+                    self._in_flight + 2 > self.max_workers):
+                return False
+            self._in_flight += 1
+            return True
+
+    def _reserve_worker(self):
+        with self._lock:
+            if self._in_flight >= self.max_workers:
+                return False
+            self._in_flight += 1
+            return True
+
+    def _release_worker(self, future):
+        with self._lock:
+            self._in_flight -= 1
+
+    def stats(self):
+        """Returns the hedging counters.
+
+        :rtype: dict with the keys "requests", "hedges" (duplicate requests
+            sent), "hedge_wins" (hedges that returned first) and
+            "hedge_ratio"
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "hedge_ratio": (float(self.hedges) / self.requests
+                                if self.requests else 0.0),
+            }
+
+    def send(self, endpoint, send, before_hedge=None):
+        """Calls send, calling it again if it takes longer than usual for
+        the endpoint, and returns the first response.
+
+        :param endpoint: The endpoint the request goes to.
+        :type endpoint: string
+
+        :param send: Sends the request, returning the response.
+        :type send: function
+
+        :param before_hedge: Called before sending a hedge, e.g. to take a
+            slot of the rate limiter, returning whether the hedge may be
+            sent. It should not block, as the primary request may answer
+            in the meantime.
+        :type before_hedge: function
+        """
+        tracker = self._tracker(endpoint)
+        with self._lock:
+            self.requests += 1
+        delay = tracker.percentile(self.percentile)
+
+        start = time.monotonic()
+        if delay is None or not self._may_hedge():
+            # Nothing to race against: no thread hop.
+            response = send()
+            tracker.record(time.monotonic() - start)
+            return response
+
+        primary = self._executor.submit(send)
+        primary.add_done_callback(self._release_worker)
+        primary.add_done_callback(
+            lambda f: tracker.record(time.monotonic() - start))
+        try:
+            return primary.result(timeout=delay)
+        except futures.TimeoutError:
+            pass
+
+        if not self._reserve_worker():
+            return primary.result()
+        if not self._take_hedge():
+            self._release_worker(None)
+            return primary.result()
+        try:
+            if before_hedge is not None and not before_hedge():
+                # No hedge after all.
+                with self._lock:
+                    self.hedges -= 1
+                self._release_worker(None)
+                return primary.result()
+            hedge = self._executor.submit(send)
+        except BaseException:
+            self._release_worker(None)
+            raise
+        hedge.add_done_callback(self._release_worker)
+
+        done, _ = futures.wait([primary, hedge],
+                               return_when=futures.FIRST_COMPLETED)
+        first = primary if primary in done else hedge
+        other = hedge if first is primary else primary
+        if first.exception() is not None:
+            # Give the other request its chance.
+            first, other = other, first
+            first.exception()
+        other.add_done_callback(_close_response)
+
+        if first is hedge:
+            with self._lock:
+                self.hedge_wins += 1
+        return first.result()
+
+    def shutdown(self):
+        """Stops the threads sending hedged requests."""
+        self._executor.shutdown(wait=False)
+
+
+def _close_response(future):
+    """Releases the connection of a response that lost the race."""
+    if future.exception() is None:
+        try:
+            future.result().close()
+        except Exception:
+            pass
@@ -82,11 +82,11 @@ class StaticMapPath(StaticMapParam):
 
     def __init__(self, points,
                  weight=None, color=None,
-                 fillcolor=None, geodesic=None):
+                 fillcolor=None, geodesic=None, max_length=None):
         """
         :param points: Specifies the point through which the path
             will be built.
-        :type points: list
+        :type points: list or LatLngArray
 
         :param weight: Specifies the thickness of the path in pixels.
         :type weight: int
@@ -103,9 +103,17 @@ class StaticMapPath(StaticMapParam):
             interpreted as a geodesic line that follows the curvature
             of the earth.
         :type geodesic: bool
+
+        :param max_length: When set, the points are sent as an encoded
+            polyline when that is shorter, and simplified until they fit in
+            this many URL characters. The maximum distance in meters of the
+            original points from the simplified path is then available as
+            the deviation attribute.
+        :type max_length: int
         """
 
         super(StaticMapPath, self).__init__()
+        self.deviation = 0.0
 
         if weight:
             self.params.append("weight:%s" % weight)
@@ -119,7 +127,12 @@ class StaticMapPath(StaticMapParam):
         if geodesic:
             self.params.append("geodesic:%s" % geodesic)
 
-        self.params.append(convert.location_list(points))
+        if max_length:
+            points, self.deviation = convert.simplify_polyline(
+                points, max_length=max_length)
+            self.params.append(convert.shortest_path(points))
+        else:
+            self.params.append(convert.location_list(points))
 
 
 def static_map(client, size,
@@ -0,0 +1,283 @@
+#
+# Copyright 2026 Google Inc. All rights reserved.
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+
+"""Incrementally updated distance matrices.
+
+A DistanceMatrixStore keeps the distance matrix elements it has fetched,
+keyed by origin, destination, request options (the travel mode, avoid,
+units...) and departure or arrival time bucket. A matrix is assembled from
+the stored elements, and only the missing ones are requested, in as few
+rectangular tiles as possible. Adding an origin to a 500x500 matrix costs
+500 elements rather than 250,500.
+
+    store = DistanceMatrixStore.load("matrix.json.gz")
+    matrix = store.distance_matrix(client, origins, destinations)
+    store.save()
+"""
+
+import copy
+import json
+import threading
+import time
+
+from googlemaps import convert
+from googlemaps import distance_matrix as _distance_matrix
+from googlemaps import recording
+
+try: # Python 3
+    from urllib.parse import urlencode
+except ImportError: # Python 2
+    from urllib import urlencode
+
+
+_VERSION = 1
+
+
+class DistanceMatrixStore:
+    """A thread-safe store of distance matrix elements.
+
+    The hits, misses and saved attributes count the elements served from
+    the store, requested, and left out by skip_diagonal and symmetric.
+    """
+
+    def __init__(self, path=None, time_bucket=None, max_age=None):
+        """
+        :param path: The file the store is saved to.
+        :type path: string
+
+        :param time_bucket: The length, in seconds, of the time buckets
+            departure times are grouped in. Departure times, including
+            "now", are rounded up to the end of their bucket, and elements
+            requested for it are shared. Defaults to None (elements are only
+            shared between identical times, and never stored for "now").
+        :type time_bucket: int
+
+        :param max_age: The number of seconds after which elements are
+            requested again, which bounds their staleness. Defaults to None
+            (elements are kept until cleared).
+        :type max_age: float
+        """
+        self.path = path
+        self.time_bucket = time_bucket
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.saved = 0
+        self._elements = {}
+        self._fetched_at = {}
+        self._addresses = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        """Reads a store saved with save.
+
+        :param path: The store file. Gzip compressed unless the name does not
+            end with ".gz".
+        :type path: string
+
+        :raises ValueError: if the file is not a supported store.
+        :rtype: googlemaps.matrixstore.DistanceMatrixStore
+        """
+        with recording._open(path, "rb") as f:
+            document = json.loads(f.read().decode("utf-8"))
+        if document.get("version") != _VERSION:
+            raise ValueError("Unsupported store version: %s" %
+                             document.get("version"))
+        store = cls(path, time_bucket=document.get("time_bucket"),
+                    max_age=document.get("max_age"))
+        for origin, destination, options, bucket, element, fetched_at in \
+                document["elements"]:
+            key = (origin, destination, options, bucket)
+            store._elements[key] = element
+            store._fetched_at[key] = fetched_at
+        store._addresses.update(document["addresses"])
+        return store
+
+    def save(self, path=None):
+        """Writes the store.
+
+        :param path: The file to write. Defaults to the path the store was
+            created with.
+        :type path: string
+        """
+        path = path or self.path
+        if path is None:
+            raise ValueError("No path to save the store to.")
+        with self._lock:
+            elements = [list(key) + [element, self._fetched_at[key]]
+                        for key, element in self._elements.items()]
+            addresses = dict(self._addresses)
+        document = {"version": _VERSION, "time_bucket": self.time_bucket,
+                    "max_age": self.max_age, "elements": elements,
+                    "addresses": addresses}
+        with recording._open(path, "wb") as f:
+            f.write(json.dumps(document, separators=(",", ":"))
+                    .encode("utf-8"))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._elements)
+
+    def clear(self):
+        """Removes all elements."""
+        with self._lock:
+            self._elements.clear()
+            self._fetched_at.clear()
+            self._addresses.clear()
+
+    def distance_matrix(self, client, origins, destinations,
+                        max_elements=_distance_matrix._MAX_ELEMENTS,
+                        max_dimension=_distance_matrix._MAX_DIMENSION,
+                        concurrency=4, skip_diagonal=False, symmetric=False,
+                        **kwargs):
+        """Gets travel distance and time for a matrix of origins and
+        destinations, requesting only the elements not in the store.
+
+        :param client: The client requesting missing elements.
+        :type client: googlemaps.Client
+
+        :param origins: The origins.
+        :type origins: list of locations, where a location is a string, dict,
+            list, or tuple
+
+        :param destinations: The destinations.
+        :type destinations: list of locations
+
+        Also accepts the arguments of distance_matrix_bulk, elements left
+        out by skip_diagonal and symmetric being counted in saved.
+
+        :rtype: matrix of distances, as returned by distance_matrix
+        """
+        if not isinstance(origins, (list, convert.LatLngArray)):
+            origins = [origins]
+        if not isinstance(destinations, (list, convert.LatLngArray)):
+            destinations = [destinations]
+        origin_keys = _distance_matrix._location_keys(origins)
+        destination_keys = _distance_matrix._location_keys(destinations)
+        options, bucket, kwargs = self._options(kwargs)
+        sources = _distance_matrix._Sources(
+            origin_keys, destination_keys, skip_diagonal, symmetric,
+            kwargs.get("mode"), kwargs.get("units"))
+
+        # Elements are only looked up once per distinct location.
+        rows = _first_indices(origin_keys)
+        cols = _first_indices(destination_keys)
+        missing = []
+        oldest = None
+        if self.max_age is not None:
+            oldest = time.time() - self.max_age
+        with self._lock:
+            for i in rows:
+                row_missing = []
+                for j in cols:
+                    o, d = origin_keys[i], destination_keys[j]
+                    if sources.source(o, d) != _distance_matrix._FETCH:
+                        self.saved += 1
+                    elif (bucket is not None and
+                          self._fresh((o, d, options, bucket), oldest)):
+                        self.hits += 1
+                    else:
+                        row_missing.append(j)
+                missing.append(row_missing)
+                self.misses += len(row_missing)
+
+        fetched = {}
+        tiles = _distance_matrix._cover(rows, missing, max_elements,
+                                        max_dimension)
+        items = [dict(kwargs, origins=[origins[i] for i in tile_rows],
+                      destinations=[destinations[j] for j in tile_cols])
+                 for tile_rows, tile_cols in tiles]
+        results = client.map("distance_matrix", items,
+                             concurrency=concurrency)
+        for (tile_rows, tile_cols), result in zip(tiles, results):
+            if isinstance(result, Exception):
+                raise result
+            with self._lock:
+                for i, address in zip(tile_rows, result["origin_addresses"]):
+                    self._addresses[origin_keys[i]] = address
+                for j, address in zip(tile_cols,
+                                      result["destination_addresses"]):
+                    self._addresses[destination_keys[j]] = address
+            for i, row in zip(tile_rows, result["rows"]):
+                for j, element in zip(tile_cols, row["elements"]):
+                    fetched[(origin_keys[i], destination_keys[j])] = element
+
+        with self._lock:
+            if bucket is not None:
+                now = time.time()
+                for (o, d), element in fetched.items():
+                    key = (o, d, options, bucket)
+                    # Copies in and out, so that callers modifying a
+                    # matrix don't change the store.
+                    self._elements[key] = copy.deepcopy(element)
+                    self._fetched_at[key] = now
+
+            def lookup(key):
+                return copy.deepcopy(fetched.get(key) or
+                                     self._elements[key + (options, bucket)])
+
+            elements = [[sources.element(o, d, lookup)
+                         for d in destination_keys] for o in origin_keys]
+            return {
+                "destination_addresses": [self._addresses.get(d, d)
+                                          for d in destination_keys],
+                "origin_addresses": [self._addresses.get(o, o)
+                                     for o in origin_keys],
+                "rows": [{"elements": row} for row in elements],
+                "status": "OK",
+            }
+
+    def _fresh(self, key, oldest):
+        # Called with the lock held.
+        if key not in self._elements:
+            return False
+        return oldest is None or self._fetched_at[key] >= oldest
+
+    def _options(self, kwargs):
+        """Returns the options and time bucket elements are stored under, the
+        bucket being None if they should not be stored, and the arguments to
+        request them with."""
+        if self.time_bucket and kwargs.get("departure_time"):
+            kwargs = dict(kwargs, departure_time=int(convert.bucket_time(
+                kwargs["departure_time"], self.time_bucket)))
+        params = _distance_matrix._params([], [], **kwargs)
+        for name in ("origins", "destinations"):
+            del params[name]
+        params.setdefault("mode", "driving")
+
+        bucket = ""
+        for name in ("departure_time", "arrival_time"):
+            if name not in params:
+                continue
+            value = params.pop(name)
+            if value == "now":
+                return None, None, kwargs
+            bucket = "%s=%s" % (name, value)
+
+        return urlencode(sorted(params.items())), bucket, kwargs
+
+
+def _first_indices(keys):
+    """Returns the index of the first occurrence of each distinct key."""
+    seen = set()
+    indices = []
+    for i, key in enumerate(keys):
+        if key not in seen:
+            seen.add(key)
+            indices.append(i)
+    return indices
@@ -0,0 +1,270 @@
+#
+# Copyright 2026 Google Inc. All rights reserved.
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+
+"""Typed views of API results.
+
+Results are returned as the dicts decoded from the JSON responses. These
+classes wrap them without copying: attributes are read from the dict when
+accessed, and nested results (the legs of a route, the steps of a leg) are
+only wrapped the first time they are accessed. Instances use __slots__, so
+wrapping millions of results costs a small object each.
+
+    results = models.GeocodeResult.from_list(client.geocode("Sydney"))
+    results[0].location
+    # (-33.8688197, 151.2092955)
+    results[0].to_dict()["address_components"]
+"""
+
+from googlemaps import convert
+
+
+class _Field(object):
+    """An attribute read from the result dict, following a path of keys.
+    Locations are returned as (lat, lng) tuples."""
+
+    __slots__ = ("path", "default", "location")
+
+    def __init__(self, *path, **kwargs):
+        self.path = path
+        self.default = kwargs.get("default")
+        self.location = kwargs.get("location", False)
+
+    def __get__(self, obj, owner):
+        if obj is None:
+            return self
+        value = obj._raw
+        for key in self.path:
+            if not isinstance(value, dict) or key not in value:
+                return self.default
+            value = value[key]
+        if self.location:
+            return convert.normalize_lat_lng(value)
+        return value
+
+
+class _Nested(object):
+    """An attribute wrapping a list of nested results, cached in a slot the
+    first time it is accessed."""
+
+    __slots__ = ("key", "slot", "model")
+
+    def __init__(self, key, slot, model):
+        self.key = key
+        self.slot = slot
+        self.model = model
+
+    def __get__(self, obj, owner):
+        if obj is None:
+            return self
+        try:
+            return getattr(obj, self.slot)
+        except AttributeError:
+            pass
+        model = self.model
+        if isinstance(model, str):
+            # Resolve models defined further down the module.
+            model = globals()[model]
+        value = model.from_list(obj._raw.get(self.key, []))
+        setattr(obj, self.slot, value)
+        return value
+
+
+class Result(object):
+    """Base class of the typed results."""
+
+    __slots__ = ("_raw",)
+
+    # The key shown by repr.
+    _label = None
+
+    def __init__(self, raw):
+        """
+        :param raw: The result, as decoded from the response.
+        :type raw: dict
+        """
+        self._raw = raw
+
+    @classmethod
+    def from_list(cls, results):
+        """Wraps a list of results.
+
+        :param results: The results, as returned by the client. For methods
+            returning the whole response, e.g. geocode or places, its
+            "results" are wrapped.
+        :type results: list of dicts, or dict
+
+        :rtype: list
+        """
+        if isinstance(results, dict):
+            results = results.get("results", [])
+        return [cls(result) for result in results]
+
+    def to_dict(self):
+        """Returns the result as decoded from the response. It is not a
+        copy, and nested results share it.
+
+        :rtype: dict
+        """
+        return self._raw
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._raw == other._raw
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "<%s %r>" % (type(self).__name__, self._raw.get(self._label))
+
+
+class GeocodeResult(Result):
+    """A result of geocode or reverse_geocode."""
+
+    __slots__ = ()
+    _label = "formatted_address"
+
+    place_id = _Field("place_id")
+    formatted_address = _Field("formatted_address")
+    types = _Field("types", default=())
+    address_components = _Field("address_components", default=())
+    partial_match = _Field("partial_match", default=False)
+    location = _Field("geometry", "location", location=True)
+    location_type = _Field("geometry", "location_type")
+    viewport = _Field("geometry", "viewport")
+    plus_code = _Field("plus_code", "global_code")
+
+
+class Step(Result):
+    """A step of a directions leg. Distances are in meters, and durations
+    in seconds."""
+
+    __slots__ = ("_steps",)
+    _label = "html_instructions"
+
+    html_instructions = _Field("html_instructions")
+    travel_mode = _Field("travel_mode")
+    maneuver = _Field("maneuver")
+    distance = _Field("distance", "value")
+    duration = _Field("duration", "value")
+    start_location = _Field("start_location", location=True)
+    end_location = _Field("end_location", location=True)
+    polyline = _Field("polyline", "points")
+    transit_details = _Field("transit_details")
+    # The steps of a walking or driving part of a transit step.
+    steps = _Nested("steps", "_steps", "Step")
+
+
+class Leg(Result):
+    """A leg of a directions route, between two stops. Distances are in
+    meters, and durations in seconds."""
+
+    __slots__ = ("_steps",)
+    _label = "end_address"
+
+    start_address = _Field("start_address")
+    end_address = _Field("end_address")
+    start_location = _Field("start_location", location=True)
+    end_location = _Field("end_location", location=True)
+    distance = _Field("distance", "value")
+    duration = _Field("duration", "value")
+    duration_in_traffic = _Field("duration_in_traffic", "value")
+    departure_time = _Field("departure_time", "value")
+    arrival_time = _Field("arrival_time", "value")
+    steps = _Nested("steps", "_steps", Step)
+
+
+class Route(Result):
+    """A route returned by directions."""
+
+    __slots__ = ("_legs",)
+    _label = "summary"
+
+    summary = _Field("summary")
+    copyrights = _Field("copyrights")
+    warnings = _Field("warnings", default=())
+    waypoint_order = _Field("waypoint_order", default=())
+    bounds = _Field("bounds")
+    fare = _Field("fare")
+    overview_polyline = _Field("overview_polyline", "points")
+    legs = _Nested("legs", "_legs", Leg)
+
+    @property
+    def overview_path(self):
+        """The points of the overview polyline.
+
+        :rtype: googlemaps.convert.LatLngArray
+        """
+        return convert.LatLngArray.from_points(self.overview_polyline or "")
+
+    @property
+    def distance(self):
+        """The distance of all legs, in meters."""
+        return sum(leg.distance or 0 for leg in self.legs)
+
+    @property
+    def duration(self):
+        """The duration of all legs, in seconds."""
+        return sum(leg.duration or 0 for leg in self.legs)
+
+
+class Place(Result):
+    """A result of a places search, or the result of place."""
+
+    __slots__ = ()
+    _label = "name"
+
+    place_id = _Field("place_id")
+    name = _Field("name")
+    formatted_address = _Field("formatted_address")
+    vicinity = _Field("vicinity")
+    types = _Field("types", default=())
+    location = _Field("geometry", "location", location=True)
+    viewport = _Field("geometry", "viewport")
+    rating = _Field("rating")
+    user_ratings_total = _Field("user_ratings_total")
+    price_level = _Field("price_level")
+    business_status = _Field("business_status")
+    open_now = _Field("opening_hours", "open_now")
+    opening_hours = _Field("opening_hours")
+    photos = _Field("photos", default=())
+
+
+class SnappedPoint(Result):
+    """A point returned by snap_to_roads or nearest_roads."""
+
+    __slots__ = ()
+    _label = "placeId"
+
+    location = _Field("location", location=True)
+    original_index = _Field("originalIndex")
+    place_id = _Field("placeId")
+
+
+class ElevationResult(Result):
+    """A result of elevation or elevation_along_path."""
+
+    __slots__ = ()
+    _label = "elevation"
+
+    elevation = _Field("elevation")
+    location = _Field("location", location=True)
+    resolution = _Field("resolution")
@@ -0,0 +1,292 @@
+#
+# Copyright 2026 Google Inc. All rights reserved.
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+
+"""Orders stops locally, from a matrix of travel costs.
+
+The optimize_waypoints option of the Directions API is limited to 25
+waypoints. Here the costs between all stops are fetched with the Distance
+Matrix API, and the stops ordered on the client: a nearest neighbor tour is
+improved with 2-opt and Or-opt moves until no move helps or the time limit
+is reached. The costs may be asymmetric, e.g. durations on one-way streets.
+
+    order = client.optimize_waypoints(depot, stops, roundtrip=True)
+    client.directions_long([depot] + [stops[i] for i in order] + [depot])
+"""
+
+import time
+
+from googlemaps import matrixstore
+
+
+# The cost of a pair of stops without a route between them.
+_UNREACHABLE = 1e12
+
+_EPSILON = 1e-9
+
+
+def optimize_waypoints(client, origin, waypoints, destination=None,
+                       roundtrip=False, metric="duration", time_limit=1.0,
+                       store=None, **kwargs):
+    """Orders waypoints to minimize the cost of a route through them.
+
+    :param origin: The start of the route.
+    :type origin: string, dict, list, or tuple
+
+    :param waypoints: The stops to order.
+    :type waypoints: list of locations, where a location is a string, dict,
+        list, or tuple
+
+    :param destination: The end of the route. Defaults to None, in which
+        case the route ends at the last waypoint, or at the origin when
+        roundtrip is set.
+    :type destination: string, dict, list, or tuple
+
+    :param roundtrip: Whether the route returns to the origin.
+    :type roundtrip: bool
+
+    :param metric: The cost to minimize: "duration", "distance" or
+        "duration_in_traffic".
+    :type metric: string
+
+    :param time_limit: The maximum number of seconds spent improving the
+        order, once the costs are known.
+    :type time_limit: float
+
+    :param store: The store of previously fetched costs, see cost_matrix.
+    :type store: googlemaps.matrixstore.DistanceMatrixStore
+
+    Also accepts the arguments of distance_matrix.
+
+    :rtype: list of the waypoint indices, in the order to visit them, like
+        the waypoint_order of a directions route
+    """
+    if roundtrip and destination is not None:
+        raise ValueError("Should not specify both roundtrip and destination.")
+    waypoints = list(waypoints)
+    locations = [origin] + waypoints
+    if destination is not None:
+        locations.append(destination)
+
+    costs = cost_matrix(client, locations, metric=metric, store=store,
+                        **kwargs)
+    if roundtrip:
+        end = 0
+    elif destination is not None:
+        end = len(locations) - 1
+    else:
+        end = None
+    order = solve_tsp(costs, start=0, end=end, time_limit=time_limit)
+    return [i - 1 for i in order if 0 < i <= len(waypoints)]
+
+
+def cost_matrix(client, locations, metric="duration", store=None, **kwargs):
+    """Returns the travel costs between all pairs of locations.
+
+    :param locations: The locations.
+    :type locations: list of locations, where a location is a string, dict,
+        list, or tuple
+
+    :param metric: The cost: "duration", "distance" or
+        "duration_in_traffic" (falling back to the duration where there is
+        no traffic information).
+    :type metric: string
+
+    :param store: The store of previously fetched elements. Only the
+        elements it is missing are requested, and added to it.
+    :type store: googlemaps.matrixstore.DistanceMatrixStore
+
+    Also accepts the arguments of distance_matrix, symmetric, and
+    skip_diagonal, which defaults to True.
+
+    :rtype: list of lists of floats, costs[i][j] being the cost from
+        locations[i] to locations[j]. Pairs without a route cost 1e12.
+    """
+    if metric not in ("duration", "distance", "duration_in_traffic"):
+        raise ValueError("Invalid metric: %s" % metric)
+    if store is None:
+        store = matrixstore.DistanceMatrixStore()
+    locations = list(locations)
+    # The diagonal costs nothing, so it isn't requested.
+    kwargs.setdefault("skip_diagonal", True)
+
+    matrix = store.distance_matrix(client, locations, locations, **kwargs)
+    return [[0 if i == j else _cost(element, metric)
+             for j, element in enumerate(row["elements"])]
+            for i, row in enumerate(matrix["rows"])]
+
+
+def _cost(element, metric):
+    if element.get("status") != "OK":
+        return _UNREACHABLE
+    if metric == "duration_in_traffic" and metric not in element:
+        metric = "duration"
+    if metric not in element:
+        return _UNREACHABLE
+    return element[metric]["value"]
+
+
+def tour_cost(costs, order):
+    """Returns the cost of visiting nodes in order.
+
+    :param costs: The costs between nodes.
+    :type costs: list of lists of numbers
+
+    :param order: The nodes, in the order visited. Repeat the first one at
+        the end for a round trip.
+    :type order: list of int
+
+    :rtype: number
+    """
+    return sum(costs[a][b] for a, b in zip(order, order[1:]))
+
+
+def solve_tsp(costs, start=0, end=None, time_limit=1.0):
+    """Orders the nodes of a cost matrix into a cheap path visiting each
+    once, with nearest neighbor, 2-opt and Or-opt heuristics.
+
+    :param costs: The costs between nodes, costs[i][j] being the cost from
+        node i to node j. Need not be symmetric.
+    :type costs: list of lists of numbers
+
+    :param start: The first node.
+    :type start: int
+
+    :param end: The last node. Defaults to None (any node). When equal to
+        start, the path returns to it.
+    :type end: int
+
+    :param time_limit: The maximum number of seconds spent improving the
+        path.
+    :type time_limit: float
+
+    :rtype: list of int, the nodes in the order to visit them, starting
+        with start (and not repeating it for a round trip)
+    """
+    n = len(costs)
+    if not 0 <= start < n or (end is not None and not 0 <= end < n):
+        raise ValueError("start and end must be nodes of the matrix.")
+    deadline = time.monotonic() + time_limit
+
+    # Reduce all cases to a path between two fixed nodes. An open path ends
+    # at an extra node which costs nothing to reach, and a round trip at a
+    # copy of the start.
+    c = [list(row) for row in costs]
+    if end is None:
+        for row in c:
+            row.append(0)
+        c.append([0] * (n + 1))
+        last = n
+    else:
+        last = end
+    nodes = [i for i in range(n) if i != start and i != end]
+
+    path = _nearest_neighbor(c, start, nodes, last)
+    improved = True
+    while improved and time.monotonic() < deadline:
+        improved = _two_opt(c, path, deadline)
+        improved = _or_opt(c, path, deadline) or improved
+
+    if end is None or end == start:
+        path.pop()
+    return path
+
+
+def _nearest_neighbor(c, start, nodes, last):
+    path = [start]
+    remaining = set(nodes)
+    current = start
+    while remaining:
+        row = c[current]
+        current = min(remaining, key=row.__getitem__)
+        remaining.remove(current)
+        path.append(current)
+    path.append(last)
+    return path
+
+
+def _prefix_costs(c, path):
+    """Returns the cumulative costs of traversing path forwards and
+    backwards, so that the cost of a reversed segment is known in O(1)."""
+    forward = [0] * len(path)
+    backward = [0] * len(path)
+    for k in range(1, len(path)):
+        a, b = path[k - 1], path[k]
+        forward[k] = forward[k - 1] + c[a][b]
+        backward[k] = backward[k - 1] + c[b][a]
+    return forward, backward
+
+
+def _two_opt(c, path, deadline):
+    """Reverses segments of path while that makes it cheaper. Returns
+    whether it did."""
+    m = len(path)
+    forward, backward = _prefix_costs(c, path)
+    improved = False
+    i = 1
+    while i < m - 2:
+        if time.monotonic() >= deadline:
+            break
+        a, b = path[i - 1], path[i]
+        row_a, row_b = c[a], c[b]
+        removed_ab = row_a[b]
+        for j in range(i + 1, m - 1):
+            d, e = path[j], path[j + 1]
+            # Replace a->b ... d->e with a->d ... b->e, the inner segment
+            # being traversed backwards.
+            delta = (row_a[d] + row_b[e] - removed_ab - c[d][e] +
+                     (backward[j] - backward[i]) - (forward[j] - forward[i]))
+            if delta < -_EPSILON:
+                path[i:j + 1] = path[i:j + 1][::-1]
+                forward, backward = _prefix_costs(c, path)
+                improved = True
+                break
+        else:
+            i += 1
+    return improved
+
+
+def _or_opt(c, path, deadline):
+    """Moves segments of up to three nodes elsewhere in path while that makes
+    it cheaper. Returns whether it did."""
+    m = len(path)
+    improved = False
+    for length in (1, 2, 3):
+        i = 1
+        while i + length < m:
+            if time.monotonic() >= deadline:
+                return improved
+            first, last = path[i], path[i + length - 1]
+            a, b = path[i - 1], path[i + length]
+            gain = c[a][first] + c[last][b] - c[a][b]
+            row_last = c[last]
+            best, best_k = -_EPSILON, None
+            for k in range(m - 1):
+                if i - 1 <= k < i + length:
+                    continue
+                p, q = path[k], path[k + 1]
+                delta = c[p][first] + row_last[q] - c[p][q] - gain
+                if delta < best:
+                    best, best_k = delta, k
+            if best_k is None:
+                i += 1
+                continue
+            segment = path[i:i + length]
+            del path[i:i + length]
+            k = best_k if best_k < i else best_k - length
+            path[k + 1:k + 1] = segment
+            improved = True
+    return improved
@@ -0,0 +1,209 @@
+#
+# Copyright 2026 Google Inc. All rights reserved.
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+
+"""Client-side rate limiting of requests.
+
+Requests waiting for the rate limit are served by priority: an INTERACTIVE
+request goes ahead of all NORMAL and BATCH requests queued before it, and
+BATCH requests can additionally be limited to a share of the rate, keeping
+headroom for the other lanes.
+
+An adaptive limiter also backs off when the server signals that the client
+is over its quota: the rate is halved on each signal, then recovers
+additively while requests go through (AIMD), so that all threads sharing
+the client converge on the rate the server actually accepts.
+"""
+
+import collections
+import heapq
+import itertools
+import threading
+import time
+
+
+# Priorities, most urgent first.
+INTERACTIVE = 0
+NORMAL = 1
+BATCH = 2
+
+
+class RateLimiter:
+    """Limits requests to a number per sliding window of time. Safe to share
+    between threads."""
+
+    def __init__(self, rate, period=1.0, batch_share=None, adaptive=False,
+                 min_rate=1, decrease=0.5, increase=None):
+        """
+        :param rate: The number of requests allowed per period.
+        :type rate: int
+
+        :param period: The length of the window, in seconds.
+        :type period: float
+
+        :param batch_share: The fraction of the rate BATCH requests may use,
+            between 0 and 1. Defaults to None (all of it, when no more
+            urgent requests are waiting).
+        :type batch_share: float
+
+        :param adaptive: Whether to lower the rate when throttled is called,
+            recovering up to rate over time.
+        :type adaptive: bool
+
+        :param min_rate: The rate adaptive limiting doesn't go below.
+        :type min_rate: float
+
+        :param decrease: The factor the rate is multiplied by when throttled.
+        :type decrease: float
+
+        :param increase: The rate regained per period without throttling.
+            Defaults to 5% of rate.
+        :type increase: float
+        """
+        if batch_share is not None and not 0 < batch_share <= 1:
+            raise ValueError("batch_share must be between 0 and 1.")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1.")
+        self.rate = rate
+        self.period = period
+        self.batch_share = batch_share
+        self.adaptive = adaptive
+        self.min_rate = min(min_rate, rate) if rate else min_rate
+        self.decrease = decrease
+        self.increase = increase or max(1, rate * 0.05)
+        self._effective_rate = float(rate)
+        self._adjusted_at = time.monotonic()
+        self._decreased_at = None
+        self._sent_times = collections.deque()
+        self._waiters = []
+        self._tickets = itertools.count()
+        self._cond = threading.Condition()
+
+    @property
+    def effective_rate(self):
+        """The number of requests currently allowed per period: rate, unless
+        lowered by adaptive limiting.
+
+        :rtype: float
+        """
+        with self._cond:
+            return self._recover(time.monotonic())
+
+    @property
+    def sent_times(self):
+        """The time.monotonic() times at which the requests of the current
+        period were sent, oldest first.
+
+        :rtype: list of floats
+        """
+        with self._cond:
+            now = time.monotonic()
+            return [t for t in self._sent_times if now - t < self.period]
+
+    def _recover(self, now):
+        """Returns the effective rate, after regaining the increase due
+        since the last adjustment."""
+        if self._effective_rate < self.rate:
+            elapsed = now - self._adjusted_at
+            self._effective_rate = min(
+                self.rate,
+                self._effective_rate + self.increase * elapsed / self.period)
+        self._adjusted_at = now
+        return self._effective_rate
+
+    def throttled(self):
+        """Signals that the server rejected a request for exceeding the
+        quota, or is overloaded. Lowers the effective rate when adaptive.
+
+        Signals received within a period of the last decrease are ignored,
+        as they are likely due to requests sent before it.
+        """
+        if not self.adaptive or not self.rate:
+            return
+        with self._cond:
+            now = time.monotonic()
+            if (self._decreased_at is not None and
+                    now - self._decreased_at < self.period):
+                return
+            self._effective_rate = max(self.min_rate,
+                                       self._recover(now) * self.decrease)
+            self._decreased_at = now
+
+    def _limit(self, priority, now):
+        rate = self._recover(now) if self.adaptive else self.rate
+        if priority >= BATCH and self.batch_share is not None:
+            rate *= self.batch_share
+        return max(1, int(rate))
+
+    def acquire(self, priority=NORMAL, timeout=None):
+        """Waits until a request can be sent, and accounts for it.
+
+        :param priority: The priority of the request, e.g. INTERACTIVE.
+            Lower values are served first.
+        :type priority: int
+
+        :param timeout: The maximum number of seconds to wait. Defaults to
+            None (no limit).
+        :type timeout: float
+
+        :rtype: bool, False if the timeout expired first
+        """
+        if not self.rate:
+            return True
+
+        deadline = None
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
+
+        with self._cond:
+            ticket = (priority, next(self._tickets))
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    sent = self._sent_times
+                    while sent and now - sent[0] >= self.period:
+                        sent.popleft()
+
+                    if self._waiters[0] == ticket:
+                        if len(sent) < self._limit(priority, now):
+                            heapq.heappop(self._waiters)
+                            sent.append(now)
+                            # Let the next in line check its turn.
+                            self._cond.notify_all()
+                            return True
+                        # Wait for the oldest request to leave the window.
+                        wait = sent[0] + self.period - now
+                    else:
+                        wait = None
+
+                    if deadline is not None:
+                        if now >= deadline:
+                            self._leave(ticket)
+                            return False
+                        wait = (deadline - now if wait is None
+                                else min(wait, deadline - now))
+                    self._cond.wait(wait)
+            except BaseException:
+                self._leave(ticket)
+                raise
+
+    def _leave(self, ticket):
+        # Called with the lock held.
+        if ticket in self._waiters:
+            self._waiters.remove(ticket)
+            heapq.heapify(self._waiters)
+            self._cond.notify_all()
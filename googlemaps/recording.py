@@ -0,0 +1,303 @@
+#
+# Copyright 2026 Google Inc. All rights reserved.
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+
+"""Records API responses, and replays them without network access.
+
+Record a session against the live APIs:
+
+    client = googlemaps.Client(key=..., cassette="maps.json.gz",
+                               cassette_mode="record")
+    client.geocode("Sydney")
+    client.cassette.save()
+
+Then replay it, e.g. in CI, with any API key:
+
+    client = googlemaps.Client(key="AIzaReplay", cassette="maps.json.gz")
+    client.geocode("Sydney")
+
+Requests are matched on their method, URL path, query string and body,
+leaving out the credentials (key, client and signature parameters). The
+host is left out too, so that a cassette recorded against the live APIs can
+be replayed by a client pointed at another server, and vice versa.
+"""
+
+import base64
+import collections
+import gzip
+import io
+import json
+import threading
+import time
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+try: # Python 3
+    from urllib.parse import parse_qsl, urlsplit, urlencode
+except ImportError: # Python 2
+    from urllib import urlencode
+    from urlparse import parse_qsl, urlsplit
+
+
+_VERSION = 1
+
+# Query parameters that identify the caller rather than the request.
+_CREDENTIAL_PARAMS = frozenset(["key", "client", "signature"])
+
+RECORD = "record"
+REPLAY = "replay"
+
+
+def request_key(method, url, body=None):
+    """Returns the key a request is recorded under: its method, its URL path
+    and sorted query parameters without credentials, and its body.
+
+    :param method: The HTTP method, e.g. "GET".
+    :type method: string
+
+    :param url: The full request URL.
+    :type url: string
+
+    :param body: The request body.
+    :type body: bytes or string
+
+    :rtype: string
+    """
+    _, _, path, query, _ = urlsplit(url)
+    params = sorted((k, v) for k, v in parse_qsl(query, keep_blank_values=True)
+                    if k not in _CREDENTIAL_PARAMS)
+    key = "%s %s" % (method.upper(), path)
+    if params:
+        key += "?" + urlencode(params)
+
+    if body:
+        if isinstance(body, bytes):
+            body = body.decode("utf-8")
+        try:
+            body = json.dumps(json.loads(body), sort_keys=True,
+                              separators=(",", ":"))
+        except ValueError:
+            pass
+        key += " " + body
+
+    return key
+
+
+class Cassette:
+    """A thread-safe archive of recorded responses.
+
+    Each request key maps to the responses recorded for it, in order. On
+    replay they are handed out in the same order, the last one being
+    repeated once they are used up.
+    """
+
+    def __init__(self, path=None):
+        """
+        :param path: The file the cassette is saved to.
+        :type path: string
+        """
+        self.path = path
+        self._interactions = collections.OrderedDict()
+        self._replayed = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        """Reads a cassette saved with save.
+
+        :param path: The cassette file. Gzip compressed unless the name does
+            not end with ".gz".
+        :type path: string
+
+        :raises ValueError: if the file is not a supported cassette.
+        :rtype: googlemaps.recording.Cassette
+        """
+        cassette = cls(path)
+        with _open(path, "rb") as f:
+            document = json.loads(f.read().decode("utf-8"))
+        if document.get("version") != _VERSION:
+            raise ValueError("Unsupported cassette version: %s" %
+                             document.get("version"))
+        for interaction in document["interactions"]:
+            cassette._interactions.setdefault(
+                interaction["request"], []).append(interaction["response"])
+        return cassette
+
+    def save(self, path=None):
+        """Writes the cassette.
+
+        :param path: The file to write. Defaults to the path the cassette
+            was created with.
+        :type path: string
+        """
+        path = path or self.path
+        if path is None:
+            raise ValueError("No path to save the cassette to.")
+        with self._lock:
+            interactions = [{"request": key, "response": response}
+                            for key, responses in self._interactions.items()
+                            for response in responses]
+        document = {"version": _VERSION, "interactions": interactions}
+        with _open(path, "wb") as f:
+            f.write(json.dumps(document, separators=(",", ":"))
+                    .encode("utf-8"))
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(r) for r in self._interactions.values())
+
+    def record(self, key, status_code, headers, content, elapsed):
+        """Adds a response to the cassette.
+
+        :param key: The request key, see request_key.
+        :type key: string
+
+        :param status_code: The HTTP status code.
+        :type status_code: int
+
+        :param headers: The response headers.
+        :type headers: dict
+
+        :param content: The response body.
+        :type content: bytes
+
+        :param elapsed: The seconds it took to receive the response.
+        :type elapsed: float
+        """
+        response = {"status": status_code, "elapsed": round(elapsed, 6)}
+        content_type = headers.get("Content-Type")
+        if content_type:
+            response["content_type"] = content_type
+        try:
+            response["body"] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            response["body_base64"] = base64.b64encode(content).decode("ascii")
+
+        with self._lock:
+            self._interactions.setdefault(key, []).append(response)
+
+    def play(self, key):
+        """Returns the next recorded response to the request key, as a dict
+        with the keys "status", "content_type", "content" and "elapsed", or
+        None if there is no recording of the request.
+        """
+        with self._lock:
+            responses = self._interactions.get(key)
+            if not responses:
+                return None
+            i = self._replayed.get(key, 0)
+            self._replayed[key] = i + 1
+            response = responses[min(i, len(responses) - 1)]
+
+        if "body_base64" in response:
+            content = base64.b64decode(response["body_base64"])
+        else:
+            content = response.get("body", "").encode("utf-8")
+        return {
+            "status": response["status"],
+            "content_type": response.get("content_type"),
+            "content": content,
+            "elapsed": response.get("elapsed", 0),
+        }
+
+    def rewind(self):
+        """Replays all responses from the start again."""
+        with self._lock:
+            self._replayed.clear()
+
+
+def _open(path, mode):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode)
+    return open(path, mode)
+
+
+class RecordingAdapter(BaseAdapter):
+    """A transport adapter recording the responses of another adapter."""
+
+    def __init__(self, adapter, cassette):
+        """
+        :param adapter: The adapter actually sending requests.
+        :type adapter: requests.adapters.BaseAdapter
+
+        :param cassette: The cassette to record to.
+        :type cassette: googlemaps.recording.Cassette
+        """
+        super(RecordingAdapter, self).__init__()
+        self.adapter = adapter
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        start = time.monotonic()
+        response = self.adapter.send(request, **kwargs)
+        # Reading the body here also buffers streamed responses, which are
+        # then read from memory.
+        content = response.content
+        self.cassette.record(request_key(request.method, request.url,
+                                         request.body),
+                             response.status_code, response.headers, content,
+                             time.monotonic() - start)
+        return response
+
+    def close(self):
+        self.adapter.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """A transport adapter answering requests from a cassette, without any
+    network access."""
+
+    def __init__(self, cassette, speed=None):
+        """
+        :param cassette: The cassette to replay.
+        :type cassette: googlemaps.recording.Cassette
+
+        :param speed: When set, responses are delayed by the time they took
+            when recorded, divided by speed (e.g. 1.0 for the original
+            timing, 2.0 for twice as fast). Defaults to None (no delay).
+        :type speed: float
+        """
+        super(ReplayAdapter, self).__init__()
+        self.cassette = cassette
+        self.speed = speed
+
+    def send(self, request, **kwargs):
+        key = request_key(request.method, request.url, request.body)
+        recorded = self.cassette.play(key)
+        if recorded is None:
+            raise requests.exceptions.ConnectionError(
+                "No recorded response for %s" % key, request=request)
+
+        if self.speed:
+            time.sleep(recorded["elapsed"] / self.speed)
+
+        response = requests.Response()
+        response.status_code = recorded["status"]
+        response.headers = CaseInsensitiveDict()
+        if recorded["content_type"]:
+            response.headers["Content-Type"] = recorded["content_type"]
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = io.BytesIO(recorded["content"])
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
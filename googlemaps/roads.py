@@ -17,14 +17,20 @@
 
 """Performs requests to the Google Maps Roads API."""
 
+import logging
+
 import googlemaps
 from googlemaps import convert
+from googlemaps import decoder
+
+logger = logging.getLogger(__name__)
 
 
 _ROADS_BASE_URL = "https://roads.googleapis.com"
 
 
-def snap_to_roads(client, path, interpolate=False):
+def snap_to_roads(client, path, interpolate=False, max_points=None,
+                  max_length=None, return_deviation=False):
     """Snaps a path to the most likely roads travelled.
 
     Takes up to 100 GPS points collected along a route, and returns a similar
@@ -33,7 +39,7 @@ def snap_to_roads(client, path, interpolate=False):
 
     :param path: The path to be snapped.
     :type path: a single location, or a list of locations, where a
-        location is a string, dict, list, or tuple
+        location is a string, dict, list, or tuple, or a LatLngArray
 
     :param interpolate: Whether to interpolate a path to include all points
         forming the full road-geometry. When true, additional interpolated
@@ -42,18 +48,49 @@ def snap_to_roads(client, path, interpolate=False):
         Interpolated paths may contain more points than the original path.
     :type interpolate: bool
 
-    :rtype: A list of snapped points.
-    """
+    :param max_points: When set, the path is simplified to at most this many
+        points, e.g. 100, the most the API accepts. See
+        convert.simplify_polyline.
+    :type max_points: int
 
-    params = {"path": convert.location_list(path)}
+    :param max_length: When set, the path is simplified until the full
+        request URL fits in this many characters.
+    :type max_length: int
+
+    :param return_deviation: Whether to also return how far, in meters, the
+        simplified path deviates from the path given.
+    :type return_deviation: bool
 
+    :rtype: A list of snapped points, or a tuple of the list and the
+        deviation if return_deviation is set.
+    """
+
+    params = {}
     if interpolate:
         params["interpolate"] = "true"
 
-    return client._request("/v1/snapToRoads", params,
-                       base_url=_ROADS_BASE_URL,
-                       accepts_clientid=False,
-                       extract_body=_roads_extract).get("snappedPoints", [])
+    deviation = 0.0
+    if max_points or max_length:
+        if max_length:
+            max_length -= client._url_length(
+                "/v1/snapToRoads", dict(params, path=""),
+                base_url=_ROADS_BASE_URL, accepts_clientid=False)
+        path, deviation = convert.simplify_polyline(
+            path, max_points=max_points,
+            max_length=max_length, encoded=False)
+        logger.debug("Simplified path to %d points, deviating by up to "
+                     "%.1f meters", len(path), deviation)
+
+    params["path"] = convert.location_list(path)
+
+    results = client._request("/v1/snapToRoads", params,
+                              base_url=_ROADS_BASE_URL,
+                              accepts_clientid=False,
+                              extract_body=_roads_extract).get(
+                                  "snappedPoints", [])
+    if return_deviation:
+        return results, deviation
+    return results
 
 def nearest_roads(client, points):
     """Find the closest road segments for each point
@@ -65,7 +102,7 @@ def nearest_roads(client, points):
     :param points: The points for which the nearest road segments are to be
         located.
     :type points: a single location, or a list of locations, where a
-        location is a string, dict, list, or tuple
+        location is a string, dict, list, or tuple, or a LatLngArray
 
     :rtype: A list of snapped points.
     """
@@ -103,7 +140,7 @@ def snapped_speed_limits(client, path):
 
     :param path: The path of points to be snapped.
     :type path: a single location, or a list of locations, where a
-        location is a string, dict, list, or tuple
+        location is a string, dict, list, or tuple, or a LatLngArray
 
     :rtype: dict with a list of speed limits and a list of the snapped points.
     """
@@ -120,7 +157,7 @@ def _roads_extract(resp):
     """Extracts a result from a Roads API HTTP response."""
 
     try:
-        j = resp.json()
+        j = decoder.json_body(resp)
     except:
         if resp.status_code != 200:
             raise googlemaps.exceptions.HTTPError(resp.status_code)
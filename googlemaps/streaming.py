@@ -0,0 +1,278 @@
+#
+# Copyright 2026 Google Inc. All rights reserved.
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+
+"""Incremental parsing of large JSON responses.
+
+Large responses (e.g. distance matrix rows or directions routes) can be
+consumed while they download: the elements of one top-level array are
+decoded and handed out as soon as each of them is complete, so that only
+one element has to be held in memory at a time.
+"""
+
+from datetime import datetime
+import re
+
+import googlemaps
+from googlemaps import decoder
+
+
+_CHUNK_SIZE = 64 * 1024
+
+_QUOTE = ord('"')
+_BACKSLASH = ord("\\")
+_OPEN = frozenset(b"[{")
+_CLOSE = frozenset(b"]}")
+_COMMA = ord(",")
+_OPEN_ARRAY = ord("[")
+
+_STRUCTURAL = re.compile(rb'["\[\]{},]')
+_STRING_SPECIAL = re.compile(rb'["\\]')
+
+
+class JSONArrayStream:
+    """Incrementally scans a JSON object, decoding the elements of one of its
+    top-level arrays as they become available.
+
+    For example:
+
+        stream = JSONArrayStream("rows")
+        for chunk in chunks:
+            for row in stream.feed(chunk):
+                process(row)
+        body = stream.close()
+        # body is the rest of the object, with "rows" left empty.
+    """
+
+    def __init__(self, key):
+        """
+        :param key: The name of the top-level array to stream.
+        :type key: string
+        """
+        self.key = key.encode("utf-8")
+        self._buf = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._string_start = 0
+        self._last_string = None
+        self._in_array = False
+        self._element_start = 0
+        # The document with the streamed array elements left out.
+        self._rest = bytearray()
+        self._rest_start = 0
+
+    def feed(self, chunk):
+        """Adds the next chunk of the document.
+
+        :param chunk: The next bytes of the document.
+        :type chunk: bytes
+
+        :raises ValueError: if a complete element is not valid JSON.
+        :rtype: list of the elements completed by this chunk
+        """
+        buf = self._buf
+        buf += chunk
+        elements = []
+        pos = self._pos
+
+        while pos < len(buf):
+            if self._in_string:
+                m = _STRING_SPECIAL.search(buf, pos)
+                if m is None:
+                    pos = len(buf)
+                    break
+                i = m.start()
+                if buf[i] == _BACKSLASH:
+                    if i + 1 == len(buf):
+                        # The escaped character is in the next chunk.
+                        pos = i
+                        break
+                    pos = i + 2
+                    continue
+                self._in_string = False
+                if self._depth == 1:
+                    self._last_string = bytes(buf[self._string_start:i])
+                pos = i + 1
+                continue
+
+            m = _STRUCTURAL.search(buf, pos)
+            if m is None:
+                pos = len(buf)
+                break
+            i = m.start()
+            c = buf[i]
+            pos = i + 1
+
+            if c == _QUOTE:
+                self._in_string = True
+                self._string_start = pos
+            elif c in _OPEN:
+                self._depth += 1
+                if (c == _OPEN_ARRAY and self._depth == 2 and
+                        self._last_string == self.key):
+                    self._in_array = True
+                    self._rest += buf[self._rest_start:pos]
+                    self._element_start = pos
+            elif c in _CLOSE:
+                if self._in_array and self._depth == 2:
+                    self._emit(buf, i, elements)
+                    self._in_array = False
+                    self._rest_start = i
+                self._depth -= 1
+            elif c == _COMMA and self._in_array and self._depth == 2:
+                self._emit(buf, i, elements)
+                self._element_start = pos
+
+        # Drop the bytes that are no longer needed.
+        if self._in_array:
+            keep = self._element_start
+        else:
+            self._rest += buf[self._rest_start:pos]
+            keep = pos
+            if self._in_string and self._depth == 1:
+                keep = min(keep, self._string_start)
+            self._string_start -= keep
+            self._rest_start = pos - keep
+        if self._in_array:
+            self._element_start -= keep
+        del buf[:keep]
+        self._pos = pos - keep
+
+        return elements
+
+    def _emit(self, buf, end, elements):
+        element = bytes(buf[self._element_start:end])
+        if element.strip():
+            elements.append(decoder.loads(element))
+
+    def close(self):
+        """Signals the end of the document.
+
+        :raises ValueError: if the document is truncated or not valid JSON.
+        :rtype: the decoded document, with the streamed array left empty
+        """
+        if self._depth != 0 or self._in_string:
+            raise ValueError("Truncated JSON document.")
+        return decoder.loads(bytes(self._rest))
+
+
+def stream_extract(response):
+    """An extract_body function for requests whose body is streamed. Checks
+    the HTTP status, leaving the body unread.
+    """
+    if response.status_code != 200:
+        response.close()
+        raise googlemaps.exceptions.HTTPError(response.status_code)
+    return response
+
+
+def iter_response(response, key, chunk_size=_CHUNK_SIZE):
+    """Yields the elements of the top-level array key of a Maps API JSON
+    response while it downloads.
+
+    :param response: A response requested with stream=True.
+    :type response: requests.Response
+
+    :param key: The name of the top-level array to stream.
+    :type key: string
+
+    :param chunk_size: The number of bytes to read at a time.
+    :type chunk_size: int
+
+    :raises ApiError: when the API returns an error status.
+    """
+    stream = JSONArrayStream(key)
+    try:
+        for chunk in response.iter_content(chunk_size):
+            for element in stream.feed(chunk):
+                yield element
+        body = stream.close()
+    finally:
+        response.close()
+
+    api_status = body.get("status")
+    if api_status not in ("OK", "ZERO_RESULTS"):
+        if api_status == "OVER_QUERY_LIMIT":
+            raise googlemaps.exceptions._OverQueryLimit(
+                api_status, body.get("error_message"))
+        raise googlemaps.exceptions.ApiError(api_status,
+                                             body.get("error_message"))
+
+
+def stream(client, url, params, key):
+    """Performs a GET request, returning an iterator over the elements of the
+    top-level array key of the response, which are decoded as they download.
+
+    Errors are reported with the status of the response, which the API sends
+    after the (then empty) array. Requests rejected for exceeding the query
+    limit are retried without streaming, unless retry_over_query_limit is
+    off.
+
+    :param url: URL path for the request. Should begin with a slash.
+    :type url: string
+
+    :param params: HTTP GET parameters.
+    :type params: dict
+
+    :param key: The name of the top-level array to stream.
+    :type key: string
+
+    :rtype: iterator
+    """
+    # The request is sent right away, rather than on first iteration, so
+    # that it is made with the client state of this call. The priority and
+    # deadline of the call are kept for the fallback request, as they are
+    # reset when the API method returns.
+    first_request_time = datetime.now()
+    priority = getattr(client._local, "priority", None)
+    deadline = getattr(client._local, "deadline", None)
+    response = client._request(url, params,
+                               first_request_time=first_request_time,
+                               extract_body=stream_extract,
+                               requests_kwargs={"stream": True})
+    extra_params = getattr(client, "_extra_params", None) or {}
+    return _iter_with_retry(client, response, url,
+                            dict(extra_params, **params), key,
+                            first_request_time, priority, deadline)
+
+
+def _iter_with_retry(client, response, url, params, key, first_request_time,
+                     priority, deadline):
+    count = 0
+    try:
+        for element in iter_response(response, key):
+            count += 1
+            yield element
+    except googlemaps.exceptions._OverQueryLimit:
+        if count or not client.retry_over_query_limit:
+            raise
+        client.rate_limiter.throttled()
+        local = client._local
+        outer_priority = getattr(local, "priority", None)
+        outer_deadline = getattr(local, "deadline", None)
+        local.priority = priority
+        local.deadline = deadline
+        try:
+            # As a retry of the streamed request, backing off as _request
+            # does.
+            body = client._request(url, params, first_request_time,
+                                   retry_counter=1)
+        finally:
+            local.priority = outer_priority
+            local.deadline = outer_deadline
+        for element in body.get(key, []):
+            yield element
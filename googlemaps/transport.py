@@ -0,0 +1,493 @@
+#
+# Copyright 2026 Google Inc. All rights reserved.
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+
+"""HTTP connection handling for the Google Maps client.
+
+Requests are sent through a Transport. The default, RequestsTransport, uses
+a requests.Session; HTTP2Transport multiplexes concurrent requests over a
+single HTTP/2 connection per host, and requires httpx (pip install
+"httpx[http2]").
+"""
+
+import functools
+import socket
+import threading
+import time
+
+import requests
+
+import googlemaps
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+from requests.adapters import HTTPAdapter
+from requests.adapters import DEFAULT_POOLBLOCK
+from requests.adapters import DEFAULT_POOLSIZE
+from urllib3.connection import HTTPConnection
+from urllib3.connection import HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.connectionpool import HTTPSConnectionPool
+
+
+class DNSCache:
+    """A thread-safe, in-process cache of host name resolutions."""
+
+    def __init__(self, ttl=300):
+        """
+        :param ttl: Number of seconds a resolved address is reused for.
+        :type ttl: int
+        """
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, host, port):
+        """Returns the address to connect to for host and port, resolving
+        it only when there is no unexpired entry in the cache.
+
+        :raises socket.gaierror: if the host name cannot be resolved.
+        :rtype: string
+        """
+        key = (host, port)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+
+        infos = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        address = infos[0][4][0]
+        with self._lock:
+            self._entries[key] = (now + self.ttl, address)
+        return address
+
+    def clear(self):
+        """Drops all cached resolutions."""
+        with self._lock:
+            self._entries.clear()
+
+
+class _CachedDNSMixin:
+    """Resolves the host through a DNSCache each time the connection opens a
+    socket, including when a pooled connection reconnects."""
+
+    def __init__(self, *args, **kwargs):
+        self.dns_cache = kwargs.pop("dns_cache")
+        super(_CachedDNSMixin, self).__init__(*args, **kwargs)
+
+    def _new_conn(self):
+        host = self._dns_host
+        try:
+            address = self.dns_cache.resolve(host, self.port)
+        except socket.gaierror:
+            # Leave resolution to the connection, so that the error
+            # surfaces when actually connecting.
+            return super(_CachedDNSMixin, self)._new_conn()
+        # Only the socket connects to the address: TLS and the Host header
+        # still use the host name.
+        self._dns_host = address
+        try:
+            return super(_CachedDNSMixin, self)._new_conn()
+        finally:
+            self._dns_host = host
+
+
+class _CachedDNSHTTPConnection(_CachedDNSMixin, HTTPConnection):
+    pass
+
+
+class _CachedDNSHTTPSConnection(_CachedDNSMixin, HTTPSConnection):
+    pass
+
+
+class _PoolMixin:
+    """Counts connections discarded because the pool was already full, and
+    resolves hosts through a DNSCache when one is given."""
+
+    num_discarded = 0
+    _CachedDNSConnectionCls = None
+
+    def __init__(self, *args, **kwargs):
+        self.dns_cache = kwargs.pop("dns_cache", None)
+        super(_PoolMixin, self).__init__(*args, **kwargs)
+        # Proxied connections resolve the proxy host, not ours.
+        if self.dns_cache is not None and self.proxy is None:
+            self.ConnectionCls = self._CachedDNSConnectionCls
+            self.conn_kw = dict(self.conn_kw, dns_cache=self.dns_cache)
+
+    def _put_conn(self, conn):
+        if conn is not None and self.pool is not None and self.pool.full():
+            self.num_discarded += 1
+        super(_PoolMixin, self)._put_conn(conn)
+
+
+class _HTTPConnectionPool(_PoolMixin, HTTPConnectionPool):
+    _CachedDNSConnectionCls = _CachedDNSHTTPConnection
+
+
+class _HTTPSConnectionPool(_PoolMixin, HTTPSConnectionPool):
+    _CachedDNSConnectionCls = _CachedDNSHTTPSConnection
+
+
+def socket_options(tcp_nodelay=True, tcp_keepalive=None):
+    """Builds the socket options applied to new connections.
+
+    :param tcp_nodelay: Whether to disable Nagle's algorithm.
+    :type tcp_nodelay: bool
+
+    :param tcp_keepalive: Idle time in seconds before TCP keep-alive probes
+        are sent. None leaves keep-alive probes disabled.
+    :type tcp_keepalive: int
+
+    :rtype: list of (level, option, value) tuples
+    """
+    options = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1 if tcp_nodelay else 0)]
+
+    if tcp_keepalive:
+        options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+        # NOTE: the finer grained keep-alive knobs are not available on
+        # every platform (e.g. macOS and Windows).
+        if hasattr(socket, "TCP_KEEPIDLE"):
+            options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE,
+                            int(tcp_keepalive)))
+        if hasattr(socket, "TCP_KEEPINTVL"):
+            options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL,
+                            max(1, int(tcp_keepalive) // 3)))
+
+    return options
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """A requests transport adapter with tunable connection pooling.
+
+    The client mounts one adapter per API base URL, so that each service
+    (e.g. maps.googleapis.com and roads.googleapis.com) gets its own pool of
+    persistent connections.
+    """
+
+    def __init__(self, pool_connections=None, pool_maxsize=None,
+                 pool_block=None, tcp_nodelay=None, tcp_keepalive=None,
+                 dns_cache=None, **kwargs):
+        """
+        :param pool_connections: The number of host pools to cache.
+        :type pool_connections: int
+
+        :param pool_maxsize: The maximum number of connections kept open
+            per host pool.
+        :type pool_maxsize: int
+
+        :param pool_block: Whether to block when no free connections are
+            available, rather than opening (and later discarding) extra
+            connections.
+        :type pool_block: bool
+
+        :param tcp_nodelay: Whether to set TCP_NODELAY on new connections.
+            Defaults to True.
+        :type tcp_nodelay: bool
+
+        :param tcp_keepalive: Idle time in seconds before TCP keep-alive
+            probes are sent. Defaults to None (disabled).
+        :type tcp_keepalive: int
+
+        :param dns_cache: Cache used to resolve host names of new
+            connections. Defaults to None (resolve on every connection).
+        :type dns_cache: googlemaps.transport.DNSCache
+        """
+        self.dns_cache = dns_cache
+        self._socket_options = socket_options(
+            tcp_nodelay=True if tcp_nodelay is None else tcp_nodelay,
+            tcp_keepalive=tcp_keepalive)
+
+        super(PooledHTTPAdapter, self).__init__(
+            pool_connections=pool_connections or DEFAULT_POOLSIZE,
+            pool_maxsize=pool_maxsize or DEFAULT_POOLSIZE,
+            pool_block=DEFAULT_POOLBLOCK if pool_block is None else pool_block,
+            **kwargs)
+
+    def __getstate__(self):
+        state = super(PooledHTTPAdapter, self).__getstate__()
+        state["_socket_options"] = self._socket_options
+        state["dns_cache"] = self.dns_cache
+        return state
+
+    def init_poolmanager(self, connections, maxsize, block=DEFAULT_POOLBLOCK,
+                         **pool_kwargs):
+        pool_kwargs.setdefault("socket_options", self._socket_options)
+        super(PooledHTTPAdapter, self).init_poolmanager(
+            connections, maxsize, block=block, **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": functools.partial(_HTTPConnectionPool,
+                                      dns_cache=self.dns_cache),
+            "https": functools.partial(_HTTPSConnectionPool,
+                                       dns_cache=self.dns_cache),
+        }
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        proxy_kwargs.setdefault("socket_options", self._socket_options)
+        return super(PooledHTTPAdapter, self).proxy_manager_for(
+            proxy, **proxy_kwargs)
+
+    def warmup(self, url, connections=1, verify=True, cert=None):
+        """Opens connections to the host of url ahead of the first request,
+        and parks them in the pool for reuse.
+
+        :param url: A URL on the host to connect to.
+        :type url: string
+
+        :param connections: The number of connections to open. Capped at
+            the pool's maxsize.
+        :type connections: int
+
+        :param verify: The TLS verification setting requests will be sent
+            with, as connections are pooled per TLS settings.
+        :type verify: bool or string
+
+        :param cert: The client certificate requests will be sent with.
+        :type cert: string or tuple
+
+        :rtype: int, the number of connections now ready in the pool
+        """
+        pool = self._pool_for(url, verify, cert)
+        conns = []
+        try:
+            for _ in range(min(connections, self._pool_maxsize)):
+                conn = pool._get_conn()
+                conns.append(conn)
+                if getattr(conn, "sock", None) is None:
+                    conn.connect()
+        finally:
+            for conn in conns:
+                pool._put_conn(conn)
+        return len(conns)
+
+    def _pool_for(self, url, verify, cert):
+        """Returns the connection pool requests to url will be sent on."""
+        if not hasattr(self, "get_connection_with_tls_context"):
+            # requests < 2.32
+            return self.get_connection(url)
+        request = requests.Request("GET", url).prepare()
+        return self.get_connection_with_tls_context(request, verify, cert=cert)
+
+    def pool_stats(self):
+        """Returns utilization counters for the host pools of this adapter.
+
+        :rtype: dict with the keys "pools", "maxsize", "connections" (opened
+            so far), "requests" (sent so far), "idle" (connections waiting to
+            be reused) and "discarded" (connections closed because the pool
+            was full).
+        """
+        stats = {
+            "pools": 0,
+            "maxsize": self._pool_maxsize,
+            "connections": 0,
+            "requests": 0,
+            "idle": 0,
+            "discarded": 0,
+        }
+
+        pools = self.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            stats["pools"] += 1
+            stats["connections"] += pool.num_connections
+            stats["requests"] += pool.num_requests
+            stats["discarded"] += getattr(pool, "num_discarded", 0)
+            if pool.pool is not None:
+                stats["idle"] += sum(1 for conn in list(pool.pool.queue)
+                                     if conn is not None)
+
+        return stats
+
+
+class Transport:
+    """Sends the HTTP requests of a Client.
+
+    Implementations return response objects with at least the attributes
+    status_code, headers and content, and the methods iter_content(chunk_size)
+    and close(), as requests.Response does.
+    """
+
+    def send(self, method, url, headers=None, body=None, timeout=None,
+             stream=False, **kwargs):
+        """Sends a request.
+
+        :param method: "GET" or "POST".
+        :type method: string
+
+        :param url: The full URL, including the query string.
+        :type url: string
+
+        :param headers: The request headers.
+        :type headers: dict
+
+        :param body: The request body.
+        :type body: bytes
+
+        :param timeout: A combined timeout, or a (connect, read) tuple of
+            timeouts, in seconds. None for no timeout.
+        :type timeout: float or tuple
+
+        :param stream: Whether the body should be left to be read by
+            iter_content, rather than downloaded right away.
+        :type stream: bool
+
+        :param kwargs: Other requests_kwargs of the client. Transports
+            ignore the ones they don't support.
+
+        :raises googlemaps.exceptions.Timeout: if the request timed out.
+        :rtype: response
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Releases the connections of the transport."""
+        pass
+
+
+class RequestsTransport(Transport):
+    """Sends requests with a requests.Session."""
+
+    def __init__(self, session=None):
+        """
+        :param session: The session to send requests with.
+        :type session: requests.Session
+        """
+        self.session = session or requests.Session()
+
+    def send(self, method, url, headers=None, body=None, timeout=None,
+             stream=False, **kwargs):
+        try:
+            return self.session.request(method, url, headers=headers,
+                                        data=body, timeout=timeout,
+                                        stream=stream, **kwargs)
+        except requests.exceptions.Timeout:
+            raise googlemaps.exceptions.Timeout()
+
+    def close(self):
+        self.session.close()
+
+
+class _HTTPXResponse:
+    """Adapts an httpx.Response to the interface of requests.Response."""
+
+    def __init__(self, response):
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+
+    @property
+    def content(self):
+        return self._response.read()
+
+    def iter_content(self, chunk_size=1):
+        return self._response.iter_bytes(chunk_size)
+
+    def close(self):
+        self._response.close()
+
+
+class HTTP2Transport(Transport):
+    """Sends requests over HTTP/2, multiplexing the requests of all threads
+    sharing the client over one connection per host.
+
+    The verify, cert and proxies requests_kwargs are honoured, requests
+    with other TLS or proxy settings than the transport's going through
+    connections of their own.
+
+    Requires httpx with HTTP/2 support: pip install "httpx[http2]".
+    """
+
+    def __init__(self, verify=True, cert=None, proxy=None,
+                 max_connections=None):
+        """
+        :param verify: TLS verification: True, False, or the path to a CA
+            bundle.
+        :type verify: bool or string
+
+        :param cert: The client certificate.
+        :type cert: string or tuple
+
+        :param proxy: The URL of the proxy to send requests through.
+        :type proxy: string
+
+        :param max_connections: The maximum number of connections, across
+            all hosts, for each combination of settings. Defaults to None
+            (no limit).
+        :type max_connections: int
+        """
+        if httpx is None:
+            raise ImportError("HTTP2Transport requires httpx: "
+                              "pip install \"httpx[http2]\"")
+        self.verify = verify
+        self.cert = _hashable(cert)
+        self.proxy = proxy
+        self._limits = httpx.Limits(max_connections=max_connections)
+        # httpx clients by (verify, cert, proxy), as httpx only takes these
+        # settings per client.
+        self._clients = {}
+        self._lock = threading.Lock()
+        self.client = self._client(self.verify, self.cert, self.proxy)
+
+    def _client(self, verify, cert, proxy):
+        key = (verify, cert, proxy)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                kwargs = {}
+                if proxy is not None:
+                    kwargs["proxy"] = proxy
+                client = httpx.Client(http2=True, verify=verify, cert=cert,
+                                      limits=self._limits, **kwargs)
+                self._clients[key] = client
+            return client
+
+    def send(self, method, url, headers=None, body=None, timeout=None,
+             stream=False, verify=None, cert=None, proxies=None, **kwargs):
+        if isinstance(timeout, tuple):
+            timeout = httpx.Timeout(None, connect=timeout[0],
+                                    read=timeout[1])
+        proxy = self.proxy
+        if proxies:
+            proxy = requests.utils.select_proxy(url, proxies) or proxy
+        client = self._client(self.verify if verify is None else verify,
+                              self.cert if cert is None else _hashable(cert),
+                              proxy)
+        request = client.build_request(method, url, headers=headers,
+                                       content=body, timeout=timeout)
+        try:
+            response = client.send(request, stream=stream)
+        except httpx.TimeoutException:
+            raise googlemaps.exceptions.Timeout()
+        return _HTTPXResponse(response)
+
+    def close(self):
+        with self._lock:
+            clients = list(self._clients.values())
+        for client in clients:
+            client.close()
+
+
+def _hashable(cert):
+    # requests accepts a (cert, key) list as well as a tuple.
+    return tuple(cert) if isinstance(cert, list) else cert
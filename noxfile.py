@@ -79,3 +79,10 @@ def docs(session):
 def distribution(session):
     session.run("bash", ".github/scripts/distribution.sh", external=True)
     session.run("python", "-c", "import googlemaps")
+
+
+@nox.session(python="3.10")
+def benchmarks(session):
+    """Runs the benchmarks, appending the results to .benchmarks/."""
+    _install_dev_packages(session)
+    session.run("python", "-m", "benchmarks.run", *session.posargs)
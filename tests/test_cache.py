@@ -0,0 +1,65 @@
+#
+# Copyright 2026 Google Inc. All rights reserved.
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+
+"""Tests for the cache module."""
+
+import time
+
+from googlemaps import cache
+from . import TestCase
+
+
+class ResponseCacheTest(TestCase):
+    def test_get_and_set(self):
+        c = cache.ResponseCache(60)
+        self.assertIsNone(c.get("a"))
+        c.set("a", {"status": "OK"})
+        self.assertEqual({"status": "OK"}, c.get("a"))
+        self.assertEqual(1, c.hits)
+        self.assertEqual(1, c.misses)
+
+        c.clear()
+        self.assertEqual(0, len(c))
+
+    def test_expiry(self):
+        c = cache.ResponseCache(0.05)
+        c.set("a", 1)
+        time.sleep(0.1)
+        self.assertIsNone(c.get("a"))
+        self.assertEqual(0, len(c))
+
+    def test_lru(self):
+        c = cache.ResponseCache(60, max_size=2)
+        c.set("a", 1)
+        c.set("b", 2)
+        c.get("a")
+        c.set("c", 3)
+
+        self.assertEqual(1, c.get("a"))
+        self.assertIsNone(c.get("b"))
+        self.assertEqual(3, c.get("c"))
+
+    def test_copies(self):
+        c = cache.ResponseCache(60)
+        result = {"results": [{"place_id": "a"}]}
+        c.set("a", result)
+        result["results"].append({"place_id": "b"})
+
+        cached = c.get("a")
+        self.assertEqual({"results": [{"place_id": "a"}]}, cached)
+        cached["results"][0]["place_id"] = "c"
+        self.assertEqual({"results": [{"place_id": "a"}]}, c.get("a"))
@@ -0,0 +1,181 @@
+#
+# Copyright 2026 Google Inc. All rights reserved.
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+
+"""Tests for the circuitbreaker module."""
+
+import pickle
+import time
+from unittest import mock
+
+import googlemaps
+from googlemaps import circuitbreaker
+from googlemaps.fakeserver import FakeMapsServer
+from . import TestCase
+
+
+class CircuitBreakerTest(TestCase):
+    def setUp(self):
+        self.transitions = []
+
+    def _on_state_change(self, *transition):
+        self.transitions.append(transition)
+
+    def test_state_machine(self):
+        breaker = circuitbreaker.CircuitBreaker(
+            "roads", failure_threshold=3, reset_timeout=0.1,
+            on_state_change=self._on_state_change,
+        )
+
+        for _ in range(2):
+            breaker.before_request()
+            breaker.record_failure()
+        breaker.before_request()
+        breaker.record_success()
+        self.assertEqual(circuitbreaker.CLOSED, breaker.state)
+
+        for _ in range(3):
+            breaker.before_request()
+            breaker.record_failure()
+        self.assertEqual(circuitbreaker.OPEN, breaker.state)
+        with self.assertRaises(googlemaps.exceptions.CircuitOpenError) as e:
+            breaker.before_request()
+        self.assertEqual("roads", e.exception.endpoint)
+        self.assertTrue(0 < e.exception.retry_after <= 0.1)
+        self.assertIsInstance(e.exception, googlemaps.exceptions.TransportError)
+        error = pickle.loads(pickle.dumps(e.exception))
+        self.assertEqual(("roads", e.exception.retry_after),
+                         (error.endpoint, error.retry_after))
+        self.assertEqual(str(e.exception), str(error))
+
+        # One probe at a time.
+        time.sleep(0.1)
+        breaker.before_request()
+        self.assertEqual(circuitbreaker.HALF_OPEN, breaker.state)
+        with self.assertRaises(googlemaps.exceptions.CircuitOpenError):
+            breaker.before_request()
+        breaker.record_failure()
+        self.assertEqual(circuitbreaker.OPEN, breaker.state)
+
+        time.sleep(0.1)
+        breaker.before_request()
+        breaker.record_success()
+        self.assertEqual(circuitbreaker.CLOSED, breaker.state)
+
+        self.assertEqual(
+            [
+                ("roads", circuitbreaker.CLOSED, circuitbreaker.OPEN),
+                ("roads", circuitbreaker.OPEN, circuitbreaker.HALF_OPEN),
+                ("roads", circuitbreaker.HALF_OPEN, circuitbreaker.OPEN),
+                ("roads", circuitbreaker.OPEN, circuitbreaker.HALF_OPEN),
+                ("roads", circuitbreaker.HALF_OPEN, circuitbreaker.CLOSED),
+            ],
+            self.transitions,
+        )
+
+    def test_client(self):
+        with FakeMapsServer() as server:
+            client = server.client(
+                circuit_breaker_threshold=2,
+                circuit_breaker_timeout=10,
+                hooks={"circuit_breaker": self._on_state_change},
+            )
+            endpoint = (
+                server.base_url_overrides[googlemaps.roads._ROADS_BASE_URL]
+                + "/v1/snapToRoads"
+            )
+
+            server.inject("server_error", count=2)
+            with self.assertRaises(googlemaps.exceptions.CircuitOpenError):
+                client.snap_to_roads([(0, 0)])
+            self.assertEqual(2, len(server.requests))
+
+            # Fails fast, without reaching the server.
+            start = time.time()
+            with self.assertRaises(googlemaps.exceptions.CircuitOpenError):
+                client.snap_to_roads([(0, 0)])
+            self.assertLess(time.time() - start, 0.1)
+            self.assertEqual(2, len(server.requests))
+
+            # Other endpoints are unaffected.
+            client.nearest_roads([(0, 0)])
+            client.geocode("Sydney")
+
+            client.circuit_breakers[endpoint].reset_timeout = 0.1
+            time.sleep(0.1)
+            client.snap_to_roads([(0, 0)])
+
+            self.assertEqual(
+                [
+                    (endpoint, circuitbreaker.CLOSED, circuitbreaker.OPEN),
+                    (endpoint, circuitbreaker.OPEN, circuitbreaker.HALF_OPEN),
+                    (endpoint, circuitbreaker.HALF_OPEN, circuitbreaker.CLOSED),
+                ],
+                self.transitions,
+            )
+
+    def test_probe_timed_out_by_rate_limit(self):
+        with FakeMapsServer() as server:
+            client = server.client(
+                circuit_breaker_threshold=1,
+                circuit_breaker_timeout=10,
+                queries_per_second=1,
+                queries_per_minute=None,
+            )
+            server.inject("server_error", count=1)
+            with self.assertRaises(googlemaps.exceptions.CircuitOpenError):
+                client.snap_to_roads([(0, 0)])
+            breaker = list(client.circuit_breakers.values())[0]
+            breaker.reset_timeout = 0.1
+
+            # The breaker would let a probe through, but the rate limit
+            # doesn't within the deadline.
+            time.sleep(0.15)
+            with self.assertRaises(googlemaps.exceptions.Timeout):
+                client.snap_to_roads([(0, 0)], deadline=0.1)
+
+            time.sleep(1)
+            client.snap_to_roads([(0, 0)])
+            self.assertEqual(circuitbreaker.CLOSED, breaker.state)
+
+    def test_open_circuit_skips_rate_limit(self):
+        with FakeMapsServer() as server:
+            client = server.client(
+                circuit_breaker_threshold=1,
+                circuit_breaker_timeout=10,
+                queries_per_second=2,
+                queries_per_minute=None,
+            )
+            server.inject("server_error", count=1)
+            with self.assertRaises(googlemaps.exceptions.CircuitOpenError):
+                client.snap_to_roads([(0, 0)])
+
+            # Fails without waiting for, or using up, the rate limit.
+            with mock.patch.object(client.rate_limiter, "acquire") as acquire:
+                start = time.time()
+                for _ in range(6):
+                    with self.assertRaises(
+                            googlemaps.exceptions.CircuitOpenError):
+                        client.snap_to_roads([(0, 0)])
+                self.assertLess(time.time() - start, 0.1)
+            acquire.assert_not_called()
+
+    def test_disabled_by_default(self):
+        with FakeMapsServer() as server:
+            client = server.client()
+            server.inject("server_error", count=2)
+            client.geocode("Sydney")
+            self.assertEqual({}, client.circuit_breakers)
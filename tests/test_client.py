@@ -18,14 +18,24 @@
 
 """Tests for client module."""
 
+import contextlib
+import http.server
+import random
+import socket
+import threading
 import time
+from unittest import mock
+from urllib.parse import urlencode
 
 import responses
 import requests
 import uuid
 
 import googlemaps
+from googlemaps import ratelimit
 import googlemaps.client as _client
+import googlemaps.transport as _transport
+from googlemaps.fakeserver import FakeMapsServer
 from . import TestCase
 from googlemaps.client import _X_GOOG_MAPS_EXPERIENCE_ID
 
@@ -71,6 +81,13 @@ class ClientTest(TestCase):
         end = time.time()
         self.assertTrue(start + 1 < end < start + 2)
 
+        # The send times of the last second, as the client used to keep.
+        sent_times = client.sent_times
+        self.assertEqual(queries_per_second, len(sent_times))
+        self.assertEqual(queries_per_second, sent_times.maxlen)
+        for sent in sent_times:
+            self.assertTrue(start + 0.9 < sent <= time.time())
+
     @responses.activate
     def test_key_sent(self):
         responses.add(
@@ -430,3 +447,511 @@ class ClientTest(TestCase):
             client._request("/foo", {})
 
         self.assertEqual(1, len(responses.calls))
+
+    def test_pool_options(self):
+        client = googlemaps.Client(
+            key="AIzaasdf", pool_maxsize=64, pool_block=True, tcp_keepalive=30
+        )
+
+        self.assertEqual(
+            [
+                "https://maps.googleapis.com",
+                "https://roads.googleapis.com",
+                "https://www.googleapis.com",
+                "https://addressvalidation.googleapis.com",
+            ],
+            list(client.adapters),
+        )
+        roads = client.session.get_adapter("https://roads.googleapis.com/v1/x")
+        self.assertIs(client.adapters["https://roads.googleapis.com"], roads)
+        self.assertIsNot(
+            roads, client.session.get_adapter("https://maps.googleapis.com/x")
+        )
+        self.assertEqual(64, roads._pool_maxsize)
+        self.assertTrue(roads._pool_block)
+        self.assertIn(
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1), roads._socket_options
+        )
+        self.assertIn(
+            (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1), roads._socket_options
+        )
+
+    def test_pool_options_custom_session(self):
+        session = requests.Session()
+        client = googlemaps.Client(key="AIzaasdf", requests_session=session)
+        self.assertEqual({}, client.adapters)
+        self.assertEqual({}, client.pool_stats())
+
+        client = googlemaps.Client(
+            key="AIzaasdf", requests_session=session, pool_maxsize=32
+        )
+        self.assertIs(
+            client.adapters["https://maps.googleapis.com"],
+            session.get_adapter("https://maps.googleapis.com/foo"),
+        )
+
+    @contextlib.contextmanager
+    def _local_server(self, protocol_version="HTTP/1.1"):
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = b'{"status":"OK","results":[]}'
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        Handler.protocol_version = protocol_version
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield server
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_pool_stats(self):
+        with self._local_server() as server:
+            base_url = "http://127.0.0.1:%d" % server.server_port
+            client = googlemaps.Client(key="AIzaasdf", base_url=base_url)
+            for _ in range(3):
+                client.geocode("Sesame St.")
+
+            stats = client.pool_stats()[base_url]
+            self.assertEqual(1, stats["pools"])
+            self.assertEqual(1, stats["connections"])
+            self.assertEqual(3, stats["requests"])
+            self.assertEqual(1, stats["idle"])
+            self.assertEqual(0, stats["discarded"])
+
+    def test_warmup(self):
+        with self._local_server() as server:
+            base_url = "http://localhost:%d" % server.server_port
+            client = googlemaps.Client(
+                key="AIzaasdf", base_url=base_url, dns_cache_ttl=60
+            )
+
+            ready = client.warmup(connections=3, base_urls=[base_url])
+            self.assertEqual({base_url: 3}, ready)
+            stats = client.pool_stats()[base_url]
+            self.assertEqual(3, stats["connections"])
+            self.assertEqual(3, stats["idle"])
+            self.assertEqual(0, stats["requests"])
+
+            client.geocode("Sesame St.")
+            stats = client.pool_stats()[base_url]
+            self.assertEqual(3, stats["connections"])
+            self.assertEqual(1, stats["requests"])
+
+    def test_warmup_failure(self):
+        client = googlemaps.Client(key="AIzaasdf")
+        # Nothing listens on port 9 (discard) locally.
+        self.assertEqual(
+            {"http://127.0.0.1:9": 0},
+            client.warmup(base_urls=["http://127.0.0.1:9"]),
+        )
+
+    def test_dns_cache(self):
+        cache = _transport.DNSCache(ttl=60)
+        infos = [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.1", 443))]
+        with mock.patch("socket.getaddrinfo", return_value=infos) as getaddrinfo:
+            self.assertEqual("10.0.0.1", cache.resolve("example.com", 443))
+            self.assertEqual("10.0.0.1", cache.resolve("example.com", 443))
+            self.assertEqual(1, getaddrinfo.call_count)
+
+            cache.resolve("example.org", 443)
+            self.assertEqual(2, getaddrinfo.call_count)
+
+            with mock.patch("time.monotonic", return_value=time.monotonic() + 61):
+                cache.resolve("example.com", 443)
+            self.assertEqual(3, getaddrinfo.call_count)
+
+            cache.clear()
+            cache.resolve("example.com", 443)
+            self.assertEqual(4, getaddrinfo.call_count)
+
+    def test_dns_cache_reconnect(self):
+        # HTTP/1.0 closes every connection, so the pooled connection
+        # reconnects for each request.
+        with self._local_server(protocol_version="HTTP/1.0") as server:
+            base_url = "http://localhost:%d" % server.server_port
+            client = googlemaps.Client(
+                key="AIzaasdf", base_url=base_url, dns_cache_ttl=0.05
+            )
+            getaddrinfo = socket.getaddrinfo
+            with mock.patch("socket.getaddrinfo",
+                            side_effect=getaddrinfo) as resolve:
+                for _ in range(4):
+                    client.geocode("Sesame St.")
+                    time.sleep(0.1)
+            hosts = [call[0][0] for call in resolve.call_args_list]
+
+            stats = client.pool_stats()[base_url]
+            self.assertEqual(1, stats["connections"])
+            self.assertEqual(4, stats["requests"])
+            # Each reconnect after the TTL resolved the host again.
+            self.assertEqual(4, hosts.count("localhost"))
+
+    def test_hmac_template(self):
+        message = "The quick brown fox jumps over the lazy dog"
+        self.assertEqual(
+            "3nybhbi3iqa8ino29wqQcBydtNk=", _client.sign_hmac("a2V5", message)
+        )
+        self.assertEqual(
+            "0TlplWbcMGq3S8rBV0ApjkY5lpA=", _client.sign_hmac("a2V5MQ==", message)
+        )
+
+        # Clients key the HMAC once, rather than for every request.
+        with mock.patch.object(_client, "_hmac_template",
+                               wraps=_client._hmac_template) as template:
+            client = googlemaps.Client(client_id="foo", client_secret="a2V5")
+            for _ in range(3):
+                client._generate_auth_url("/path", {"a": "b"}, True)
+            self.assertEqual(1, template.call_count)
+
+            client.client_secret = "a2V5MQ=="
+            url = client._generate_auth_url("/path", {"a": "b"}, True)
+            self.assertEqual(2, template.call_count)
+        self.assertEqual(
+            _client.sign_hmac("a2V5MQ==", "/path?a=b&client=foo"),
+            url.split("&signature=")[1])
+
+    @responses.activate
+    def test_retry_reuses_signed_url(self):
+        class request_callback:
+            def __init__(self):
+                self.first_req = True
+
+            def __call__(self, req):
+                if self.first_req:
+                    self.first_req = False
+                    return (500, {}, "Internal Server Error.")
+                return (200, {}, '{"status":"OK","results":[]}')
+
+        responses.add_callback(
+            responses.GET,
+            "https://maps.googleapis.com/maps/api/geocode/json",
+            content_type="application/json",
+            callback=request_callback(),
+        )
+
+        client = googlemaps.Client(client_id="foo", client_secret="a2V5")
+        with mock.patch.object(
+            client, "_generate_auth_url", wraps=client._generate_auth_url
+        ) as generate_auth_url:
+            client.geocode("Sesame St.")
+
+        self.assertEqual(1, generate_auth_url.call_count)
+        self.assertEqual(2, len(responses.calls))
+        self.assertEqual(responses.calls[0].request.url, responses.calls[1].request.url)
+
+    def test_urlencode_matches_urllib(self):
+        # urlencode_params must be byte-for-byte equivalent to urllib's
+        # urlencode followed by unquote_unreserved.
+        def reference(params):
+            extended = []
+            for key, val in params:
+                for v in val if isinstance(val, (list, tuple)) else [val]:
+                    extended.append((key, _client.normalize_for_urlencode(v)))
+            return requests.utils.unquote_unreserved(urlencode(extended))
+
+        rand = random.Random(42)
+        alphabet = [chr(i) for i in range(32, 127)] + list("éü中😀\t\n")
+        values = [
+            "Sesame St.",
+            "-33.8674869,151.2069902|-34,151",
+            "enc:_p~iF~ps|U_ulLnnqC_mqNvxq`@:",
+            "optimize:true|Sydney",
+            "place_id:ChIJ~x",
+            "",
+            1.5,
+            -3,
+            True,
+            ["a b", "c|d"],
+            ("x", 2),
+        ]
+        for _ in range(500):
+            values.append(
+                "".join(rand.choice(alphabet) for _ in range(rand.randint(1, 20)))
+            )
+
+        for value in values:
+            params = [("key %s" % type(value).__name__, value), ("k", "v")]
+            self.assertEqual(reference(params), _client.urlencode_params(params))
+
+    def test_custom_transport(self):
+        class Response(object):
+            status_code = 200
+            headers = {"Content-Type": "application/json"}
+            content = b'{"status":"OK","results":[]}'
+
+        class InMemoryTransport(_transport.Transport):
+            def __init__(self):
+                self.sent = []
+
+            def send(self, method, url, headers=None, body=None, timeout=None,
+                     stream=False, **kwargs):
+                self.sent.append((method, url, headers, body, timeout))
+                return Response()
+
+        transport = InMemoryTransport()
+        client = googlemaps.Client(key="AIzaasdf", transport=transport, timeout=5)
+        client.geocode("Sesame St.")
+        client._request(
+            "/geolocation/v1/geolocate",
+            {},
+            base_url="https://www.googleapis.com",
+            extract_body=lambda response: response.content,
+            post_json={"considerIp": False},
+        )
+
+        method, url, headers, body, timeout = transport.sent[0]
+        self.assertEqual("GET", method)
+        self.assertURLEqual(
+            "https://maps.googleapis.com/maps/api/geocode/json?"
+            "key=AIzaasdf&address=Sesame+St.",
+            url,
+        )
+        self.assertIsNone(body)
+        self.assertEqual(5, timeout)
+        self.assertEqual(_client._USER_AGENT, headers["User-Agent"])
+
+        method, url, headers, body, timeout = transport.sent[1]
+        self.assertEqual("POST", method)
+        self.assertEqual(b'{"considerIp": false}', body)
+        self.assertEqual("application/json", headers["Content-Type"])
+        self.assertNotIn("Content-Type", client.requests_kwargs["headers"])
+
+    def test_transport_errors(self):
+        transport = mock.Mock(spec=_transport.Transport)
+        client = googlemaps.Client(key="AIzaasdf", transport=transport)
+
+        transport.send.side_effect = googlemaps.exceptions.Timeout()
+        with self.assertRaises(googlemaps.exceptions.Timeout):
+            client.geocode("Sesame St.")
+
+        transport.send.side_effect = IOError("connection reset")
+        with self.assertRaises(googlemaps.exceptions.TransportError):
+            client.geocode("Sesame St.")
+
+        session = mock.Mock()
+        session.request.side_effect = requests.exceptions.ReadTimeout()
+        with self.assertRaises(googlemaps.exceptions.Timeout):
+            _transport.RequestsTransport(session).send("GET", "https://x")
+
+    def test_http2_transport_requires_httpx(self):
+        with mock.patch.object(_transport, "httpx", None):
+            with self.assertRaises(ImportError):
+                _transport.HTTP2Transport()
+
+    def test_http2_transport_requests_kwargs(self):
+        httpx = mock.Mock()
+        httpx.TimeoutException = type("TimeoutException", (Exception,), {})
+        httpx.Client.side_effect = lambda **kwargs: mock.Mock(settings=kwargs)
+
+        with mock.patch.object(_transport, "httpx", httpx):
+            transport = _transport.HTTP2Transport(proxy="http://proxy:1")
+            transport.send("GET", "https://x/a")
+            transport.send("GET", "https://x/b", verify="/ca.pem",
+                           cert=["c.pem", "k.pem"],
+                           proxies={"https": "http://other:2"})
+            transport.send("GET", "https://x/c", verify="/ca.pem",
+                           cert=("c.pem", "k.pem"),
+                           proxies={"https": "http://other:2"})
+            transport.close()
+
+        self.assertEqual(2, httpx.Client.call_count)
+        default, other = [kwargs for _, kwargs in
+                          httpx.Client.call_args_list]
+        self.assertEqual((True, None, "http://proxy:1"),
+                         (default["verify"], default["cert"],
+                          default["proxy"]))
+        self.assertEqual(("/ca.pem", ("c.pem", "k.pem"), "http://other:2"),
+                         (other["verify"], other["cert"], other["proxy"]))
+        for client in transport._clients.values():
+            client.close.assert_called_once_with()
+
+    def test_map(self):
+        with FakeMapsServer(latency=0.05) as server:
+            client = server.client()
+            addresses = ["Sydney", "Melbourne", "Perth", "Darwin"] * 2
+
+            start = time.time()
+            results = client.map("geocode", addresses, concurrency=8)
+            self.assertLess(time.time() - start, 0.05 * len(addresses) / 2)
+            self.assertEqual(
+                addresses, [r["results"][0]["formatted_address"] for r in results]
+            )
+
+            results = client.map(
+                client.distance_matrix,
+                [
+                    {"origins": "Sydney", "destinations": "Perth"},
+                    ("Sydney", "Darwin"),
+                    {"origins": "Sydney"},
+                ],
+            )
+            self.assertEqual(["Perth"], results[0]["destination_addresses"])
+            self.assertEqual(["Darwin"], results[1]["destination_addresses"])
+            self.assertIsInstance(results[2], TypeError)
+
+            server.inject("over_query_limit")
+            client = server.client(retry_over_query_limit=False)
+            results = client.map("geocode", ["Sydney"])
+            self.assertIsInstance(results[0], googlemaps.exceptions.ApiError)
+
+    def test_map_as_completed(self):
+        with FakeMapsServer() as server:
+            client = server.client()
+            addresses = ("address %d" % i for i in range(50))
+
+            results = dict(
+                client.map_as_completed("geocode", addresses, concurrency=4)
+            )
+            self.assertEqual(list(range(50)), sorted(results))
+            self.assertEqual(
+                "address 17", results[17]["results"][0]["formatted_address"]
+            )
+
+    def test_map_shares_rate_limit(self):
+        with FakeMapsServer() as server:
+            client = server.client(queries_per_second=5)
+            start = time.time()
+            client.map("geocode", ["Sydney"] * 10, concurrency=10)
+            self.assertGreater(time.time() - start, 1)
+
+    def test_extra_params_per_thread(self):
+        with FakeMapsServer(latency=0.02) as server:
+            client = server.client()
+            client.map(
+                "geocode",
+                [
+                    {"address": str(i), "extra_params": {"n": str(i)}}
+                    for i in range(20)
+                ],
+            )
+
+            for request in server.requests:
+                self.assertEqual(request["params"]["address"], request["params"]["n"])
+
+    def test_map_inherits_call_state(self):
+        locations = [(-33 - i * 0.01, 151) for i in range(20)]
+        with FakeMapsServer(latency=0.1) as server:
+            client = server.client()
+            acquire = mock.Mock(wraps=client.rate_limiter.acquire)
+            with mock.patch.object(client.rate_limiter, "acquire", acquire):
+                client.distance_matrix_bulk(
+                    locations, locations, max_elements=100,
+                    extra_params={"foo": "bar"},
+                    priority=ratelimit.BATCH)
+            self.assertEqual(4, len(server.requests))
+            for request in server.requests:
+                self.assertEqual("bar", request["params"]["foo"])
+            for call in acquire.call_args_list:
+                self.assertEqual(ratelimit.BATCH, call[0][0])
+
+            # The deadline covers all of the calls.
+            with self.assertRaises(googlemaps.exceptions.Timeout):
+                client.distance_matrix_bulk(
+                    locations, locations, max_elements=100, concurrency=1,
+                    deadline=0.25)
+
+    def test_deadline(self):
+        with FakeMapsServer(latency=0.5) as server:
+            client = server.client()
+            start = time.time()
+            with self.assertRaises(googlemaps.exceptions.Timeout):
+                client.geocode("Sydney", deadline=0.1)
+            self.assertLess(time.time() - start, 0.4)
+
+        with FakeMapsServer() as server:
+            client = server.client()
+            client.geocode("Sydney", deadline=1)
+
+            # The retry, at least 0.25s later, can't be made in time.
+            server.inject("server_error")
+            start = time.time()
+            with self.assertRaises(googlemaps.exceptions.Timeout):
+                client.geocode("Sydney", deadline=0.2)
+            self.assertLess(time.time() - start, 0.2)
+
+            # Nor can the rate limit be waited for.
+            client = server.client(queries_per_second=1)
+            client.geocode("Sydney")
+            start = time.time()
+            with self.assertRaises(googlemaps.exceptions.Timeout):
+                client.geocode("Sydney", deadline=0.2)
+            self.assertTrue(0.2 <= time.time() - start < 0.5)
+            self.assertIsNone(getattr(client._local, "deadline", None))
+
+    def test_bound_timeout(self):
+        self.assertEqual(0.5, _client._bound_timeout(None, 0.5))
+        self.assertEqual(0.5, _client._bound_timeout(10, 0.5))
+        self.assertEqual(0.2, _client._bound_timeout(0.2, 0.5))
+        self.assertEqual((0.1, 0.5), _client._bound_timeout((0.1, 30), 0.5))
+        self.assertEqual((0.5, 0.5), _client._bound_timeout((None, None), 0.5))
+
+    def test_cache(self):
+        with FakeMapsServer() as server:
+            client = server.client(cache_ttl=60, cache_size=2,
+                                   retry_over_query_limit=False)
+            sydney = client.geocode("Sydney")
+            self.assertEqual(sydney, client.geocode("Sydney"))
+            self.assertEqual(1, len(server.requests))
+            self.assertEqual(1, client.cache.hits)
+
+            # Results are copies, which callers can modify.
+            sydney["results"].clear()
+            cached = client.geocode("Sydney")
+            self.assertTrue(cached["results"])
+            cached["results"].clear()
+            self.assertTrue(client.geocode("Sydney")["results"])
+            self.assertEqual(1, len(server.requests))
+
+            # Least recently used results are dropped.
+            client.geocode("Melbourne")
+            client.geocode("Perth")
+            client.geocode("Sydney")
+            self.assertEqual(4, len(server.requests))
+
+            # Errors are not cached.
+            server.inject("over_query_limit")
+            with self.assertRaises(googlemaps.exceptions.ApiError):
+                client.geocode("Hobart")
+            client.geocode("Hobart")
+            self.assertEqual(6, len(server.requests))
+
+            # Nor POST requests.
+            client.geolocate()
+            client.geolocate()
+            self.assertEqual(8, len(server.requests))
+
+    def test_cache_ttl(self):
+        with FakeMapsServer() as server:
+            client = server.client(cache_ttl=0.1)
+            client.geocode("Sydney")
+            time.sleep(0.15)
+            client.geocode("Sydney")
+            self.assertEqual(2, len(server.requests))
+
+    def test_time_bucket(self):
+        with FakeMapsServer() as server:
+            client = server.client(time_bucket=3600, cache_ttl=60)
+            first = client.distance_matrix("Sydney", "Melbourne",
+                                           departure_time="now")
+            second = client.distance_matrix("Sydney", "Melbourne",
+                                            departure_time="now")
+            # Unless the hour ended in between.
+            if len(server.requests) == 1:
+                self.assertEqual(first, second)
+            departure = int(server.requests[0]["params"]["departure_time"])
+            self.assertEqual(0, departure % 3600)
+            self.assertTrue(0 <= departure - time.time() <= 3600)
+
+            client.directions("Sydney", "Melbourne", departure_time=7300)
+            self.assertEqual("10800",
+                             server.requests[-1]["params"]["departure_time"])
@@ -0,0 +1,125 @@
+#
+# Copyright 2026 Google Inc. All rights reserved.
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+
+"""Tests for the columnar module."""
+
+from googlemaps import columnar
+from googlemaps.fakeserver import FakeMapsServer
+from . import TestCase
+
+
+def _column(table, name):
+    if columnar.pyarrow is not None:
+        return table.column(name).to_pylist()
+    return list(table[name])
+
+
+class ResultSinkTest(TestCase):
+    def test_geocode(self):
+        addresses = ["Sydney", "Melbourne", "Perth", "Hobart", "Darwin"]
+        batches = []
+
+        with FakeMapsServer() as server:
+            client = server.client()
+            sink = columnar.ResultSink("geocode", batch_size=2,
+                                       on_batch=batches.append,
+                                       keep_batches=True)
+            errors = sink.collect(client, addresses, concurrency=2)
+            expected = [client.geocode(address)["results"][0]
+                        for address in addresses]
+
+        self.assertEqual([], errors)
+        self.assertEqual(5, sink.rows)
+        # Full batches are emitted as rows come in.
+        self.assertEqual(2, len(batches))
+
+        table = sink.table()
+        self.assertEqual(3, len(sink.batches))
+        self.assertEqual([0, 1, 2, 3, 4], sorted(_column(table, "index")))
+        by_index = dict(zip(_column(table, "index"),
+                            zip(_column(table, "formatted_address"),
+                                _column(table, "lat"))))
+        for i, result in enumerate(expected):
+            self.assertEqual((result["formatted_address"],
+                              result["geometry"]["location"]["lat"]),
+                             by_index[i])
+
+    def test_distance_matrix(self):
+        with FakeMapsServer() as server:
+            client = server.client()
+            matrix = client.distance_matrix(["Sydney", "Perth"],
+                                            ["Melbourne", "Hobart", "Darwin"])
+        matrix["rows"][1]["elements"][2] = {"status": "ZERO_RESULTS"}
+
+        sink = columnar.ResultSink("distance_matrix")
+        sink.add(matrix, index=7)
+        table = sink.table()
+
+        self.assertEqual([7] * 6, _column(table, "index"))
+        self.assertEqual([0, 0, 0, 1, 1, 1], _column(table, "origin_index"))
+        self.assertEqual([0, 1, 2, 0, 1, 2],
+                         _column(table, "destination_index"))
+        self.assertEqual(matrix["origin_addresses"][1],
+                         _column(table, "origin")[3])
+        self.assertEqual(
+            matrix["rows"][0]["elements"][1]["distance"]["value"],
+            _column(table, "distance")[1])
+        self.assertEqual("ZERO_RESULTS", _column(table, "status")[5])
+        missing = None if columnar.pyarrow is not None else -1
+        self.assertEqual(missing, _column(table, "duration")[5])
+
+    def test_elevation_and_roads(self):
+        path = [(-33.8, 151.2), (-33.81, 151.21)]
+        with FakeMapsServer() as server:
+            client = server.client()
+            elevation = columnar.ResultSink("elevation")
+            elevation.add(client.elevation(path))
+            roads = columnar.ResultSink("snap_to_roads")
+            roads.add(client.snap_to_roads(path), index=3)
+
+        table = elevation.table()
+        for expected, lat in zip([-33.8, -33.81], _column(table, "lat")):
+            self.assertAlmostEqual(expected, lat)
+        self.assertEqual(2, len(_column(table, "elevation")))
+
+        table = roads.table()
+        self.assertEqual([3, 3], _column(table, "index"))
+        self.assertEqual([0, 1], _column(table, "original_index"))
+
+    def test_on_batch_adds_rows(self):
+        sink = columnar.ResultSink("elevation", batch_size=2,
+                                   keep_batches=True)
+        result = [{"location": {"lat": 1, "lng": 2}, "elevation": 3}]
+
+        def on_batch(batch):
+            # Called without the sink's lock held.
+            if sink.rows < 6:
+                sink.add(result * 2)
+                sink.flush()
+        sink.on_batch = on_batch
+
+        sink.add(result * 2)
+        self.assertEqual(6, sink.rows)
+        self.assertEqual(3, len(sink.batches))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            columnar.ResultSink("directions")
+
+        sink = columnar.ResultSink("elevation", on_batch=lambda batch: None)
+        with self.assertRaises(ValueError):
+            sink.table()
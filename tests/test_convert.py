@@ -18,6 +18,7 @@
 """Tests for the convert module."""
 
 import datetime
+import random
 import unittest
 import pytest
 
@@ -57,6 +58,25 @@ class ConvertTest(unittest.TestCase):
         with self.assertRaises(TypeError):
             convert.latlng(1)
 
+    def test_location_list_matches_reference(self):
+        # The fast paths must produce the same output as the generic
+        # formatting: "%.8f" with trailing zeros and period removed.
+        def reference(points):
+            return "|".join(
+                "%s,%s"
+                % tuple(("%.8f" % float(v)).rstrip("0").rstrip(".") for v in p)
+                for p in points
+            )
+
+        rand = random.Random(42)
+        points = [(rand.uniform(-90, 90), rand.uniform(-180, 180)) for _ in range(500)]
+        points += [(0, -0.0), (40, 40.000000009), (1e-9, -1e-9), ("12.5", 7)]
+        points += [[lat, lng] for lat, lng in points]
+        dicts = [{"lat": lat, "lng": lng} for lat, lng in points]
+
+        self.assertEqual(reference(points), convert.location_list(points))
+        self.assertEqual(reference(points), convert.location_list(dicts))
+
     def test_join_list(self):
         self.assertEqual("asdf", convert.join_list("|", "asdf"))
 
@@ -84,6 +104,16 @@ class ConvertTest(unittest.TestCase):
         dt = datetime.datetime.fromtimestamp(1409810596)
         self.assertEqual("1409810596", convert.time(dt))
 
+    def test_bucket_time(self):
+        self.assertEqual("1409810700", convert.bucket_time(1409810596, 300))
+        # Times at the end of a bucket stay put.
+        self.assertEqual("1409810700", convert.bucket_time(1409810700, 300))
+
+        dt = datetime.datetime.fromtimestamp(1409810596)
+        self.assertEqual("1409810700", convert.bucket_time(dt, 300))
+        self.assertEqual("1409810700",
+                         convert.bucket_time("now", 300, now=1409810401.5))
+
     def test_components(self):
         c = {"country": "US"}
         self.assertEqual("country:US", convert.components(c))
@@ -165,6 +195,74 @@ class ConvertTest(unittest.TestCase):
         actual_polyline = convert.encode_polyline(points)
         self.assertEqual(test_polyline, actual_polyline)
 
+    def test_latlng_array(self):
+        points = [(40.714728, -73.998672), {"lat": 10, "lng": -0.5},
+                  [-33.867486, 151.20699], (0.000000001, 100)]
+        arr = convert.LatLngArray.from_points(points)
+
+        self.assertEqual(4, len(arr))
+        self.assertEqual((10.0, -0.5), arr[1])
+        self.assertEqual([(10.0, -0.5), (-33.867486, 151.20699)],
+                         list(arr[1:3]))
+        self.assertEqual(convert.location_list(points),
+                         convert.location_list(arr))
+        self.assertEqual("40.714728,-73.998672|10,-0.5|"
+                         "-33.867486,151.20699|0,100",
+                         convert.location_list(arr))
+        self.assertEqual(convert.encode_polyline(points),
+                         convert.encode_polyline(arr))
+        self.assertEqual(convert.shortest_path(points),
+                         convert.shortest_path(arr))
+        self.assertEqual("", convert.location_list(convert.LatLngArray()))
+
+        encoded = convert.encode_polyline(points)
+        self.assertEqual(
+            [(p["lat"], p["lng"]) for p in convert.decode_polyline(encoded)],
+            list(convert.LatLngArray.from_points(encoded)))
+
+        copy = convert.LatLngArray.from_points(arr)
+        self.assertEqual(arr, copy)
+        copy.append(1, 2)
+        self.assertNotEqual(arr, copy)
+
+        with self.assertRaises(ValueError):
+            convert.LatLngArray([1, 2], [3])
+
+    def test_simplify_polyline(self):
+        # A straight line with a 0.001 degree (~111m) bump in the middle.
+        line = [(40.0, -74.0 + i * 0.001) for i in range(21)]
+        line[10] = (40.001, -73.99)
+
+        points, deviation = convert.simplify_polyline(line, tolerance=10)
+        self.assertEqual([line[0], line[9], line[10], line[11], line[20]],
+                         points)
+        self.assertAlmostEqual(0.0, deviation)
+
+        points, deviation = convert.simplify_polyline(line, max_points=3)
+        self.assertEqual([line[0], line[10], line[20]], points)
+        self.assertAlmostEqual(99, deviation, delta=1)
+
+        points, deviation = convert.simplify_polyline(line, max_points=30)
+        self.assertEqual(line, points)
+        self.assertEqual(0.0, deviation)
+
+        encoded = convert.encode_polyline(line)
+        points, deviation = convert.simplify_polyline(encoded, max_length=40)
+        self.assertEqual(5, len(points))
+        self.assertAlmostEqual(0.0, deviation)
+
+        points, _ = convert.simplify_polyline(line, max_length=30,
+                                              encoded=False)
+        self.assertEqual(2, len(points))
+
+        points, deviation = convert.simplify_polyline(
+            convert.LatLngArray.from_points(line), max_points=3)
+        self.assertEqual(convert.LatLngArray.from_points(
+            [line[0], line[10], line[20]]), points)
+
+        with self.assertRaises(ValueError):
+            convert.simplify_polyline(line)
+
 
 @pytest.mark.parametrize(
     "value, expected",
@@ -0,0 +1,107 @@
+#
+# Copyright 2026 Google Inc. All rights reserved.
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+
+"""Tests for the decoder module."""
+
+import json
+
+import responses
+
+import googlemaps
+from googlemaps import decoder
+from . import TestCase
+
+
+class DecoderTest(TestCase):
+    def setUp(self):
+        self.client = googlemaps.Client(key="AIzaasdf")
+        self.calls = []
+
+    def tearDown(self):
+        decoder.set_decoder()
+
+    def _counting_loads(self, data):
+        self.calls.append(data)
+        return json.loads(data)
+
+    def test_loads(self):
+        body = '{"status":"OK","results":[{"name":"Z\\u00fcrich","n":1.5}]}'
+        expected = {"status": "OK", "results": [{"name": "Z\xfcrich", "n": 1.5}]}
+        self.assertEqual(expected, decoder.loads(body.encode("utf-8")))
+        self.assertEqual(expected, decoder.loads(body))
+
+        with self.assertRaises(ValueError):
+            decoder.loads(b"{not json")
+
+    def test_set_decoder(self):
+        default = decoder.decoder_name()
+        self.assertIn(default, ("orjson", "simdjson", "ujson", "json"))
+
+        decoder.set_decoder(self._counting_loads, "counting")
+        self.assertEqual("counting", decoder.decoder_name())
+        self.assertEqual([1], decoder.loads(b"[1]"))
+        self.assertEqual([b"[1]"], self.calls)
+
+        decoder.set_decoder()
+        self.assertEqual(default, decoder.decoder_name())
+
+    @responses.activate
+    def test_get_body_uses_decoder(self):
+        responses.add(
+            responses.GET,
+            "https://maps.googleapis.com/maps/api/geocode/json",
+            body='{"status":"OK","results":[]}',
+            status=200,
+            content_type="application/json",
+        )
+        decoder.set_decoder(self._counting_loads)
+
+        self.client.geocode("Sesame St.")
+
+        self.assertEqual([b'{"status":"OK","results":[]}'], self.calls)
+
+    @responses.activate
+    def test_extractors_use_decoder(self):
+        responses.add(
+            responses.GET,
+            "https://roads.googleapis.com/v1/nearestRoads",
+            body='{"snappedPoints":[]}',
+            status=200,
+            content_type="application/json",
+        )
+        responses.add(
+            responses.POST,
+            "https://www.googleapis.com/geolocation/v1/geolocate",
+            body='{"location":{"lat":1,"lng":2},"accuracy":3}',
+            status=200,
+            content_type="application/json",
+        )
+        responses.add(
+            responses.POST,
+            "https://addressvalidation.googleapis.com/v1:validateAddress",
+            body='{"result":{}}',
+            status=200,
+            content_type="application/json",
+        )
+        decoder.set_decoder(self._counting_loads)
+
+        self.client.nearest_roads((1, 2))
+        self.client.geolocate()
+        self.client.addressvalidation(["1600 Amphitheatre Pk"])
+
+        self.assertEqual(3, len(self.calls))
+        self.assertTrue(all(isinstance(c, bytes) for c in self.calls))
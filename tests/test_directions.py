@@ -24,6 +24,9 @@ import time
 import responses
 
 import googlemaps
+from googlemaps import convert
+from googlemaps import directions as _directions
+from googlemaps.fakeserver import FakeMapsServer
 from . import TestCase
 
 
@@ -171,6 +174,26 @@ class DirectionsTest(TestCase):
             responses.calls[0].request.url,
         )
 
+    @responses.activate
+    def test_latlng_array_waypoints(self):
+        responses.add(
+            responses.GET,
+            "https://maps.googleapis.com/maps/api/directions/json",
+            body='{"status":"OK","routes":[]}',
+            status=200,
+            content_type="application/json",
+        )
+
+        waypoints = convert.LatLngArray([-33.8, -34.1], [151.2, 150.5])
+        self.client.directions("Sydney", "Canberra", waypoints=waypoints)
+
+        self.assertURLEqual(
+            "https://maps.googleapis.com/maps/api/directions/json?"
+            "origin=Sydney&destination=Canberra&"
+            "waypoints=-33.8%%2C151.2%%7C-34.1%%2C150.5&key=%s" % self.key,
+            responses.calls[0].request.url,
+        )
+
     @responses.activate
     def test_brooklyn_to_queens_by_transit(self):
         responses.add(
@@ -323,3 +346,82 @@ class DirectionsTest(TestCase):
             "alternatives=true&key=%s" % self.key,
             responses.calls[0].request.url,
         )
+
+    def test_directions_long(self):
+        stops = [(-33.0 - 0.01 * i, 151.0 + 0.013 * (i % 7)) for i in range(60)]
+        stops[10] = "Parramatta"
+
+        with FakeMapsServer() as server:
+            client = server.client()
+            routes = client.directions_long(stops, mode="walking")
+            requests = server.requests
+
+            # 25 waypoints per request, segments sharing their end stops.
+            self.assertEqual(3, len(requests))
+            self.assertEqual(59, len(routes[0]["legs"]))
+            self.assertEqual(
+                [("-33,151", "-33.26,151.065"),
+                 ("-33.26,151.065", "-33.52,151.039"),
+                 ("-33.52,151.039", "-33.59,151.039")],
+                sorted((r["params"]["origin"], r["params"]["destination"])
+                       for r in requests),
+            )
+            self.assertTrue(all(r["params"]["mode"] == "walking" for r in requests))
+
+            # Waypoints are polyline encoded where possible.
+            waypoints = [r["params"]["waypoints"] for r in requests]
+            self.assertEqual(2, sum(w.startswith("enc:") for w in waypoints))
+            self.assertEqual(1, sum("|Parramatta|" in w for w in waypoints))
+
+            legs = routes[0]["legs"]
+            self.assertEqual("Parramatta", legs[9]["end_address"])
+            self.assertEqual("Parramatta", legs[10]["start_address"])
+            points = googlemaps.convert.decode_polyline(
+                routes[0]["overview_polyline"]["points"])
+            self.assertEqual(60, len(points))
+            self.assertEqual(-33.59, routes[0]["bounds"]["southwest"]["lat"])
+
+            # Shorter URLs take more segments.
+            server.requests.clear()
+            routes = client.directions_long(stops, mode="walking",
+                                            max_url_length=250)
+            self.assertGreater(len(server.requests), 3)
+            self.assertEqual(59, len(routes[0]["legs"]))
+
+    def test_directions_long_invalid(self):
+        with self.assertRaises(ValueError):
+            self.client.directions_long(["Sydney"])
+        with self.assertRaises(ValueError):
+            self.client.directions_long(["Sydney", "Perth"], alternatives=True)
+
+    def test_split_stops(self):
+        stops = list(range(100))
+        segments = _directions._split_stops(
+            self.client, [(0, i / 100.0) for i in stops], 8, 16384, {})
+        self.assertEqual(11, len(segments))
+        self.assertEqual(10, len(segments[0]))
+        for a, b in zip(segments, segments[1:]):
+            self.assertEqual(a[-1], b[0])
+
+        # The full URL is measured, with the base URL and the signature.
+        client = googlemaps.Client(client_id="foo", client_secret="a2V5",
+                                   channel="MyChannel")
+        stops = ["Stop %d" % i for i in range(40)]
+        segments = _directions._split_stops(client, stops, 25, 400,
+                                            {"mode": "walking"})
+        self.assertGreater(len(segments), 1)
+        for segment in segments:
+            params = _directions._params(
+                segment[0], segment[-1], mode="walking",
+                waypoints=_directions._waypoints_param(segment[1:-1]))
+            url = client.base_url + client._generate_auth_url(
+                "/maps/api/directions/json", params, True)
+            self.assertLessEqual(len(url), 400)
+
+        self.assertEqual(
+            "Sydney|Perth", _directions._waypoints_param(["Sydney", "Perth"]))
+        self.assertEqual(
+            "enc:_p~iF~ps|U_ulLnnqC_mqNvxq`@:",
+            _directions._waypoints_param(
+                [(38.5, -120.2), (40.7, -120.95), (43.252, -126.453)]),
+        )
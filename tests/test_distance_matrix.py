@@ -23,6 +23,9 @@ import time
 import responses
 
 import googlemaps
+from googlemaps import convert
+from googlemaps import distance_matrix as _distance_matrix
+from googlemaps.fakeserver import FakeMapsServer
 from . import TestCase
 
 
@@ -216,3 +219,136 @@ class DistanceMatrixTest(TestCase):
             "place_id%%3AChIJjQmTaV0E9YgRC2MLmS_e_mY" % self.key,
             responses.calls[0].request.url,
         )
+
+    def test_distance_matrix_bulk(self):
+        origins = [(-33 - i * 0.01, 151) for i in range(30)]
+        destinations = [(-34, 150 + i * 0.01) for i in range(7)]
+
+        with FakeMapsServer() as server:
+            client = server.client()
+            matrix = client.distance_matrix_bulk(origins, destinations,
+                                                 mode="walking")
+            requests = list(server.requests)
+            expected = client.distance_matrix(origins[17:20],
+                                              destinations[2:5],
+                                              mode="walking")
+
+        # 14 origins by 7 destinations per request.
+        self.assertEqual(3, len(requests))
+        for request in requests:
+            self.assertEqual("walking", request["params"]["mode"])
+            self.assertLessEqual(
+                len(request["params"]["origins"].split("|")) *
+                len(request["params"]["destinations"].split("|")), 100)
+
+        self.assertEqual("OK", matrix["status"])
+        self.assertEqual(30, len(matrix["origin_addresses"]))
+        self.assertEqual(7, len(matrix["destination_addresses"]))
+        self.assertEqual(30, len(matrix["rows"]))
+        for i, row in enumerate(expected["rows"]):
+            self.assertEqual(row["elements"],
+                             matrix["rows"][17 + i]["elements"][2:5])
+
+    def test_tile_shape(self):
+        self.assertEqual((1, 1), _distance_matrix._tile_shape(1, 1, 100, 25))
+        self.assertEqual((25, 4), _distance_matrix._tile_shape(100, 4, 100, 25))
+        self.assertEqual((4, 25), _distance_matrix._tile_shape(4, 100, 100, 25))
+        self.assertEqual((10, 10),
+                         _distance_matrix._tile_shape(50, 50, 100, 25))
+
+    def test_distance_matrix_bulk_symmetric(self):
+        locations = [(-33 - i * 0.01, 151) for i in range(30)]
+
+        with FakeMapsServer() as server:
+            client = server.client()
+            full = client.distance_matrix_bulk(locations, locations,
+                                               mode="walking")
+            sent = list(server.requests)
+            server.requests.clear()
+            matrix = client.distance_matrix_bulk(
+                locations, locations, mode="walking", skip_diagonal=True,
+                symmetric=True)
+            requests = list(server.requests)
+
+        def elements(requests):
+            return sum(len(r["params"]["origins"].split("|")) *
+                       len(r["params"]["destinations"].split("|"))
+                       for r in requests)
+
+        self.assertEqual(900, elements(sent))
+        # Only the upper triangle.
+        self.assertEqual(435, elements(requests))
+        self.assertEqual(900 - elements(requests), matrix["saved_elements"])
+        self.assertNotIn("saved_elements", full)
+
+        self.assertEqual(full["origin_addresses"], matrix["origin_addresses"])
+        for i in range(30):
+            for j in range(30):
+                element = matrix["rows"][i]["elements"][j]
+                if i == j:
+                    self.assertEqual(0, element["distance"]["value"])
+                else:
+                    # The fake server's distances are symmetric.
+                    self.assertEqual(full["rows"][i]["elements"][j], element)
+
+        # Mirrored elements are not shared with the ones they mirror.
+        matrix["rows"][1]["elements"][0]["distance"]["value"] = -1
+        self.assertEqual(full["rows"][0]["elements"][1],
+                         matrix["rows"][0]["elements"][1])
+
+    def test_distance_matrix_bulk_latlng_array(self):
+        locations = [(-33 - i * 0.01, 151) for i in range(30)]
+        arr = convert.LatLngArray.from_points(locations)
+
+        with FakeMapsServer() as server:
+            client = server.client()
+            expected = client.distance_matrix_bulk(locations, locations[:5])
+            matrix = client.distance_matrix_bulk(arr, arr[:5])
+
+        self.assertEqual(expected, matrix)
+
+    def test_distance_matrix_bulk_skip_diagonal(self):
+        locations = ["Sydney", "Melbourne", "Perth"]
+
+        with FakeMapsServer() as server:
+            client = server.client()
+            matrix = client.distance_matrix_bulk(locations, locations,
+                                                 skip_diagonal=True)
+
+        self.assertGreaterEqual(matrix["saved_elements"], 0)
+        for i in range(3):
+            self.assertEqual(0, matrix["rows"][i]["elements"][i]
+                             ["duration"]["value"])
+
+        # Driving times are not symmetric.
+        with self.assertRaises(ValueError):
+            self.client.distance_matrix_bulk(locations, locations,
+                                             symmetric=True)
+
+    def test_cover(self):
+        def cells(tiles):
+            return sorted((i, j) for rows, cols in tiles
+                          for i in rows for j in cols)
+
+        self.assertEqual(
+            [], _distance_matrix._cover([0, 1], [[], []], 100, 25))
+        # A new row and a new column.
+        self.assertEqual(
+            [([0, 1, 2], [3]), ([3], [0, 1, 2, 3])],
+            sorted(_distance_matrix._cover(
+                [0, 1, 2, 3], [[3], [3], [3], [0, 1, 2, 3]], 100, 25)))
+        # The upper triangle of 100 locations.
+        missing = [list(range(i + 1, 100)) for i in range(100)]
+        tiles = _distance_matrix._cover(list(range(100)), missing, 100, 25)
+        self.assertEqual([(i, j) for i in range(100) for j in missing[i]],
+                         cells(tiles))
+        self.assertLessEqual(len(tiles), 45 + 10 * 9)
+        for rows, cols in tiles:
+            self.assertLessEqual(len(rows) * len(cols), 100)
+
+    def test_group_rectangles(self):
+        # Grouping columns needs fewer rectangles here.
+        self.assertEqual(
+            [([0, 1, 2, 3], [0]), ([1, 3], [1]), ([2, 3], [2])],
+            sorted(_distance_matrix._group_rectangles(
+                [0, 1, 2, 3], [[0], [0, 1], [0, 2], [0, 1, 2]])))
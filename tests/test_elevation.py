@@ -114,6 +114,31 @@ class ElevationTest(TestCase):
             responses.calls[0].request.url,
         )
 
+    @responses.activate
+    def test_elevation_along_path_max_length(self):
+        responses.add(
+            responses.GET,
+            "https://maps.googleapis.com/maps/api/elevation/json",
+            body='{"status":"OK","results":[]}',
+            status=200,
+            content_type="application/json",
+        )
+
+        path = [(40.0, -74.0 + i * 0.001) for i in range(100)]
+        path[50] = (40.001, -73.95)
+        results, deviation = self.client.elevation_along_path(
+            path, 5, max_length=110, return_deviation=True)
+
+        self.assertEqual([], results)
+        self.assertURLEqual(
+            "https://maps.googleapis.com/maps/api/elevation/json?"
+            "path=enc:_ocsF~btbMgEowHfEgqH&key=%s&samples=5" % self.key,
+            responses.calls[0].request.url,
+        )
+        # The limit applies to the whole URL, not just the path.
+        self.assertLessEqual(len(responses.calls[0].request.url), 110)
+        self.assertGreater(deviation, 0)
+
     @responses.activate
     def test_short_latlng(self):
         responses.add(
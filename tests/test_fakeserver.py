@@ -0,0 +1,240 @@
+#
+# Copyright 2026 Google Inc. All rights reserved.
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+
+"""Tests for the fakeserver module."""
+
+import time
+
+import googlemaps
+from googlemaps.fakeserver import FakeMapsServer
+from googlemaps.maps import StaticMapPath
+from . import TestCase
+
+
+class FakeServerTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeMapsServer().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.client = self.server.client()
+        self.server.requests.clear()
+
+    def test_directions(self):
+        routes = self.client.directions(
+            "Sydney", "Melbourne", waypoints=["Canberra", (-36.08, 146.91)]
+        )
+
+        self.assertEqual(1, len(routes))
+        legs = routes[0]["legs"]
+        self.assertEqual(3, len(legs))
+        self.assertEqual("Sydney", legs[0]["start_address"])
+        self.assertEqual("-36.08, 146.91", legs[1]["end_address"])
+        self.assertEqual({"lat": -36.08, "lng": 146.91}, legs[2]["start_location"])
+        self.assertTrue(all(leg["distance"]["value"] > 0 for leg in legs))
+
+        points = googlemaps.convert.decode_polyline(
+            routes[0]["overview_polyline"]["points"]
+        )
+        self.assertEqual(4, len(points))
+
+        # Responses are deterministic.
+        self.assertEqual(
+            routes,
+            self.client.directions(
+                "Sydney", "Melbourne", waypoints=["Canberra", (-36.08, 146.91)]
+            ),
+        )
+
+        alternatives = self.client.directions(
+            "Sydney", "Melbourne", alternatives=True, departure_time=1700000000
+        )
+        self.assertEqual(3, len(alternatives))
+        self.assertIn("duration_in_traffic", alternatives[0]["legs"][0])
+
+    def test_distance_matrix(self):
+        matrix = self.client.distance_matrix(
+            [(0, 0), (0, 1)], [(0, 0), (1, 0), (0, 2)], mode="walking"
+        )
+
+        self.assertEqual("OK", matrix["status"])
+        self.assertEqual(["0, 0", "0, 1"], matrix["origin_addresses"])
+        self.assertEqual(2, len(matrix["rows"]))
+        elements = matrix["rows"][1]["elements"]
+        self.assertEqual(3, len(elements))
+        self.assertEqual(0, matrix["rows"][0]["elements"][0]["distance"]["value"])
+        # One degree along the equator.
+        self.assertAlmostEqual(111195, elements[0]["distance"]["value"], delta=1)
+        self.assertEqual(
+            round(elements[0]["distance"]["value"] / 1.4),
+            elements[0]["duration"]["value"],
+        )
+
+    def test_geocoding(self):
+        results = self.client.geocode("1600 Amphitheatre Parkway")["results"]
+        self.assertEqual(1, len(results))
+        self.assertEqual("1600 Amphitheatre Parkway", results[0]["formatted_address"])
+
+        results = self.client.reverse_geocode((40.714224, -73.961452))["results"]
+        self.assertEqual(
+            {"lat": 40.714224, "lng": -73.961452}, results[0]["geometry"]["location"]
+        )
+
+    def test_elevation(self):
+        results = self.client.elevation([(39.73, -104.98), (36.45, -116.86)])
+        self.assertEqual(2, len(results))
+        self.assertAlmostEqual(39.73, results[0]["location"]["lat"])
+        self.assertAlmostEqual(-104.98, results[0]["location"]["lng"])
+
+        results = self.client.elevation_along_path([(0, 0), (0, 1)], 5)
+        self.assertEqual(5, len(results))
+        self.assertAlmostEqual(0.5, results[2]["location"]["lng"])
+
+    def test_timezone(self):
+        result = self.client.timezone((39.6034810, -119.6822510))
+        self.assertEqual(-8 * 3600, result["rawOffset"])
+        self.assertEqual("Etc/GMT+8", result["timeZoneId"])
+
+    def test_roads(self):
+        path = [(-33.86, 151.20), (-33.87, 151.21)]
+        points = self.client.snap_to_roads(path)
+        self.assertEqual(2, len(points))
+        self.assertEqual(1, points[1]["originalIndex"])
+
+        self.assertEqual(2, len(self.client.nearest_roads(path)))
+
+        limits = self.client.speed_limits([p["placeId"] for p in points])
+        self.assertEqual(2, len(limits))
+        self.assertEqual("KPH", limits[0]["units"])
+
+        result = self.client.snapped_speed_limits(path)
+        self.assertEqual(2, len(result["speedLimits"]))
+
+        requests = self.server.requests
+        self.assertEqual("/v1/snapToRoads", requests[0]["path"])
+
+    def test_places(self):
+        candidates = self.client.find_place("Museum", "textquery")["candidates"]
+        self.assertEqual("Museum", candidates[0]["name"])
+
+        self.assertEqual(5, len(self.client.places("pizza")["results"]))
+        self.assertEqual(
+            5,
+            len(
+                self.client.places_nearby(location=(-33.86, 151.20), radius=500)[
+                    "results"
+                ]
+            ),
+        )
+
+        place_id = candidates[0]["place_id"]
+        self.assertEqual(place_id, self.client.place(place_id)["result"]["place_id"])
+
+        photo = b"".join(self.client.places_photo("ref", max_width=100))
+        self.assertTrue(photo.startswith(b"\x89PNG"))
+
+        self.assertEqual(5, len(self.client.places_autocomplete("Pizza")))
+        self.assertEqual(5, len(self.client.places_autocomplete_query("Pizza")))
+
+    def test_static_map(self):
+        path = StaticMapPath(points=[(62.1, -145.5), (63.1, -144.6)])
+        image = b"".join(self.client.static_map(size=(400, 400), path=path, zoom=6, center=(62, -145)))
+        self.assertTrue(image.startswith(b"\x89PNG"))
+
+    def test_geolocation(self):
+        result = self.client.geolocate(
+            wifi_access_points=[{"macAddress": "00:25:9c:cf:1c:ac"}]
+        )
+        self.assertIn("location", result)
+        self.assertEqual("POST", self.server.requests[0]["method"])
+
+    def test_addressvalidation(self):
+        result = self.client.addressvalidation(
+            ["1600 Amphitheatre Pk"], regionCode="US", locality="Mountain View"
+        )
+        self.assertEqual(
+            "1600 Amphitheatre Pk", result["result"]["address"]["formattedAddress"]
+        )
+
+    def test_inject_server_error(self):
+        self.server.inject("server_error")
+        self.client.geocode("Sydney")
+        self.assertEqual(2, len(self.server.requests))
+
+    def test_inject_over_query_limit(self):
+        client = self.server.client(retry_over_query_limit=False)
+
+        self.server.inject("over_query_limit", count=3)
+        with self.assertRaises(googlemaps.exceptions.ApiError) as e:
+            client.geocode("Sydney")
+        self.assertEqual("OVER_QUERY_LIMIT", e.exception.status)
+
+        with self.assertRaises(googlemaps.exceptions.ApiError) as e:
+            client.snap_to_roads([(0, 0)])
+        self.assertEqual("RESOURCE_EXHAUSTED", e.exception.status)
+
+        with self.assertRaises(googlemaps.exceptions.ApiError) as e:
+            client.geolocate()
+        self.assertEqual(403, e.exception.status)
+
+        with self.assertRaises(ValueError):
+            self.server.inject("unknown")
+
+    def test_invalid_request(self):
+        with self.assertRaises(googlemaps.exceptions.ApiError) as e:
+            self.client._request("/maps/api/timezone/json", {})
+        self.assertEqual("INVALID_REQUEST", e.exception.status)
+
+        with self.assertRaises(googlemaps.exceptions.HTTPError) as e:
+            self.client._request("/unknown", {})
+        self.assertEqual(404, e.exception.status_code)
+
+
+class FakeServerFaultRateTest(TestCase):
+    def test_latency(self):
+        with FakeMapsServer(latency=0.05) as server:
+            client = server.client()
+            start = time.time()
+            client.geocode("Sydney")
+            self.assertGreaterEqual(time.time() - start, 0.05)
+
+    def test_over_query_limit_rate(self):
+        with FakeMapsServer(over_query_limit_rate=0.5, seed=1) as server:
+            client = server.client(retry_over_query_limit=False)
+            failures = 0
+            for _ in range(40):
+                try:
+                    client.geocode("Sydney")
+                except googlemaps.exceptions.ApiError:
+                    failures += 1
+            self.assertTrue(10 < failures < 30)
+
+    def test_max_requests(self):
+        with FakeMapsServer(max_requests=2) as server:
+            client = server.client()
+            for address in ("Sydney", "Perth", "Hobart"):
+                client.geocode(address)
+            self.assertEqual(["Perth", "Hobart"],
+                             [r["params"]["address"] for r in server.requests])
+
+        with FakeMapsServer(max_requests=0) as server:
+            server.client().geocode("Sydney")
+            self.assertEqual(0, len(server.requests))
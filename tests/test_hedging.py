@@ -0,0 +1,218 @@
+#
+# Copyright 2026 Google Inc. All rights reserved.
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+
+"""Tests for the hedging module."""
+
+import threading
+import time
+from unittest import mock
+
+import googlemaps
+from googlemaps import hedging
+from googlemaps import ratelimit
+from googlemaps import transport
+from . import TestCase
+
+
+class _Response(object):
+    status_code = 200
+    headers = {"Content-Type": "application/json"}
+
+    def __init__(self, n):
+        self.content = ('{"status":"OK","results":[],"n":%d}' % n).encode("utf-8")
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class _SlowTransport(transport.Transport):
+    """Responds after the given delays, in order, then after default."""
+
+    def __init__(self, delays, default=0.01):
+        self.delays = list(delays)
+        self.default = default
+        self.sent = 0
+        self.responses = []
+        self._lock = threading.Lock()
+
+    def send(self, method, url, **kwargs):
+        with self._lock:
+            n = self.sent
+            self.sent += 1
+            delay = self.delays.pop(0) if self.delays else self.default
+        time.sleep(delay)
+        response = _Response(n)
+        self.responses.append(response)
+        return response
+
+
+class HedgingTest(TestCase):
+    def test_latency_tracker(self):
+        tracker = hedging.LatencyTracker(window=100, min_samples=10)
+        for i in range(9):
+            tracker.record(i)
+        self.assertIsNone(tracker.percentile(95))
+
+        for i in range(9, 200):
+            tracker.record(i % 100)
+        self.assertEqual(95, tracker.percentile(95))
+        self.assertEqual(50, tracker.percentile(50))
+
+    def test_hedge(self):
+        hedger = hedging.Hedger(max_ratio=0.1, min_samples=20)
+        slow = _SlowTransport([0.01] * 20 + [1.0])
+        send = lambda: slow.send("GET", "https://x")
+        before_hedge = mock.Mock()
+
+        for _ in range(20):
+            send_result = hedger.send("geocode", send, before_hedge)
+        self.assertIn(b'"n":19', send_result.content)
+        self.assertEqual(0, before_hedge.call_count)
+
+        start = time.time()
+        response = hedger.send("geocode", send, before_hedge)
+        self.assertLess(time.time() - start, 0.5)
+        self.assertIn(b'"n":21', response.content)
+        self.assertEqual(1, before_hedge.call_count)
+
+        # The slow response is closed when it comes in.
+        time.sleep(1)
+        self.assertTrue(slow.responses[-1].closed)
+
+        self.assertEqual(
+            {"requests": 21, "hedges": 1, "hedge_wins": 1,
+             "hedge_ratio": 1 / 21.0},
+            hedger.stats(),
+        )
+
+    def test_hedge_ratio_cap(self):
+        hedger = hedging.Hedger(max_ratio=0.05, min_samples=20)
+        slow = _SlowTransport([0.005] * 20 + [0.05] * 5)
+        send = lambda: slow.send("GET", "https://x")
+
+        for _ in range(25):
+            hedger.send("geocode", send)
+
+        # 5% of 21 requests allows a single hedge.
+        self.assertEqual(1, hedger.stats()["hedges"])
+        self.assertEqual(26, slow.sent)
+
+    def test_hedge_skipped_by_rate_limit(self):
+        hedger = hedging.Hedger(max_ratio=1, min_samples=5)
+        slow = _SlowTransport([0.01] * 5 + [0.2])
+        send = lambda: slow.send("GET", "https://x")
+        for _ in range(5):
+            hedger.send("geocode", send)
+
+        # No rate limit slot free: the primary response is awaited.
+        before_hedge = mock.Mock(return_value=False)
+        start = time.time()
+        response = hedger.send("geocode", send, before_hedge)
+        self.assertLess(time.time() - start, 0.5)
+        self.assertIn(b'"n":5', response.content)
+        self.assertEqual(1, before_hedge.call_count)
+        self.assertEqual(6, slow.sent)
+        self.assertEqual(0, hedger.stats()["hedges"])
+        self.assertEqual(0, hedger._in_flight)
+
+    def test_client_hedge_does_not_wait_for_rate_limit(self):
+        slow = _SlowTransport([0.01] * 20 + [0.2])
+        client = googlemaps.Client(
+            key="AIzaasdf", transport=slow, hedge_requests=True,
+            hedge_max_ratio=1)
+        for _ in range(20):
+            client.geocode("Sydney")
+
+        acquire = mock.Mock(return_value=False)
+        with mock.patch.object(client.rate_limiter, "acquire", acquire):
+            client.geocode("Sydney")
+        # The primary's slot, then a try for the hedge's, without waiting.
+        self.assertEqual([mock.call(ratelimit.NORMAL),
+                          mock.call(ratelimit.NORMAL, 0)],
+                         acquire.call_args_list)
+        self.assertEqual(21, slow.sent)
+        client.close()
+
+    def test_hedge_failure(self):
+        hedger = hedging.Hedger(max_ratio=1, min_samples=1)
+        hedger.send("geocode", lambda: time.sleep(0.01))
+
+        calls = []
+
+        def send():
+            calls.append(None)
+            if len(calls) == 1:
+                time.sleep(0.05)
+                raise IOError("connection reset")
+            time.sleep(0.1)
+            return "hedge"
+
+        self.assertEqual("hedge", hedger.send("geocode", send))
+
+    def test_calling_thread(self):
+        def send():
+            return threading.current_thread()
+
+        # Without hedge budget, or workers to send a hedge with, requests
+        # stay on the calling thread.
+        for hedger in (hedging.Hedger(max_ratio=0.05, min_samples=1),
+                       hedging.Hedger(max_ratio=1, min_samples=1,
+                                      max_workers=1)):
+            hedger.send("geocode", send)
+            self.assertIs(threading.current_thread(),
+                          hedger.send("geocode", send))
+            hedger.shutdown()
+
+        hedger = hedging.Hedger(max_ratio=1, min_samples=1, max_workers=2)
+        hedger.send("geocode", send)
+        self.assertIsNot(threading.current_thread(),
+                         hedger.send("geocode", send))
+        hedger.shutdown()
+
+    def test_client_close(self):
+        with googlemaps.Client(key="AIzaasdf", hedge_requests=True) as client:
+            pass
+        with self.assertRaises(RuntimeError):
+            client.hedger._executor.submit(time.sleep, 0)
+
+    def test_client(self):
+        slow = _SlowTransport([0.01] * 20 + [1.0])
+        client = googlemaps.Client(
+            key="AIzaasdf", transport=slow, hedge_requests=True,
+            hedge_max_ratio=0.1,
+        )
+        self.assertIsNone(googlemaps.Client(key="AIzaasdf").hedge_stats())
+
+        with mock.patch.object(
+            client.rate_limiter, "acquire", wraps=client.rate_limiter.acquire
+        ) as acquire:
+            for _ in range(21):
+                result = client.geocode("Sydney")
+
+        self.assertEqual(21, result["n"])
+        # The hedge counts against the rate limit.
+        self.assertEqual(22, acquire.call_count)
+        self.assertEqual(1, client.hedge_stats()["hedge_wins"])
+
+        # Streamed and POST requests are never hedged.
+        client._request("/maps/api/place/photo", {},
+                        extract_body=lambda r: r,
+                        requests_kwargs={"stream": True})
+        client._request("/geolocation/v1/geolocate", {},
+                        extract_body=lambda r: r, post_json={})
+        self.assertEqual(21, client.hedge_stats()["requests"])
@@ -68,6 +68,18 @@ class MapsTest(TestCase):
             str(path),
         )
 
+    def test_static_map_path_max_length(self):
+        points = [(40.0, -74.0 + i * 0.001) for i in range(100)]
+        points[50] = (40.001, -73.95)
+
+        path = StaticMapPath(points=points[:2], max_length=30)
+        self.assertEqual("40,-74|40,-73.999", str(path))
+        self.assertEqual(0.0, path.deviation)
+
+        path = StaticMapPath(points=points, max_length=30)
+        self.assertEqual("enc:_ocsF~btbMgEowHfEgqH", str(path))
+        self.assertAlmostEqual(109, path.deviation, places=0)
+
     @responses.activate
     def test_download(self):
         url = "https://maps.googleapis.com/maps/api/staticmap"
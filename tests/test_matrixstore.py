@@ -0,0 +1,216 @@
+#
+# Copyright 2026 Google Inc. All rights reserved.
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+
+"""Tests for the matrixstore module."""
+
+import os
+import shutil
+import tempfile
+
+from googlemaps import matrixstore
+from googlemaps.fakeserver import FakeMapsServer
+from . import TestCase
+
+
+def _elements(requests):
+    return sum((r["params"]["origins"].count("|") + 1) *
+               (r["params"]["destinations"].count("|") + 1)
+               for r in requests)
+
+
+class DistanceMatrixStoreTest(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.origins = [(-33 - i * 0.01, 151) for i in range(12)]
+        self.destinations = [(-34, 150 + i * 0.01) for i in range(12)]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_incremental(self):
+        store = matrixstore.DistanceMatrixStore()
+
+        with FakeMapsServer() as server:
+            client = server.client()
+            matrix = store.distance_matrix(client, self.origins,
+                                           self.destinations)
+            self.assertEqual(144, _elements(server.requests))
+            self.assertEqual(144, len(store))
+
+            # A new origin and destination cost a row and a column.
+            origins = self.origins + [(-33.5, 151)]
+            destinations = [(-34, 149.9)] + self.destinations
+            updated = store.distance_matrix(client, origins, destinations)
+            self.assertEqual(144 + 13 + 12, _elements(server.requests))
+            self.assertEqual(144 + 13 + 12, len(store))
+            self.assertEqual(144, store.hits)
+            self.assertEqual(144 + 13 + 12, store.misses)
+
+            expected = client.distance_matrix(origins[-2:],
+                                              destinations[:2])
+
+        self.assertEqual(13, len(updated["rows"]))
+        self.assertEqual(matrix["rows"][0]["elements"],
+                         updated["rows"][0]["elements"][1:])
+        self.assertEqual(matrix["origin_addresses"],
+                         updated["origin_addresses"][:12])
+        for i, row in enumerate(expected["rows"]):
+            self.assertEqual(row["elements"],
+                             updated["rows"][11 + i]["elements"][:2])
+
+    def test_options(self):
+        store = matrixstore.DistanceMatrixStore(time_bucket=3600)
+
+        with FakeMapsServer() as server:
+            client = server.client()
+            store.distance_matrix(client, self.origins, self.destinations)
+            store.distance_matrix(client, self.origins, self.destinations,
+                                  mode="driving")
+            self.assertEqual(144, _elements(server.requests))
+
+            # Elements are kept per mode and time bucket.
+            store.distance_matrix(client, self.origins, self.destinations,
+                                  mode="walking")
+            store.distance_matrix(client, self.origins, self.destinations,
+                                  departure_time=7300)
+            store.distance_matrix(client, self.origins, self.destinations,
+                                  departure_time=7400)
+            self.assertEqual(432, _elements(server.requests))
+            # Departure times are rounded up to the end of their bucket.
+            self.assertEqual("10800",
+                             server.requests[-1]["params"]["departure_time"])
+
+            # So are departures "now".
+            store.distance_matrix(client, self.origins, self.destinations,
+                                  departure_time="now")
+            store.distance_matrix(client, self.origins, self.destinations,
+                                  departure_time="now")
+            self.assertIn(_elements(server.requests), (576, 720))
+            self.assertNotEqual(
+                "now", server.requests[-1]["params"]["departure_time"])
+
+            # Without buckets, elements for "now" are never stored.
+            store = matrixstore.DistanceMatrixStore()
+            sent = _elements(server.requests)
+            store.distance_matrix(client, self.origins, self.destinations,
+                                  departure_time="now")
+            store.distance_matrix(client, self.origins, self.destinations,
+                                  departure_time="now")
+            self.assertEqual(sent + 288, _elements(server.requests))
+            self.assertEqual(0, len(store))
+
+    def test_max_age(self):
+        store = matrixstore.DistanceMatrixStore(max_age=60)
+
+        with FakeMapsServer() as server:
+            client = server.client()
+            store.distance_matrix(client, self.origins, self.destinations)
+            store.distance_matrix(client, self.origins, self.destinations)
+            self.assertEqual(144, _elements(server.requests))
+
+            # Elements older than max_age are requested again.
+            for key in store._fetched_at:
+                store._fetched_at[key] -= 61
+            store.distance_matrix(client, self.origins, self.destinations)
+            self.assertEqual(288, _elements(server.requests))
+
+    def test_duplicates(self):
+        store = matrixstore.DistanceMatrixStore()
+
+        with FakeMapsServer() as server:
+            client = server.client()
+            matrix = store.distance_matrix(
+                client, ["Sydney", "Sydney"], ["Melbourne", "Perth"])
+
+            self.assertEqual(1, len(server.requests))
+            self.assertEqual("Sydney", server.requests[0]["params"]["origins"])
+        self.assertEqual(matrix["rows"][0], matrix["rows"][1])
+        self.assertIsNot(matrix["rows"][0]["elements"][0],
+                         matrix["rows"][1]["elements"][0])
+
+    def test_copies(self):
+        store = matrixstore.DistanceMatrixStore()
+
+        with FakeMapsServer() as server:
+            client = server.client()
+            matrix = store.distance_matrix(client, "Sydney", "Melbourne")
+            expected = matrix["rows"][0]["elements"][0]["distance"]["value"]
+            matrix["rows"][0]["elements"][0]["distance"]["value"] = -999
+
+            again = store.distance_matrix(client, "Sydney", "Melbourne")
+            again["rows"][0]["elements"][0]["distance"]["value"] = -999
+            element = store.distance_matrix(
+                client, "Sydney", "Melbourne")["rows"][0]["elements"][0]
+            self.assertEqual(1, len(server.requests))
+
+        self.assertEqual(expected, element["distance"]["value"])
+
+    def test_save_and_load(self):
+        path = os.path.join(self.tmpdir, "matrix.json.gz")
+        store = matrixstore.DistanceMatrixStore(path, time_bucket=300,
+                                                max_age=3600)
+
+        with FakeMapsServer() as server:
+            client = server.client()
+            matrix = store.distance_matrix(client, self.origins,
+                                           self.destinations, mode="walking")
+            store.save()
+            sent = len(server.requests)
+
+            loaded = matrixstore.DistanceMatrixStore.load(path)
+            self.assertEqual(300, loaded.time_bucket)
+            self.assertEqual(3600, loaded.max_age)
+            self.assertEqual(144, len(loaded))
+            self.assertEqual(matrix, loaded.distance_matrix(
+                client, self.origins, self.destinations, mode="walking"))
+            self.assertEqual(sent, len(server.requests))
+
+    def test_load_unsupported(self):
+        path = os.path.join(self.tmpdir, "matrix.json")
+        with open(path, "w") as f:
+            f.write('{"version": 99}')
+
+        with self.assertRaises(ValueError):
+            matrixstore.DistanceMatrixStore.load(path)
+
+    def test_symmetric(self):
+        store = matrixstore.DistanceMatrixStore()
+        locations = self.origins[:10]
+
+        with FakeMapsServer() as server:
+            client = server.client()
+            matrix = store.distance_matrix(client, locations, locations,
+                                           mode="walking", skip_diagonal=True,
+                                           symmetric=True)
+            self.assertEqual(45, store.misses)
+            self.assertEqual(55, store.saved)
+            self.assertEqual(45, _elements(server.requests))
+            self.assertEqual(45, len(store))
+
+            # Adding a location costs one element per other location.
+            locations = locations + [(-33.5, 151)]
+            store.distance_matrix(client, locations, locations,
+                                  mode="walking", skip_diagonal=True,
+                                  symmetric=True)
+            self.assertEqual(55, _elements(server.requests))
+
+        for i in range(10):
+            self.assertEqual(0, matrix["rows"][i]["elements"][i]["distance"]
+                             ["value"])
+            for j in range(10):
+                self.assertEqual(matrix["rows"][i]["elements"][j],
+                                 matrix["rows"][j]["elements"][i])
@@ -0,0 +1,126 @@
+#
+# Copyright 2026 Google Inc. All rights reserved.
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+
+"""Tests for the models module."""
+
+from googlemaps import convert
+from googlemaps import models
+from googlemaps.fakeserver import FakeMapsServer
+from . import TestCase
+
+
+class ModelsTest(TestCase):
+    def test_geocode_result(self):
+        raw = {
+            "place_id": "ChIJP3Sa8ziYEmsRUKgyFmh9AQM",
+            "formatted_address": "Sydney NSW, Australia",
+            "types": ["locality", "political"],
+            "geometry": {
+                "location": {"lat": -33.8688197, "lng": 151.2092955},
+                "location_type": "APPROXIMATE",
+            },
+        }
+        result = models.GeocodeResult(raw)
+
+        self.assertEqual("ChIJP3Sa8ziYEmsRUKgyFmh9AQM", result.place_id)
+        self.assertEqual((-33.8688197, 151.2092955), result.location)
+        self.assertEqual("APPROXIMATE", result.location_type)
+        self.assertEqual(["locality", "political"], result.types)
+        self.assertEqual((), result.address_components)
+        self.assertFalse(result.partial_match)
+        self.assertIsNone(result.viewport)
+        self.assertIs(raw, result.to_dict())
+        self.assertEqual(models.GeocodeResult(dict(raw)), result)
+        self.assertEqual("<GeocodeResult 'Sydney NSW, Australia'>",
+                         repr(result))
+
+        with self.assertRaises(AttributeError):
+            result.extra = 1
+
+    def test_route(self):
+        steps = [
+            {"html_instructions": "Head north", "distance": {"value": 100},
+             "duration": {"value": 20},
+             "start_location": {"lat": 1, "lng": 2}},
+            {"html_instructions": "Walk to the stop", "travel_mode": "WALKING",
+             "steps": [{"html_instructions": "Turn left"}]},
+        ]
+        raw = {
+            "summary": "M1",
+            "legs": [
+                {"distance": {"value": 1000, "text": "1 km"},
+                 "duration": {"value": 60}, "end_address": "B",
+                 "steps": steps},
+                {"distance": {"value": 500}, "duration": {"value": 30}},
+            ],
+            "overview_polyline": {"points": "_p~iF~ps|U_ulLnnqC"},
+        }
+        route = models.Route(raw)
+
+        self.assertEqual("M1", route.summary)
+        self.assertEqual(1500, route.distance)
+        self.assertEqual(90, route.duration)
+        self.assertEqual(2, len(route.legs))
+        # Nested results are wrapped once.
+        self.assertIs(route.legs, route.legs)
+        self.assertIs(route.legs[0].steps, route.legs[0].steps)
+
+        step = route.legs[0].steps[0]
+        self.assertIsInstance(step, models.Step)
+        self.assertEqual("Head north", step.html_instructions)
+        self.assertEqual(100, step.distance)
+        self.assertEqual((1, 2), step.start_location)
+        self.assertEqual([], step.steps)
+        self.assertEqual("Turn left", route.legs[0].steps[1].steps[0]
+                         .html_instructions)
+        self.assertEqual([], route.legs[1].steps)
+        self.assertIs(steps[0], step.to_dict())
+
+        self.assertEqual(
+            convert.LatLngArray([38.5, 40.7], [-120.2, -120.95]),
+            route.overview_path)
+
+    def test_place(self):
+        place = models.Place({
+            "name": "Sydney Opera House",
+            "geometry": {"location": {"lat": -33.8567844, "lng": 151.213108}},
+            "opening_hours": {"open_now": True},
+            "rating": 4.7,
+        })
+
+        self.assertEqual("Sydney Opera House", place.name)
+        self.assertEqual((-33.8567844, 151.213108), place.location)
+        self.assertTrue(place.open_now)
+        self.assertEqual(4.7, place.rating)
+        self.assertIsNone(place.price_level)
+
+    def test_wrap_results(self):
+        with FakeMapsServer() as server:
+            client = server.client()
+            geocoded = models.GeocodeResult.from_list(
+                client.geocode("Sydney"))
+            elevations = models.ElevationResult.from_list(
+                client.elevation([(-33.8, 151.2)]))
+            points = models.SnappedPoint.from_list(
+                client.snap_to_roads([(-33.8, 151.2), (-33.81, 151.21)]))
+
+        self.assertTrue(geocoded)
+        self.assertEqual(2, len(geocoded[0].location))
+        self.assertIsInstance(elevations[0].elevation, float)
+        self.assertEqual(2, len(elevations[0].location))
+        self.assertEqual(0, points[0].original_index)
+        self.assertEqual(2, len(points[0].location))
@@ -0,0 +1,146 @@
+#
+# Copyright 2026 Google Inc. All rights reserved.
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+
+"""Tests for the optimization module."""
+
+import math
+import random
+import time
+
+from googlemaps import matrixstore
+from googlemaps import optimization
+from googlemaps.fakeserver import FakeMapsServer
+from . import TestCase
+
+
+def _euclidean(points):
+    return [[math.hypot(a[0] - b[0], a[1] - b[1]) for b in points]
+            for a in points]
+
+
+def _elements(requests):
+    return sum((r["params"]["origins"].count("|") + 1) *
+               (r["params"]["destinations"].count("|") + 1)
+               for r in requests)
+
+
+class OptimizationTest(TestCase):
+    def test_solve_tsp_circle(self):
+        # Points on a circle, shuffled: the optimal tour goes around it.
+        random.seed(0)
+        angles = [2 * math.pi * i / 20 for i in range(20)]
+        random.shuffle(angles)
+        points = [(math.cos(a), math.sin(a)) for a in angles]
+        costs = _euclidean(points)
+
+        order = optimization.solve_tsp(costs, start=0, end=0)
+
+        self.assertEqual(sorted(order), list(range(20)))
+        self.assertEqual(0, order[0])
+        self.assertAlmostEqual(20 * 2 * math.sin(math.pi / 20),
+                               optimization.tour_cost(costs, order + [0]))
+
+    def test_solve_tsp_open_path(self):
+        points = [(0, 0), (5, 0), (1, 0), (3, 0), (2, 0), (4, 0)]
+        costs = _euclidean(points)
+
+        self.assertEqual([0, 2, 4, 3, 5, 1],
+                         optimization.solve_tsp(costs, start=0))
+        # The end is fixed, even if it is not the cheapest one.
+        order = optimization.solve_tsp(costs, start=0, end=4)
+        self.assertEqual(0, order[0])
+        self.assertEqual(4, order[-1])
+        self.assertEqual(list(range(6)), sorted(order))
+
+    def test_solve_tsp_asymmetric(self):
+        # Going around clockwise is cheap, anticlockwise expensive.
+        n = 8
+        costs = [[0 if i == j else 1 if j == (i + 1) % n else 10
+                  for j in range(n)] for i in range(n)]
+
+        order = optimization.solve_tsp(costs, start=3, end=3)
+
+        self.assertEqual([3, 4, 5, 6, 7, 0, 1, 2], order)
+
+    def test_solve_tsp_time(self):
+        random.seed(1)
+        points = [(random.random(), random.random()) for _ in range(200)]
+        costs = _euclidean(points)
+
+        start = time.monotonic()
+        order = optimization.solve_tsp(costs, start=0, end=0, time_limit=1.0)
+        elapsed = time.monotonic() - start
+
+        self.assertLess(elapsed, 1.5)
+        self.assertEqual(list(range(200)), sorted(order))
+        # Well under the cost of the nearest neighbor tour.
+        nearest = optimization._nearest_neighbor(costs, 0, range(1, 200), 0)
+        self.assertLess(optimization.tour_cost(costs, order + [0]),
+                        optimization.tour_cost(costs, nearest))
+
+    def test_solve_tsp_invalid(self):
+        with self.assertRaises(ValueError):
+            optimization.solve_tsp([[0]], start=1)
+
+    def test_optimize_waypoints(self):
+        waypoints = [(-33, 151 + i * 0.01) for i in (3, 1, 4, 5, 2)]
+        store = matrixstore.DistanceMatrixStore()
+
+        with FakeMapsServer() as server:
+            client = server.client()
+            order = client.optimize_waypoints((-33, 151), waypoints,
+                                              mode="walking", store=store)
+            self.assertEqual([1, 4, 0, 2, 3], order)
+            # The diagonal is not requested.
+            self.assertEqual(30, _elements(server.requests))
+            self.assertEqual(30, len(store))
+            requests = len(server.requests)
+
+            order = client.optimize_waypoints((-33, 151), waypoints,
+                                              destination=(-33, 151.025),
+                                              mode="walking", store=store)
+            self.assertEqual([1, 4, 0, 2, 3], order)
+            # Only the costs from and to the destination are requested.
+            shapes = sorted(
+                (r["params"]["origins"].count("|") + 1,
+                 r["params"]["destinations"].count("|") + 1)
+                for r in list(server.requests)[requests:])
+            self.assertEqual([(1, 6), (6, 1)], shapes)
+            self.assertEqual(42, len(store))
+            requests = len(server.requests)
+
+            order = client.optimize_waypoints((-33, 151), waypoints,
+                                              roundtrip=True,
+                                              mode="walking", store=store)
+            # Any tour out to the furthest stop and back is optimal.
+            lngs = [151] + [waypoints[i][1] for i in order] + [151]
+            self.assertAlmostEqual(
+                0.1, sum(abs(a - b) for a, b in zip(lngs, lngs[1:])))
+            self.assertEqual(requests, len(server.requests))
+
+    def test_cost(self):
+        element = {"status": "OK", "distance": {"value": 1200},
+                   "duration": {"value": 300}}
+        self.assertEqual(1200, optimization._cost(element, "distance"))
+        # Falls back to the duration without traffic information.
+        self.assertEqual(300,
+                         optimization._cost(element, "duration_in_traffic"))
+        self.assertEqual(1e12, optimization._cost({"status": "ZERO_RESULTS"},
+                                                  "duration"))
+
+        with self.assertRaises(ValueError):
+            optimization.cost_matrix(None, ["A"], metric="speed")
@@ -0,0 +1,192 @@
+#
+# Copyright 2026 Google Inc. All rights reserved.
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+
+"""Tests for the ratelimit module."""
+
+import threading
+import time
+from unittest import mock
+
+import googlemaps
+from googlemaps import ratelimit
+from googlemaps.fakeserver import FakeMapsServer
+from . import TestCase
+
+
+class RateLimiterTest(TestCase):
+    def _acquire_in_threads(self, limiter, priorities):
+        """Queues one thread per priority, in order, and returns the
+        priorities in the order the threads got through."""
+        order = []
+        lock = threading.Lock()
+
+        def acquire(priority):
+            limiter.acquire(priority)
+            with lock:
+                order.append(priority)
+
+        threads = []
+        for priority in priorities:
+            thread = threading.Thread(target=acquire, args=(priority,))
+            thread.start()
+            threads.append(thread)
+            # Make sure the threads queue up in order.
+            time.sleep(0.01)
+        for thread in threads:
+            thread.join()
+        return order
+
+    def test_rate(self):
+        limiter = ratelimit.RateLimiter(5, period=0.2)
+        start = time.monotonic()
+        for _ in range(15):
+            limiter.acquire()
+        self.assertTrue(0.4 <= time.monotonic() - start < 0.6)
+
+    def test_unlimited(self):
+        limiter = ratelimit.RateLimiter(0)
+        for _ in range(1000):
+            limiter.acquire()
+
+    def test_priority(self):
+        limiter = ratelimit.RateLimiter(1, period=0.2)
+        limiter.acquire()
+
+        order = self._acquire_in_threads(
+            limiter,
+            [ratelimit.BATCH, ratelimit.NORMAL, ratelimit.BATCH,
+             ratelimit.INTERACTIVE, ratelimit.NORMAL],
+        )
+
+        # All of them queued up before the first slot freed up.
+        self.assertEqual(
+            [ratelimit.INTERACTIVE, ratelimit.NORMAL, ratelimit.NORMAL,
+             ratelimit.BATCH, ratelimit.BATCH],
+            order,
+        )
+
+    def test_batch_share(self):
+        limiter = ratelimit.RateLimiter(10, period=0.3, batch_share=0.5)
+
+        start = time.monotonic()
+        for _ in range(5):
+            limiter.acquire(ratelimit.BATCH)
+        self.assertLess(time.monotonic() - start, 0.1)
+
+        # Batch requests are held back, the others use the leftover quota.
+        for _ in range(5):
+            limiter.acquire(ratelimit.INTERACTIVE)
+        self.assertLess(time.monotonic() - start, 0.1)
+
+        limiter.acquire(ratelimit.BATCH)
+        self.assertGreaterEqual(time.monotonic() - start, 0.3)
+
+        with self.assertRaises(ValueError):
+            ratelimit.RateLimiter(10, batch_share=1.5)
+
+    def test_client_priority(self):
+        with FakeMapsServer() as server:
+            client = server.client(batch_quota_share=0.5)
+            self.assertEqual(0.5, client.rate_limiter.batch_share)
+
+            with mock.patch.object(client.rate_limiter, "acquire") as acquire:
+                client.geocode("Sydney")
+                client.geocode("Sydney", priority=ratelimit.INTERACTIVE)
+                client.map("geocode", ["Sydney"], priority=ratelimit.BATCH)
+                client.map(
+                    "geocode",
+                    [{"address": "Sydney", "priority": ratelimit.INTERACTIVE}],
+                    priority=ratelimit.BATCH,
+                )
+
+            self.assertEqual(
+                [mock.call(ratelimit.NORMAL), mock.call(ratelimit.INTERACTIVE),
+                 mock.call(ratelimit.BATCH), mock.call(ratelimit.INTERACTIVE)],
+                acquire.call_args_list,
+            )
+
+    def test_adaptive(self):
+        limiter = ratelimit.RateLimiter(100, period=0.1, adaptive=True)
+        self.assertEqual(100, limiter.effective_rate)
+
+        limiter.throttled()
+        self.assertAlmostEqual(50, limiter.effective_rate, delta=1)
+        # Ignored: likely caused by requests sent before the decrease.
+        limiter.throttled()
+        self.assertAlmostEqual(50, limiter.effective_rate, delta=1)
+
+        time.sleep(0.1)
+        limiter.throttled()
+        self.assertLess(limiter.effective_rate, 30)
+
+        # Recovers by 5 (5% of rate) per period.
+        rate = limiter.effective_rate
+        time.sleep(0.2)
+        self.assertAlmostEqual(rate + 10, limiter.effective_rate, delta=2)
+        time.sleep(1.6)
+        self.assertEqual(100, limiter.effective_rate)
+
+        limiter = ratelimit.RateLimiter(
+            100, period=0.01, adaptive=True, min_rate=10, increase=0.01
+        )
+        for _ in range(10):
+            time.sleep(0.01)
+            limiter.throttled()
+        self.assertAlmostEqual(10, limiter.effective_rate, delta=0.5)
+
+    def test_adaptive_limits_sends(self):
+        limiter = ratelimit.RateLimiter(20, period=0.2, adaptive=True)
+        limiter.throttled()
+        start = time.monotonic()
+        for _ in range(20):
+            limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+
+        static = ratelimit.RateLimiter(20, period=0.2)
+        static.throttled()
+        self.assertEqual(20, static.effective_rate)
+
+    def test_client_adaptive(self):
+        with FakeMapsServer() as server:
+            client = server.client(
+                queries_per_second=100, adaptive_rate_limit=True,
+                retry_over_query_limit=False,
+            )
+            self.assertEqual(100, client.rate_limiter.effective_rate)
+
+            server.inject("over_query_limit")
+            with self.assertRaises(googlemaps.exceptions.ApiError):
+                client.geocode("Sydney")
+            self.assertLess(client.rate_limiter.effective_rate, 51)
+
+            # The retry after the error is delayed, during which the rate
+            # starts recovering.
+            client = server.client(queries_per_second=100, adaptive_rate_limit=True)
+            server.inject("server_error")
+            client.geocode("Sydney")
+            self.assertLess(client.rate_limiter.effective_rate, 60)
+
+    def test_acquire_timeout(self):
+        limiter = ratelimit.RateLimiter(1, period=0.5)
+        self.assertTrue(limiter.acquire(timeout=0.1))
+
+        start = time.monotonic()
+        self.assertFalse(limiter.acquire(timeout=0.1))
+        self.assertLess(time.monotonic() - start, 0.3)
+
+        # The abandoned wait doesn't hold up the others.
+        self.assertTrue(limiter.acquire(timeout=1))
@@ -0,0 +1,125 @@
+#
+# Copyright 2026 Google Inc. All rights reserved.
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+
+"""Tests for the recording module."""
+
+import os
+import shutil
+import tempfile
+import time
+
+import googlemaps
+from googlemaps import recording
+from googlemaps.fakeserver import FakeMapsServer
+from . import TestCase
+
+
+class RecordingTest(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "maps.json.gz")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _record(self, calls, **kwargs):
+        with FakeMapsServer(**kwargs) as server:
+            client = server.client(cassette=self.path, cassette_mode="record")
+            results = [call(client) for call in calls]
+            client.cassette.save()
+            return server, results
+
+    def _replay_client(self, **kwargs):
+        # Pointed at the live APIs, but never reaching them.
+        return googlemaps.Client(
+            key="AIzaReplay", queries_per_second=1000000,
+            queries_per_minute=None, cassette=self.path, **kwargs)
+
+    def test_request_key(self):
+        self.assertEqual(
+            "GET /maps/api/geocode/json?address=Sydney&language=en",
+            recording.request_key(
+                "get", "https://maps.googleapis.com/maps/api/geocode/json?"
+                "language=en&address=Sydney&key=AIzaasdf"))
+        self.assertEqual(
+            recording.request_key(
+                "GET", "https://maps.googleapis.com/maps/api/geocode/json?"
+                "address=Sydney&client=foo&signature=abc"),
+            recording.request_key(
+                "GET", "https://maps.googleapis.com/maps/api/geocode/json?"
+                "key=AIzaasdf&address=Sydney"))
+        self.assertEqual(
+            'POST /geolocation/v1/geolocate {"a":2,"b":1}',
+            recording.request_key(
+                "POST", "http://localhost:8080/geolocation/v1/geolocate?key=a",
+                b'{"b": 1, "a": 2}'))
+
+    def test_record_and_replay(self):
+        calls = [
+            lambda c: c.geocode("Sydney"),
+            lambda c: c.distance_matrix(["Sydney"], ["Melbourne", "Perth"]),
+            lambda c: c.snap_to_roads([(-33.86, 151.20), (-33.87, 151.21)]),
+            lambda c: c.geolocate(consider_ip=False),
+            lambda c: b"".join(c.static_map(size=(100, 100), center="Sydney",
+                                            zoom=5)),
+        ]
+        server, recorded = self._record(calls)
+        self.assertEqual(len(calls), len(server.requests))
+        self.assertEqual(len(calls), len(recording.Cassette.load(self.path)))
+
+        # The server is gone: responses come from the cassette.
+        client = self._replay_client()
+        self.assertEqual(recorded, [call(client) for call in calls])
+        self.assertEqual({}, client.warmup())
+
+        with self.assertRaises(googlemaps.exceptions.TransportError) as e:
+            client.geocode("Melbourne")
+        self.assertIn("No recorded response", str(e.exception))
+
+    def test_replay_in_order(self):
+        def geocode(client):
+            server.inject("server_error")
+            return client.geocode("Sydney")
+
+        with FakeMapsServer() as server:
+            client = server.client(cassette=self.path, cassette_mode="record")
+            expected = geocode(client)
+            client.cassette.save()
+
+        # The 503 is replayed too, and the client retries.
+        client = self._replay_client()
+        self.assertEqual(2, len(client.cassette))
+        self.assertEqual(expected, client.geocode("Sydney"))
+        self.assertEqual(expected, client.geocode("Sydney"))
+
+    def test_replay_timing(self):
+        self._record([lambda c: c.geocode("Sydney")], latency=0.05)
+
+        client = self._replay_client()
+        start = time.time()
+        client.geocode("Sydney")
+        self.assertLess(time.time() - start, 0.05)
+
+        client = self._replay_client(replay_speed=1.0)
+        start = time.time()
+        client.geocode("Sydney")
+        self.assertGreaterEqual(time.time() - start, 0.05)
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            googlemaps.Client(key="AIzaasdf", cassette=self.path,
+                              cassette_mode="rewind")
@@ -49,6 +49,52 @@ class RoadsTest(TestCase):
             responses.calls[0].request.url,
         )
 
+    @responses.activate
+    def test_snap_max_points(self):
+        responses.add(
+            responses.GET,
+            "https://roads.googleapis.com/v1/snapToRoads",
+            body='{"snappedPoints":["foo"]}',
+            status=200,
+            content_type="application/json",
+        )
+
+        path = [(40.0, -74.0 + i * 0.001) for i in range(150)]
+        path[50] = (40.001, -73.95)
+        self.client.snap_to_roads(path, max_points=3)
+
+        self.assertURLEqual(
+            "https://roads.googleapis.com/v1/snapToRoads?"
+            "path=40%%2C-74%%7C40.001%%2C-73.95%%7C40%%2C-73.851&key=%s"
+            % self.key,
+            responses.calls[0].request.url,
+        )
+
+    @responses.activate
+    def test_snap_max_length(self):
+        responses.add(
+            responses.GET,
+            "https://roads.googleapis.com/v1/snapToRoads",
+            body='{"snappedPoints":["foo"]}',
+            status=200,
+            content_type="application/json",
+        )
+
+        path = [(40.0, -74.0 + i * 0.001) for i in range(150)]
+        path[50] = (40.001, -73.95)
+        points, deviation = self.client.snap_to_roads(
+            path, interpolate=True, max_length=125, return_deviation=True)
+
+        self.assertEqual(["foo"], points)
+        self.assertURLEqual(
+            "https://roads.googleapis.com/v1/snapToRoads?"
+            "path=40%%2C-74%%7C40.001%%2C-73.95%%7C40%%2C-73.851&"
+            "interpolate=true&key=%s" % self.key,
+            responses.calls[0].request.url,
+        )
+        self.assertLessEqual(len(responses.calls[0].request.url), 125)
+        self.assertGreater(deviation, 0)
+
     @responses.activate
     def test_nearest_roads(self):
         responses.add(
@@ -0,0 +1,253 @@
+#
+# Copyright 2026 Google Inc. All rights reserved.
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+
+"""Tests for the streaming module."""
+
+import json
+from unittest import mock
+
+import responses
+
+import googlemaps
+from googlemaps import ratelimit
+from googlemaps import transport
+from googlemaps.streaming import JSONArrayStream
+from . import TestCase
+
+
+DOCUMENT = {
+    "destination_addresses": ["A [1]", 'B "quoted" {x}'],
+    "origin_addresses": ["rows", "C \\ D"],
+    "rows": [
+        {
+            "elements": [
+                {"distance": {"text": "1 km", "value": 1000}, "status": "OK"},
+                {"distance": {"text": "2 km", "value": 2000}, "status": "OK"},
+            ]
+        },
+        {"elements": [{"status": "NOT_FOUND", "note": "a,b]c}é\\\""}]},
+        [1, [2, [3]]],
+        "rows",
+        4.5,
+        None,
+    ],
+    "status": "OK",
+}
+
+
+class JSONArrayStreamTest(TestCase):
+    def _feed_all(self, data, chunk_size):
+        stream = JSONArrayStream("rows")
+        elements = []
+        for i in range(0, len(data), chunk_size):
+            elements.extend(stream.feed(data[i : i + chunk_size]))
+        return elements, stream.close()
+
+    def test_chunk_sizes(self):
+        for indent in (None, 2):
+            data = json.dumps(DOCUMENT, indent=indent).encode("utf-8")
+            for chunk_size in (1, 2, 3, 7, 64, len(data)):
+                elements, rest = self._feed_all(data, chunk_size)
+                self.assertEqual(DOCUMENT["rows"], elements)
+                self.assertEqual(dict(DOCUMENT, rows=[]), rest)
+
+    def test_empty_array(self):
+        elements, rest = self._feed_all(b'{"rows" : [ ], "status": "OK"}', 5)
+        self.assertEqual([], elements)
+        self.assertEqual({"rows": [], "status": "OK"}, rest)
+
+    def test_missing_array(self):
+        elements, rest = self._feed_all(b'{"status": "INVALID_REQUEST"}', 4)
+        self.assertEqual([], elements)
+        self.assertEqual({"status": "INVALID_REQUEST"}, rest)
+
+    def test_nested_key_not_streamed(self):
+        data = b'{"a": {"rows": [1, 2]}, "rows": [3]}'
+        elements, rest = self._feed_all(data, 3)
+        self.assertEqual([3], elements)
+        self.assertEqual({"a": {"rows": [1, 2]}, "rows": []}, rest)
+
+    def test_elements_available_early(self):
+        stream = JSONArrayStream("rows")
+        self.assertEqual([], stream.feed(b'{"rows": [{"a": 1}'))
+        self.assertEqual([{"a": 1}], stream.feed(b", "))
+        self.assertEqual([{"b": 2}], stream.feed(b'{"b": 2}]'))
+        self.assertEqual([], stream.feed(b', "status": "OK"}'))
+
+    def test_truncated(self):
+        stream = JSONArrayStream("rows")
+        stream.feed(b'{"rows": [{"a": 1}, {"b"')
+        with self.assertRaises(ValueError):
+            stream.close()
+
+
+class _Response(object):
+    def __init__(self, status_code, body=b""):
+        self.status_code = status_code
+        self.headers = {"Content-Type": "application/json"}
+        self.content = body
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        return iter([self.content])
+
+    def close(self):
+        self.closed = True
+
+
+class _QueuedTransport(transport.Transport):
+    """Returns the queued responses in order, recording the priority and
+    deadline each request was sent with."""
+
+    def __init__(self, client, responses):
+        self.client = client
+        self.responses = list(responses)
+        self.sent = []
+
+    def send(self, method, url, headers=None, body=None, timeout=None,
+             stream=False, **kwargs):
+        local = self.client._local
+        self.sent.append((stream, getattr(local, "priority", None),
+                          getattr(local, "deadline", None)))
+        return self.responses.pop(0)
+
+
+class StreamingTest(TestCase):
+    def setUp(self):
+        self.key = "AIzaasdf"
+        self.client = googlemaps.Client(self.key)
+        self.url = "https://maps.googleapis.com/maps/api/distancematrix/json"
+
+    @responses.activate
+    def test_distance_matrix_stream(self):
+        responses.add(
+            responses.GET,
+            self.url,
+            body=json.dumps(DOCUMENT),
+            status=200,
+            content_type="application/json",
+        )
+
+        rows = self.client.distance_matrix_stream(
+            ["Sydney"], ["Melbourne", "Perth"], mode="walking"
+        )
+
+        # The request is sent before iteration starts.
+        self.assertEqual(1, len(responses.calls))
+        self.assertEqual(DOCUMENT["rows"], list(rows))
+        self.assertURLEqual(
+            "%s?origins=Sydney&destinations=Melbourne%%7CPerth&mode=walking"
+            "&key=%s" % (self.url, self.key),
+            responses.calls[0].request.url,
+        )
+
+    @responses.activate
+    def test_directions_stream(self):
+        url = "https://maps.googleapis.com/maps/api/directions/json"
+        responses.add(
+            responses.GET,
+            url,
+            body='{"geocoded_waypoints": [{"place_id": "x"}],'
+            '"routes": [{"summary": "A"}, {"summary": "B"}], "status": "OK"}',
+            status=200,
+            content_type="application/json",
+        )
+
+        routes = self.client.directions_stream(
+            "Sydney", "Melbourne", alternatives=True, extra_params={"foo": "bar"}
+        )
+
+        self.assertEqual([{"summary": "A"}, {"summary": "B"}], list(routes))
+        self.assertURLEqual(
+            "%s?origin=Sydney&destination=Melbourne&alternatives=true&foo=bar"
+            "&key=%s" % (url, self.key),
+            responses.calls[0].request.url,
+        )
+
+    @responses.activate
+    def test_stream_api_error(self):
+        responses.add(
+            responses.GET,
+            self.url,
+            body='{"rows": [], "status": "REQUEST_DENIED"}',
+            status=200,
+            content_type="application/json",
+        )
+
+        rows = self.client.distance_matrix_stream("Sydney", "Melbourne")
+        with self.assertRaises(googlemaps.exceptions.ApiError) as e:
+            list(rows)
+        self.assertEqual("REQUEST_DENIED", e.exception.status)
+
+    @responses.activate
+    def test_stream_http_error(self):
+        responses.add(responses.GET, self.url, status=404)
+
+        with self.assertRaises(googlemaps.exceptions.HTTPError):
+            self.client.distance_matrix_stream("Sydney", "Melbourne")
+
+    @responses.activate
+    def test_stream_over_query_limit_retried(self):
+        responses.add(
+            responses.GET,
+            self.url,
+            body='{"rows": [], "status": "OVER_QUERY_LIMIT"}',
+            status=200,
+            content_type="application/json",
+        )
+        responses.add(
+            responses.GET,
+            self.url,
+            body='{"rows": [{"elements": []}], "status": "OK"}',
+            status=200,
+            content_type="application/json",
+        )
+
+        rows = self.client.distance_matrix_stream(
+            "Sydney", "Melbourne", extra_params={"foo": "bar"}
+        )
+
+        self.assertEqual([{"elements": []}], list(rows))
+        self.assertEqual(2, len(responses.calls))
+        self.assertEqual(responses.calls[0].request.url, responses.calls[1].request.url)
+
+    def test_stream_retries(self):
+        client = googlemaps.Client(self.key)
+        error = _Response(500)
+        over_query_limit = _Response(
+            200, b'{"rows": [], "status": "OVER_QUERY_LIMIT"}')
+        ok = _Response(200, b'{"rows": [{"elements": []}], "status": "OK"}')
+        client.transport = _QueuedTransport(
+            client, [error, over_query_limit, ok])
+
+        with mock.patch("time.sleep") as sleep:
+            rows = client.distance_matrix_stream(
+                "Sydney", "Melbourne", priority=ratelimit.BATCH, deadline=60)
+            self.assertEqual([{"elements": []}], list(rows))
+
+        # The unread body of the 5xx response is released.
+        self.assertTrue(error.closed)
+        self.assertTrue(over_query_limit.closed)
+        # Both retries back off.
+        self.assertEqual(2, sleep.call_count)
+
+        (_, priority, deadline), _, fallback = client.transport.sent
+        # The fallback is sent once the call has returned, with its
+        # priority and deadline.
+        self.assertEqual((False, ratelimit.BATCH, deadline), fallback)
+        self.assertIsNotNone(deadline)
+        self.assertIsNone(getattr(client._local, "priority", None))